@@ -4,7 +4,7 @@ from enum import Enum
 from typing import Optional
 
 from fastapi import status
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from shared.base import BaseModel
 from structlog.stdlib import BoundLogger
 
@@ -31,9 +31,12 @@ class ExceptionHandler(BaseModel):
         message: str,
         data: Optional[dict] = None,
         status_code: int = status.HTTP_200_OK,
-    ) -> JSONResponse:
+    ) -> ORJSONResponse:
         """Create a response object
 
+        The body is serialized with orjson, which also encodes numpy arrays
+        natively instead of going through Python lists.
+
         Args:
             message (str): message to be returned
             data (Optional[dict], optional): data to be returned. Defaults to None.
@@ -46,9 +49,9 @@ class ExceptionHandler(BaseModel):
         if data:
             response_data.update(data)
 
-        return JSONResponse(content=response_data, status_code=status_code)
+        return ORJSONResponse(content=response_data, status_code=status_code)
 
-    def handle_exception(self, e: str, extra: dict) -> JSONResponse:
+    def handle_exception(self, e: str, extra: dict) -> ORJSONResponse:
         """Handle exception
 
         Args:
@@ -65,7 +68,7 @@ class ExceptionHandler(BaseModel):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
         )
 
-    def handle_not_found_error(self, message: str, extra: dict) -> JSONResponse:
+    def handle_not_found_error(self, message: str, extra: dict) -> ORJSONResponse:
         """Handle not found error
 
         Args:
@@ -85,7 +88,7 @@ class ExceptionHandler(BaseModel):
             status_code=status.HTTP_404_NOT_FOUND,
         )
 
-    def handle_success(self, output: dict) -> JSONResponse:
+    def handle_success(self, output: dict) -> ORJSONResponse:
         """Handle success
 
         Args:
@@ -102,7 +105,7 @@ class ExceptionHandler(BaseModel):
             status_code=status.HTTP_200_OK,
         )
 
-    def handle_bad_request(self, message: str, extra: dict) -> JSONResponse:
+    def handle_bad_request(self, message: str, extra: dict) -> ORJSONResponse:
         self.logger.error(
             message,
             extra=extra,
@@ -112,7 +115,7 @@ class ExceptionHandler(BaseModel):
             status_code=status.HTTP_400_BAD_REQUEST,
         )
 
-    def handle_unprocessable_entity(self, message: str, extra: dict) -> JSONResponse:
+    def handle_unprocessable_entity(self, message: str, extra: dict) -> ORJSONResponse:
         self.logger.error(
             message,
             extra=extra,
@@ -122,7 +125,7 @@ class ExceptionHandler(BaseModel):
             status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
         )
 
-    def handle_rate_limit_exceeded(self, message: str, extra: dict) -> JSONResponse:
+    def handle_rate_limit_exceeded(self, message: str, extra: dict) -> ORJSONResponse:
         self.logger.info(
             message,
             extra=extra,
@@ -132,7 +135,7 @@ class ExceptionHandler(BaseModel):
             status_code=status.HTTP_429_TOO_MANY_REQUESTS,
         )
 
-    def handle_unrelated_limit_exceeded(self, message: str, extra: dict) -> JSONResponse:
+    def handle_unrelated_limit_exceeded(self, message: str, extra: dict) -> ORJSONResponse:
         """Handle unrelated limit exceeded
 
         Args:
@@ -3,7 +3,7 @@ from __future__ import annotations
 from application.embed import ApplicationInput
 from application.embed import EmbedApplication
 from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from shared.logging import get_logger
 from shared.utils import get_settings
 
@@ -16,7 +16,7 @@ settings = get_settings()
 
 
 @embed_router.post('/embed', tags=['embed'])
-async def embedding(inputs: EmbedInput) -> JSONResponse:
+async def embedding(inputs: EmbedInput) -> ORJSONResponse:
     """Generate embeddings for a list of text strings.
 
     This endpoint transforms text inputs into vector embeddings using the configured
@@ -27,7 +27,7 @@ async def embedding(inputs: EmbedInput) -> JSONResponse:
         inputs (EmbedInput): Input model containing a list of text strings to embed
 
     Returns:
-        JSONResponse: JSON response with embedding vectors and usage information
+        ORJSONResponse: JSON response with embedding vectors and usage information
 
     Raises:
         Exception: Any exceptions during application initialization or processing
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import numpy as np
 from sentence_transformers import SentenceTransformer
 from shared.base.meta import SingletonMeta
 from shared.logging import get_logger
@@ -68,14 +69,15 @@ class EmbeddingDriver(metaclass=SingletonMeta):
             sentences (list[str]): List of text strings to encode
 
         Returns:
-            list: List of embedding vectors as Python lists (not numpy arrays)
+            list: List of embedding vectors as float32 numpy arrays, left for the
+                response encoder to serialize without building Python lists
 
         Raises:
             Exception: Re-raises any exceptions from the encoding process after logging
         """
         try:
             embeddings = self.embed_model.encode(sentences)
-            return embeddings.tolist()
+            return list(np.asarray(embeddings, dtype=np.float32))
         except Exception as e:
             logger.exception(
                 f'Error while encoding sentences: {e}',
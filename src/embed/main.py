@@ -7,6 +7,7 @@ from api.router import manager_router
 from domain.embedding.driver import EmbeddingDriver
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from shared.logging import get_logger
 from shared.logging import setup_logging
 from shared.utils import get_settings
@@ -37,6 +38,7 @@ app = FastAPI(
     title='Agentic-RAG API',
     description='API for Agentic-RAG',
     version='0.1.0',
+    default_response_class=ORJSONResponse,
     lifespan=lifespan,
 )
 
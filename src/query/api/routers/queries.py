@@ -3,7 +3,8 @@ from __future__ import annotations
 from application.query_service import ApplicationInput
 from application.query_service import QuerierService
 from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
+from infra.balancer import LoadBalancerRegistry
 from shared.logging import get_logger
 from shared.utils import get_settings
 
@@ -19,7 +20,7 @@ settings = get_settings()
     '/query',
     tags=['querier'],
 )
-async def query(inputs: QuerierInput) -> JSONResponse:
+async def query(inputs: QuerierInput) -> ORJSONResponse:
     exception_handler = ExceptionHandler(
         logger=logger.bind(),
         service_name=__name__,
@@ -53,3 +54,9 @@ async def query(inputs: QuerierInput) -> JSONResponse:
 async def healthz():
     """Health check endpoint"""
     return {'status': 'ok'}
+
+
+@queries_router.get('/metrics', tags=['querier'])
+async def metrics():
+    """Per-endpoint health and latency of the querier's outbound clients"""
+    return {'endpoints': LoadBalancerRegistry().stats()}
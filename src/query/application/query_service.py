@@ -44,7 +44,7 @@ class QuerierService(BaseService):
         router_response = await self.router_service.process(
             BaseRouterInput(query=inputs.query),
         )
-        route = router_response.route.split(':')[1].lower().strip()
+        route = router_response.route
         logger.info(f'Route: {route}')
         if route == 'retriever_service':
             retrive_response = await self.retrive_service.process(
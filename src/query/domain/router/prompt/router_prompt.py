@@ -35,36 +35,36 @@ Examples with reasoning:
 
 Example 1:
 Query: "What are the implications of quantum computing on cryptography?"
-SERVICE: Retriever_service
+{"service": "Retriever_service"}
 
 Example 2:
 Query: "Find the roots of the equation x² - 5x + 6 = 0"
-SERVICE: Solving_service
+{"service": "Solving_service"}
 
 Example 3:
 Query: "What is the capital of France?"
-SERVICE: Retriever_service
+{"service": "Retriever_service"}
 
 Example 4:
 Query: "Calculate the kinetic energy of a 5kg object moving at 10m/s"
-SERVICE: Solving_service
+{"service": "Solving_service"}
 
 Example 5:
 Query: "How do neural networks work and what's the mathematical foundation behind backpropagation?"
-SERVICE: Retriever_service
+{"service": "Retriever_service"}
 
 Example 6:
 Query: "If I invest $1000 with 5% annual compound interest, how much will I have after 10 years?"
-SERVICE: Solving_service
+{"service": "Solving_service"}
 
 Example 7:
 Query: "What were the major events of World War II?"
-SERVICE: Retriever_service
+{"service": "Retriever_service"}
 
 Example 8:
 Query: "What is the Taylor series expansion of sin(x)?"
-SERVICE: Solving_service
+{"service": "Solving_service"}
 
-Your response must follow this format:
-SERVICE: [Retriever_service or Solving_service]
+Your response must be a JSON object in this format:
+{"service": "Retriever_service" or "Solving_service"}
 """
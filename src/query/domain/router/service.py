@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+from typing import Any
+from typing import Literal
+
 from infra.llm import CompletionMessage
 from infra.llm import LLMBaseInput
 from infra.llm import LLMBaseService
+from infra.llm import LLMStructuredOutputError
 from infra.llm import MessageRole
+from pydantic import field_validator
 from shared.base import BaseModel
 from shared.base import BaseService
 from shared.logging import get_logger
@@ -13,6 +18,8 @@ from .prompt.router_prompt import ROUTER_SYSTEM_PROMPT
 
 logger = get_logger(__name__)
 
+DEFAULT_ROUTE = 'retriever_service'
+
 
 class BaseRouterInput(BaseModel):
     """Base input model for router services."""
@@ -28,6 +35,20 @@ class BaseRouterOutput(BaseModel):
     error: str | None = None
 
 
+class RouteDecision(BaseModel):
+    """Service selected by the router LLM."""
+
+    service: Literal['retriever_service', 'solving_service']
+
+    @field_validator('service', mode='before')
+    @classmethod
+    def normalize_service(cls, value: Any) -> Any:
+        """Accept the capitalized service names used in the router prompt."""
+        if isinstance(value, str):
+            return value.strip().lower()
+        return value
+
+
 class RouterServiceV1(BaseService):
     llm_model: LLMBaseService
 
@@ -51,16 +72,27 @@ class RouterServiceV1(BaseService):
             raise e
 
         try:
-            response = await self.llm_model.process(
+            response = await self.llm_model.process_structured(
                 LLMBaseInput(
                     messages=messages,
                 ),
+                output_model=RouteDecision,
             )
             return BaseRouterOutput(
-                route=response.response,
+                route=response.result.service,
                 metadata=response.metadata,
             )
 
+        except LLMStructuredOutputError as e:
+            logger.warning(
+                f'Could not parse route, defaulting to {DEFAULT_ROUTE}: {e}',
+                extra={'inputs': inputs},
+            )
+            return BaseRouterOutput(
+                route=DEFAULT_ROUTE,
+                error=str(e),
+            )
+
         except Exception as e:
             logger.exception(
                 f'Error occured while routings: {e}',
@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from .balancer import Endpoint
+from .balancer import EndpointResponseError
+from .balancer import EndpointState
+from .balancer import is_endpoint_failure
+from .balancer import LoadBalancer
+from .balancer import LoadBalancerRegistry
+
+__all__ = [
+    'Endpoint',
+    'EndpointState',
+    'EndpointResponseError',
+    'is_endpoint_failure',
+    'LoadBalancer',
+    'LoadBalancerRegistry',
+]
@@ -0,0 +1,291 @@
+from __future__ import annotations
+
+import asyncio
+import math
+import random
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from enum import Enum
+from typing import Any
+from typing import AsyncIterator
+from typing import Callable
+from typing import Iterable
+from typing import Optional
+
+from shared.base import SingletonMeta
+from shared.logging import get_logger
+from shared.settings import BalancerSettings
+"""
+Load Balancer Module
+
+This module spreads calls to a service over several endpoints from the
+client side. Each call goes to the endpoint with the fewest outstanding
+requests, either among all healthy endpoints or among two picked at random
+(power of two choices). Endpoints that keep failing are ejected for a
+growing period; once it elapses a single probe call decides whether they
+rejoin the pool.
+"""
+
+logger = get_logger(__name__)
+
+EWMA_ALPHA = 0.3
+
+
+class EndpointState(str, Enum):
+    HEALTHY = 'healthy'
+    EJECTED = 'ejected'
+    PROBING = 'probing'
+
+
+class EndpointResponseError(Exception):
+    """
+    Raised by a client when an endpoint answers with an error status.
+
+    Attributes:
+        status_code (int): The HTTP status code.
+    """
+
+    def __init__(self, message: str, status_code: int):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def is_endpoint_failure(error: Exception) -> bool:
+    """Whether an error counts against an endpoint: anything but a 4xx response."""
+    return not isinstance(error, EndpointResponseError) or error.status_code >= 500
+
+
+def _percentile(samples: Iterable[float], q: float) -> Optional[float]:
+    ordered = sorted(samples)
+    if not ordered:
+        return None
+    return ordered[max(0, min(len(ordered) - 1, math.ceil(q * len(ordered)) - 1))]
+
+
+class Endpoint:
+    """
+    Health and latency of one endpoint.
+
+    Attributes:
+        url (str): The endpoint URL.
+        settings (BalancerSettings): Ejection thresholds and latency window.
+    """
+
+    def __init__(self, url: str, settings: BalancerSettings):
+        self.url = url
+        self.settings = settings
+        self.outstanding = 0
+        self.ewma_latency: Optional[float] = None
+        self._latencies: deque[float] = deque(maxlen=settings.latency_window)
+        self._consecutive_failures = 0
+        self._eject_streak = 0
+        self._ejected_until = 0.0
+        self._probing = False
+
+        self.requests = 0
+        self.errors = 0
+        self.ejections = 0
+
+    @property
+    def state(self) -> EndpointState:
+        if self._probing:
+            return EndpointState.PROBING
+        if self._ejected_until:
+            return EndpointState.EJECTED
+        return EndpointState.HEALTHY
+
+    @property
+    def ejected_until(self) -> float:
+        """Monotonic time the ejection ends, 0 when the endpoint is not ejected."""
+        return self._ejected_until
+
+    def available(self, now: float) -> bool:
+        """Whether the endpoint may take a call: healthy, or due for a probe."""
+        if not self._ejected_until:
+            return True
+        return now >= self._ejected_until and not self._probing
+
+    def start(self, now: float) -> None:
+        """Count a call sent to the endpoint."""
+        self.outstanding += 1
+        self.requests += 1
+        if self._ejected_until and now >= self._ejected_until:
+            self._probing = True
+
+    def succeed(self, latency: float) -> None:
+        """Record a successful call, bringing an ejected endpoint back."""
+        self.outstanding -= 1
+        self._latencies.append(latency)
+        self.ewma_latency = (
+            latency
+            if self.ewma_latency is None
+            else EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * self.ewma_latency
+        )
+        self._consecutive_failures = 0
+        if self._ejected_until:
+            logger.info(f'Endpoint {self.url} is healthy again')
+        self._ejected_until = 0.0
+        self._eject_streak = 0
+        self._probing = False
+
+    def fail(self, now: float) -> None:
+        """Record a failed call, ejecting the endpoint when it keeps failing."""
+        self.outstanding -= 1
+        self.errors += 1
+        self._consecutive_failures += 1
+        if self._probing or (
+            not self._ejected_until
+            and self._consecutive_failures >= self.settings.failure_threshold
+        ):
+            self._eject(now)
+
+    def release(self) -> None:
+        """End a call that says nothing about the endpoint's health."""
+        self.outstanding -= 1
+        self._probing = False
+
+    def _eject(self, now: float) -> None:
+        self._eject_streak += 1
+        self.ejections += 1
+        duration = min(
+            self.settings.max_eject_duration,
+            self.settings.eject_duration * 2 ** (self._eject_streak - 1),
+        )
+        self._ejected_until = now + duration
+        self._probing = False
+        logger.warning(
+            f'Endpoint {self.url} ejected for {duration:.1f}s after '
+            f'{self._consecutive_failures} consecutive failures',
+        )
+
+    def stats(self) -> dict[str, Any]:
+        """Health and latency snapshot for metrics."""
+        return {
+            'state': self.state.value,
+            'outstanding': self.outstanding,
+            'requests': self.requests,
+            'errors': self.errors,
+            'ejections': self.ejections,
+            'ewma_latency': self.ewma_latency,
+            'p50_latency': _percentile(self._latencies, 0.5),
+            'p95_latency': _percentile(self._latencies, 0.95),
+            'p99_latency': _percentile(self._latencies, 0.99),
+        }
+
+
+class LoadBalancer:
+    """
+    Picks an endpoint for each call and tracks its outcome.
+
+    Attributes:
+        endpoints (list[Endpoint]): The endpoints to balance over.
+        settings (BalancerSettings): Selection strategy and ejection settings.
+    """
+
+    def __init__(self, endpoints: list[Endpoint], settings: BalancerSettings):
+        self.endpoints = endpoints
+        self.settings = settings
+        self._by_url = {endpoint.url: endpoint for endpoint in endpoints}
+
+    def pick(self, exclude: Iterable[str] = ()) -> Endpoint:
+        """
+        Choose the endpoint for the next call.
+
+        When every endpoint is ejected, the one due back soonest is used
+        rather than failing the call outright.
+
+        Args:
+            exclude (Iterable[str]): URLs to avoid, e.g. the primary of a hedged call.
+
+        Returns:
+            Endpoint: The chosen endpoint.
+        """
+        now = time.monotonic()
+        excluded = set(exclude)
+        pool = [endpoint for endpoint in self.endpoints if endpoint.url not in excluded]
+        pool = pool or self.endpoints
+        candidates = [endpoint for endpoint in pool if endpoint.available(now)]
+        if not candidates:
+            return min(pool, key=lambda endpoint: endpoint.ejected_until)
+
+        if self.settings.strategy == 'p2c' and len(candidates) > 2:
+            candidates = random.sample(candidates, 2)
+        else:
+            random.shuffle(candidates)
+        return min(
+            candidates,
+            key=lambda endpoint: (endpoint.outstanding, endpoint.ewma_latency or 0.0),
+        )
+
+    @asynccontextmanager
+    async def track(
+        self,
+        url: str,
+        is_failure: Callable[[Exception], bool] = is_endpoint_failure,
+    ) -> AsyncIterator[Optional[Endpoint]]:
+        """
+        Count a call as outstanding on its endpoint and record its outcome.
+
+        URLs that are not part of the pool are not tracked.
+
+        Args:
+            url (str): The URL the call is sent to.
+            is_failure (Callable[[Exception], bool]): Whether an error counts
+                against the endpoint's health.
+
+        Yields:
+            Optional[Endpoint]: The tracked endpoint.
+        """
+        endpoint = self._by_url.get(url)
+        if endpoint is None:
+            yield None
+            return
+
+        started = time.monotonic()
+        endpoint.start(started)
+        try:
+            yield endpoint
+        except asyncio.CancelledError:
+            endpoint.release()
+            raise
+        except Exception as e:
+            if is_failure(e):
+                endpoint.fail(time.monotonic())
+            else:
+                endpoint.release()
+            raise
+        else:
+            endpoint.succeed(time.monotonic() - started)
+
+
+class LoadBalancerRegistry(metaclass=SingletonMeta):
+    """Process-wide registry of endpoints, shared by every client of a service."""
+
+    def __init__(self):
+        self._endpoints: dict[str, dict[str, Endpoint]] = {}
+
+    def get(self, service: str, urls: list[str], settings: BalancerSettings) -> LoadBalancer:
+        """
+        Get a balancer over a service's endpoints, creating their state on first use.
+
+        Args:
+            service (str): Name of the service, e.g. "llm" or "embed".
+            urls (list[str]): The endpoint URLs.
+            settings (BalancerSettings): Settings used if the endpoints are created.
+
+        Returns:
+            LoadBalancer: A balancer sharing the endpoints' process-wide state.
+        """
+        endpoints = self._endpoints.setdefault(service, {})
+        for url in urls:
+            if url not in endpoints:
+                endpoints[url] = Endpoint(url, settings)
+        return LoadBalancer([endpoints[url] for url in urls], settings)
+
+    def stats(self) -> dict[str, Any]:
+        """Per-endpoint metrics of every service."""
+        return {
+            service: {url: endpoint.stats() for url, endpoint in endpoints.items()}
+            for service, endpoints in self._endpoints.items()
+        }
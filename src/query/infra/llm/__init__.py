@@ -3,8 +3,12 @@ from __future__ import annotations
 from .base import LLMBaseInput
 from .base import LLMBaseOutput
 from .base import LLMBaseService
+from .base import LLMStructuredOutput
 from .datatypes import CompletionMessage
 from .datatypes import MessageRole
+from .datatypes import StructuredOutput
+from .exceptions import LLMError
+from .exceptions import LLMStructuredOutputError
 from .service import LLMInput
 from .service import LLMOutput
 from .service import LLMService
@@ -16,6 +20,10 @@ __all__ = [
     'LLMBaseInput',
     'LLMOutput',
     'LLMBaseOutput',
+    'LLMStructuredOutput',
+    'StructuredOutput',
     'CompletionMessage',
     'MessageRole',
+    'LLMError',
+    'LLMStructuredOutputError',
 ]
@@ -26,7 +26,7 @@ class CompletionMessage(BaseLLMMessage):
 
 class StructuredOutput(BaseModel):
     name: str
-    schema: dict[str, object]
+    json_schema: dict[str, object]
     strict: bool = False
     description: Optional[str] = None
 
@@ -0,0 +1,23 @@
+from __future__ import annotations
+"""
+LLM Exceptions Module
+
+This module defines the errors raised by the LLM client.
+"""
+
+
+class LLMError(Exception):
+    """Base class for all errors raised by the LLM client."""
+
+
+class LLMStructuredOutputError(LLMError):
+    """
+    Raised when a response does not match the requested schema, even after repair.
+
+    Attributes:
+        response (str): The last raw response received.
+    """
+
+    def __init__(self, message: str, response: str):
+        super().__init__(message)
+        self.response = response
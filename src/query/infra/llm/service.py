@@ -1,22 +1,44 @@
 from __future__ import annotations
 
 from typing import Any
+from typing import Optional
 
 import httpx
+import orjson
 from fastapi.encoders import jsonable_encoder
+from infra.balancer import EndpointResponseError
+from infra.balancer import LoadBalancer
+from infra.balancer import LoadBalancerRegistry
+from pydantic import ValidationError
 from shared.base import BaseModel
 from shared.logging import get_logger
 from shared.settings import LLMSettings
 
 from .base import LLMBaseService
+from .base import LLMStructuredOutput
 from .datatypes import BatchMessage
 from .datatypes import BatchResponse
 from .datatypes import Message
 from .datatypes import Response
+from .datatypes import StructuredOutput
+from .exceptions import LLMStructuredOutputError
+from .structured import parse_structured
+from .structured import repair_messages
+from .structured import response_format
+from .structured import structured_output_for
+from .structured import T
 
 logger = get_logger(__name__)
 
 
+def merge_usage(*metadata: dict[str, Any]) -> dict[str, str]:
+    """Sum the token counts of several LLM calls"""
+    return {
+        key: str(sum(int(item.get(key, 0)) for item in metadata))
+        for key in ('prompt_tokens', 'completion_tokens', 'total_tokens')
+    }
+
+
 class LLMInput(BaseModel):
     messages: Message | BatchMessage
 
@@ -37,6 +59,11 @@ class LLMService(LLMBaseService):
             'Content-Type': 'application/json',
         }
 
+    @property
+    def balancer(self) -> LoadBalancer:
+        """Load balancer over the configured LLM endpoints"""
+        return LoadBalancerRegistry().get('llm', self.settings.endpoints, self.settings.balancer)
+
     async def inference(
         self,
         messages: Message,
@@ -46,6 +73,7 @@ class LLMService(LLMBaseService):
         presence_penalty: int,
         max_completion_tokens: int,
         temperature: float,
+        response_format: Optional[dict[str, Any]] = None,
     ) -> Response:
         body = {
             'model': model,
@@ -56,26 +84,36 @@ class LLMService(LLMBaseService):
             'max_completion_tokens': max_completion_tokens,
             'temperature': temperature,
         }
+        if response_format is not None:
+            body['response_format'] = response_format
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                str(self.settings.url),
-                headers=self.header,
-                json=body,
-                timeout=None,
-            )
-        if response.status_code != 200:
-            raise Exception(
-                f'LLM request failed with status code {response.status_code}: {response.text}',
-            )
+        url = self.balancer.pick().url
+        async with self.balancer.track(url):
+            async with httpx.AsyncClient() as client:
+                response = await client.post(
+                    url,
+                    headers=self.header,
+                    content=orjson.dumps(body),
+                    timeout=None,
+                )
+            if response.status_code != 200:
+                raise EndpointResponseError(
+                    f'LLM request failed with status code {response.status_code}: {response.text}',
+                    status_code=response.status_code,
+                )
+        data = orjson.loads(response.content)
         return {
-            'message': response.json()['choices'][0]['message']['content'],
-            'prompt_tokens': response.json()['usage']['prompt_tokens'],
-            'completion_tokens': response.json()['usage']['completion_tokens'],
-            'total_tokens': response.json()['usage']['total_tokens'],
+            'message': data['choices'][0]['message']['content'],
+            'prompt_tokens': data['usage']['prompt_tokens'],
+            'completion_tokens': data['usage']['completion_tokens'],
+            'total_tokens': data['usage']['total_tokens'],
         }
 
-    async def process(self, input: LLMInput) -> LLMOutput:
+    async def process(
+        self,
+        input: LLMInput,
+        structured_output: Optional[StructuredOutput] = None,
+    ) -> LLMOutput:
         response = await self.inference(
             messages=input.messages,
             frequency_penalty=self.settings.frequency_penalty,
@@ -84,6 +122,9 @@ class LLMService(LLMBaseService):
             presence_penalty=self.settings.presence_penalty,
             max_completion_tokens=self.settings.max_completion_tokens,
             temperature=self.settings.temperature,
+            response_format=(
+                response_format(structured_output) if structured_output is not None else None
+            ),
         )
         return LLMOutput(
             response=response['message'],
@@ -93,3 +134,51 @@ class LLMService(LLMBaseService):
                 'total_tokens': str(response['total_tokens']),
             },
         )
+
+    async def process_structured(
+        self,
+        input: LLMInput,
+        output_model: type[T],
+        structured_output: Optional[StructuredOutput] = None,
+    ) -> LLMStructuredOutput[T]:
+        """
+        Process an LLM request constrained to a JSON schema and validate the result.
+
+        A response that does not validate gets one cheap repair call that only
+        sends the schema, the response and the validation errors.
+
+        Raises:
+            LLMStructuredOutputError: If the repaired response is still invalid.
+        """
+        structured_output = structured_output or structured_output_for(output_model)
+        output = await self.process(input, structured_output=structured_output)
+        try:
+            return LLMStructuredOutput(
+                result=parse_structured(output.response, output_model),
+                response=output.response,
+                metadata=output.metadata,
+            )
+        except ValidationError as e:
+            error = e
+        logger.warning(
+            f'Response does not match {structured_output.name}, '
+            f'attempting repair: {error.error_count()} errors',
+        )
+
+        repair = await self.process(
+            LLMInput(messages=repair_messages(structured_output, output.response, error)),
+            structured_output=structured_output,
+        )
+        metadata = merge_usage(output.metadata, repair.metadata)
+        metadata['repaired'] = 'true'
+        try:
+            return LLMStructuredOutput(
+                result=parse_structured(repair.response, output_model),
+                response=repair.response,
+                metadata=metadata,
+            )
+        except ValidationError as e:
+            raise LLMStructuredOutputError(
+                f'Response does not match {structured_output.name} after repair',
+                response=repair.response,
+            ) from e
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+from typing import TypeVar
+
+from pydantic import BaseModel as PydanticBaseModel
+from pydantic import ValidationError
+
+from .datatypes import CompletionMessage
+from .datatypes import Message
+from .datatypes import MessageRole
+from .datatypes import StructuredOutput
+"""
+LLM Structured Output Module
+
+This module turns Pydantic models into JSON schema response-format
+constraints, validates LLM responses into those models, and builds the short
+prompt used to repair a response that does not validate.
+"""
+
+T = TypeVar('T', bound=PydanticBaseModel)
+
+REPAIR_SYSTEM_PROMPT = """
+You fix JSON documents so that they match a JSON schema.
+Reply with the corrected JSON document only, without explanations or code fences.
+
+<schema>
+{schema}
+</schema>
+"""
+
+REPAIR_USER_PROMPT = """
+<document>
+{document}
+</document>
+
+<errors>
+{errors}
+</errors>
+"""
+
+
+def structured_output_for(output_model: type[T]) -> StructuredOutput:
+    """
+    Build the response-format constraint for a Pydantic model.
+
+    Args:
+        output_model (type[T]): The model the response must validate into.
+
+    Returns:
+        StructuredOutput: Constraint named after the model, carrying its JSON schema.
+    """
+    return StructuredOutput(
+        name=output_model.__name__,
+        json_schema=output_model.model_json_schema(),
+        description=(output_model.__doc__ or '').strip().split('\n')[0] or None,
+    )
+
+
+def response_format(structured_output: StructuredOutput) -> dict[str, Any]:
+    """
+    OpenAI-compatible `response_format` body field for a constraint.
+
+    Args:
+        structured_output (StructuredOutput): The constraint to send.
+
+    Returns:
+        dict[str, Any]: The `response_format` value.
+    """
+    json_schema = {
+        'name': structured_output.name,
+        'schema': structured_output.json_schema,
+        'strict': structured_output.strict,
+    }
+    if structured_output.description:
+        json_schema['description'] = structured_output.description
+    return {'type': 'json_schema', 'json_schema': json_schema}
+
+
+def extract_json(text: str) -> str:
+    """
+    Strip code fences and surrounding prose from a JSON response.
+
+    Args:
+        text (str): The raw response.
+
+    Returns:
+        str: The outermost JSON object or array found, or the stripped text.
+    """
+    text = text.strip()
+    if text.startswith('```'):
+        text = text.split('\n', 1)[1] if '\n' in text else ''
+        text = text.rsplit('```', 1)[0].strip()
+
+    starts = [index for index in (text.find('{'), text.find('[')) if index >= 0]
+    end = max(text.rfind('}'), text.rfind(']'))
+    if starts and end > min(starts):
+        return text[min(starts):end + 1]
+    return text
+
+
+def parse_structured(text: str, output_model: type[T]) -> T:
+    """
+    Validate a response into a Pydantic model.
+
+    Args:
+        text (str): The raw response.
+        output_model (type[T]): The model to validate into.
+
+    Returns:
+        T: The validated result.
+
+    Raises:
+        ValidationError: If the response is not valid JSON or does not match the model.
+    """
+    return output_model.model_validate_json(extract_json(text))
+
+
+def repair_messages(
+    structured_output: StructuredOutput,
+    response: str,
+    error: ValidationError,
+) -> Message:
+    """
+    Build the prompt asking the model to fix an invalid response.
+
+    Only the schema, the invalid response and the validation errors are sent,
+    so the repair call is much cheaper than repeating the original prompt.
+
+    Args:
+        structured_output (StructuredOutput): The constraint the response must match.
+        response (str): The invalid response.
+        error (ValidationError): Why the response did not validate.
+
+    Returns:
+        Message: The repair prompt.
+    """
+    errors = '\n'.join(
+        f"- {'.'.join(str(part) for part in item['loc']) or '<root>'}: {item['msg']}"
+        for item in error.errors()
+    )
+    return [
+        CompletionMessage(
+            role=MessageRole.SYSTEM,
+            content=REPAIR_SYSTEM_PROMPT.format(
+                schema=json.dumps(structured_output.json_schema, ensure_ascii=False),
+            ),
+        ),
+        CompletionMessage(
+            role=MessageRole.USER,
+            content=REPAIR_USER_PROMPT.format(document=response, errors=errors),
+        ),
+    ]
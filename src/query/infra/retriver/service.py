@@ -1,6 +1,10 @@
 from __future__ import annotations
 
 import httpx
+import orjson
+from infra.balancer import EndpointResponseError
+from infra.balancer import LoadBalancer
+from infra.balancer import LoadBalancerRegistry
 from shared.settings import RetriveServiceSettings
 
 from .base import BaseRetriveInput
@@ -19,25 +23,38 @@ class RetriverServiceV1(BaseRetriveService):
             'Content-Type': 'application/json',
         }
 
+    @property
+    def balancer(self) -> LoadBalancer:
+        """Load balancer over the configured retriever endpoints"""
+        return LoadBalancerRegistry().get(
+            'retriver',
+            self.settings.endpoints,
+            self.settings.balancer,
+        )
+
     async def process(self, input: BaseRetriveInput) -> BaseRetriveOutput:
         body = {
             'query': input.query,
         }
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                str(self.settings.url),
-                headers=self.header,
-                json=body,
-                timeout=None,
-            )
-
-        if response.status_code != 200:
-            raise Exception(
-                f'LLM request failed with status code {response.status_code}: {response.text}',
-            )
-
+        url = self.balancer.pick().url
+        async with self.balancer.track(url):
+            async with httpx.AsyncClient() as client:
+                response = await client.post(
+                    url,
+                    headers=self.header,
+                    content=orjson.dumps(body),
+                    timeout=None,
+                )
+
+            if response.status_code != 200:
+                raise EndpointResponseError(
+                    f'LLM request failed with status code {response.status_code}: {response.text}',
+                    status_code=response.status_code,
+                )
+
+        info = orjson.loads(response.content)['info']
         return BaseRetriveOutput(
-            answer=response.json()['info']['answer'],
-            metadata=response.json()['info']['metadata'],
+            answer=info['answer'],
+            metadata=info['metadata'],
         )
@@ -4,6 +4,7 @@ from api.helpers import LoggingMiddleware
 from api.routers import queries_router
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from shared.logging import get_logger
 from shared.logging import setup_logging
 from starlette.responses import RedirectResponse
@@ -15,6 +16,7 @@ app = FastAPI(
     title='Agentic-RAG API',
     description='API for Agentic-RAG',
     version='0.1.0',
+    default_response_class=ORJSONResponse,
 )
 
 app.add_middleware(LoggingMiddleware, logger=logger)
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from .balancer import BalancerSettings
 from .llm import LLMSettings
 from .retrive_service import RetriveServiceSettings
 from .settings import Settings
@@ -10,4 +11,5 @@ __all__ = [
     'Settings',
     'RetriveServiceSettings',
     'SolvingServiceSettings',
+    'BalancerSettings',
 ]
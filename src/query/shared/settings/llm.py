@@ -1,13 +1,20 @@
 from __future__ import annotations
 
+from typing import List
+from typing import Optional
+
 from pydantic import HttpUrl
+from pydantic import model_validator
 from shared.base import BaseModel
 
+from .balancer import BalancerSettings
+
 
 class LLMSettings(BaseModel):
     """Settings for the LLM (Large Language Model)"""
 
-    url: HttpUrl
+    url: Optional[HttpUrl] = None
+    urls: List[HttpUrl] = []
     model: str
     frequency_penalty: int = 0
     n: int = 1
@@ -15,3 +22,15 @@ class LLMSettings(BaseModel):
     temperature: int = 0
     top_p: int = 1
     max_completion_tokens: int = 4096
+    balancer: BalancerSettings = BalancerSettings()
+
+    @model_validator(mode='after')
+    def check_endpoints(self) -> LLMSettings:
+        if self.url is None and not self.urls:
+            raise ValueError('Either url or urls must be set')
+        return self
+
+    @property
+    def endpoints(self) -> list[str]:
+        """Endpoint URLs to balance over, `urls` taking precedence over `url`"""
+        return [str(url) for url in self.urls] if self.urls else [str(self.url)]
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+from infra.milvus import MilvusFilter
 from shared.base import BaseModel
 
 
 class RetriveInput(BaseModel):
     query: str
+    filters: list[MilvusFilter] = []
@@ -2,8 +2,19 @@ from __future__ import annotations
 
 from application.retriver_application import ApplicationInput
 from application.retriver_application import RetriveApplication
+from domain.processor.rerank import RerankDriver
 from fastapi import APIRouter
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
+from infra.balancer import LoadBalancerRegistry
+from infra.cassette import CassetteRegistry
+from infra.llm import HedgePolicyRegistry
+from infra.llm import LLMCircuitOpenError
+from infra.llm import LLMGuardRegistry
+from infra.llm import LLMOverloadError
+from infra.llm import LLMScheduler
+from infra.llm import PromptBudgetRegistry
+from infra.milvus import MilvusDriver
+from infra.milvus import SearchCacheRegistry
 from shared.logging import get_logger
 from shared.utils import get_settings
 
@@ -16,7 +27,7 @@ settings = get_settings()
 
 
 @retrive_router.post('/retrive', tags=['retrive'])
-async def retrive(inputs: RetriveInput) -> JSONResponse:
+async def retrive(inputs: RetriveInput) -> ORJSONResponse:
     """
     Main retrieval endpoint that processes user queries using the RAG pipeline.
 
@@ -30,7 +41,7 @@ async def retrive(inputs: RetriveInput) -> JSONResponse:
         inputs: RetriveInput object containing the user's query
 
     Returns:
-        JSONResponse: Contains the generated answer and success/error messages
+        ORJSONResponse: Contains the generated answer and success/error messages
 
     Raises:
         Exception: Handled internally for application initialization or processing errors
@@ -52,8 +63,14 @@ async def retrive(inputs: RetriveInput) -> JSONResponse:
         response = await application.process(
             inputs=ApplicationInput(
                 query=inputs.query,
+                filters=inputs.filters,
             ),
         )
+    except (LLMOverloadError, LLMCircuitOpenError) as e:
+        return excepttion_handler.handle_rate_limit_exceeded(
+            f'LLM backend is overloaded: {e}',
+            extra={'inputs': inputs},
+        )
     except Exception as e:
         return excepttion_handler.handle_exception(
             f'Error during application initialization: {e}',
@@ -66,3 +83,20 @@ async def retrive(inputs: RetriveInput) -> JSONResponse:
 async def healthz():
     """Health check endpoint"""
     return {'status': 'ok'}
+
+
+@retrive_router.get('/metrics', tags=['retriver'])
+async def metrics():
+    """Runtime metrics of the retriever's outbound clients"""
+    milvus_pool = MilvusDriver(settings.milvus).stats() if settings.milvus.backend == 'milvus' else None
+    return {
+        'llm': LLMGuardRegistry().stats(),
+        'llm_hedging': HedgePolicyRegistry().stats(),
+        'llm_scheduler': LLMScheduler(settings.llm.scheduler).stats(),
+        'llm_prompt_budget': PromptBudgetRegistry().stats(),
+        'cassette': CassetteRegistry().stats(),
+        'endpoints': LoadBalancerRegistry().stats(),
+        'search_cache': SearchCacheRegistry().stats(),
+        'milvus_pool': milvus_pool,
+        'rerank': RerankDriver().stats(),
+    }
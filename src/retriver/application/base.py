@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from infra.milvus import MilvusFilter
 from shared.base import BaseModel
 """
 Application Base Module
@@ -19,9 +20,12 @@ class ApplicationInput(BaseModel):
 
     Attributes:
         query (str): The user's query to be processed by the application.
+        filters (list[MilvusFilter]): Conditions restricting vector search to
+            matching chunks, such as one tenant's partition.
     """
 
     query: str
+    filters: list[MilvusFilter] = []
 
 
 class ApplicationOutput(BaseModel):
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Optional
+
 from domain.processor.answer_generator import AnswerGenerator
 from domain.processor.answer_generator import AnswerGeneratorInput
 from domain.processor.chunking import ChunkingService
@@ -15,10 +17,17 @@ from domain.processor.sub_agent import SubAgentService
 from domain.processor.web_searching import WebSearchService
 from infra.embed import EmbedService
 from infra.llm import LLMService
+from infra.llm import LLMStage
+from infra.llm import request_scope
+from infra.milvus import create_vector_service
 from infra.milvus import MilvusService
 from shared.base import AsyncBaseService
 from shared.logging import get_logger
+from shared.settings import FederatedSearchSettings
+from shared.settings import HybridSearchSettings
+from shared.settings import SearchCacheSettings
 from shared.settings import Settings
+from shared.settings import TwoPhaseSettings
 
 from .base import ApplicationInput
 from .base import ApplicationOutput
@@ -53,6 +62,10 @@ class RetriveApplication(AsyncBaseService):
         """Returns a configured LLM service instance for text generation tasks."""
         return LLMService(settings=self.settings.llm)
 
+    def stage_llm(self, stage: LLMStage) -> LLMService:
+        """Returns the LLM service configured for a specific pipeline stage."""
+        return LLMService.for_stage(self.settings.llm, stage)
+
     @property
     def embed_service(self) -> EmbedService:
         """Returns a configured embedding service for text vectorization."""
@@ -66,42 +79,71 @@ class RetriveApplication(AsyncBaseService):
     @property
     def get_fact(self) -> GetFactService:
         """Returns a service for extracting key facts from user queries."""
-        return GetFactService(llm_model=self.llm_service)
+        return GetFactService(llm_model=self.stage_llm(LLMStage.GET_FACT))
 
     @property
     def planing(self) -> PlanningService:
         """Returns a service for generating retrieval execution plans."""
-        return PlanningService(llm_model=self.llm_service)
+        return PlanningService(llm_model=self.stage_llm(LLMStage.PLANNING))
 
     async def get_retrive_service(self) -> RetriveService:
         """
         Lazily initializes and returns the retrieval service.
 
-        The service is initialized only once and reused for subsequent calls.
+        The service is initialized only once and reused for subsequent calls. It
+        searches Milvus or the local memory-mapped index depending on
+        `settings.milvus.backend`.
 
         Returns:
             RetriveService: A configured retrieval service connected to the vector database
         """
         if self._retrive_service is None:
-            milvus_service = MilvusService(
-                settings=self.settings.milvus,
-                embed_service=self.embed_service,
+            milvus_service = create_vector_service(self.settings.milvus, self.embed_service)
+            self._retrive_service = RetriveService(
+                milvus_service=milvus_service,
+                rerank_service=self.rerank_service,
             )
-            self._retrive_service = RetriveService(milvus_service=milvus_service)
         return self._retrive_service
 
     @property
     def answer_generator(self) -> AnswerGenerator:
         """Returns a service for generating final answers from retrieved contexts."""
-        return AnswerGenerator(llm_model=self.llm_service)
+        return AnswerGenerator(llm_model=self.stage_llm(LLMStage.ANSWER_GENERATOR))
+
+    @property
+    def web_cache_service(self) -> Optional[MilvusService]:
+        """
+        Returns the vector service of the web cache collection, None when disabled.
+
+        It searches densely with the vector store's connection and index settings,
+        without result caching since every lookup filters on the current time.
+        """
+        cache = self.settings.web_search.cache
+        if not cache.enabled:
+            return None
+        milvus = self.settings.milvus
+        settings = milvus.model_copy(
+            update={
+                'collection_name': cache.collection_name,
+                'output_field': [milvus.content_field, 'title', 'url', 'fetched_at'],
+                'partition_key_field': None,
+                'top_k': cache.top_k,
+                'cache': SearchCacheSettings(enabled=False),
+                'hybrid': HybridSearchSettings(),
+                'two_phase': TwoPhaseSettings(),
+                'federation': FederatedSearchSettings(),
+            },
+        )
+        return create_vector_service(settings, self.embed_service)
 
     @property
     def web_searching(self) -> WebSearchService:
         """Returns a service for performing web searches and processing results."""
         return WebSearchService(
             settings=self.settings.web_search,
-            llm_service=self.llm_service,
+            llm_service=self.stage_llm(LLMStage.WEB_SEARCH),
             chunking_service=self.chunking_service,
+            cache_service=self.web_cache_service,
         )
 
     @property
@@ -135,6 +177,9 @@ class RetriveApplication(AsyncBaseService):
         """
         Process a user query through the retrieval-augmented generation pipeline.
 
+        All LLM calls made while processing are tagged with the same request
+        scope so the LLM scheduler can rank them by request age.
+
         This method implements the core workflow:
         1. Extract facts from the query
         2. Generate an execution plan
@@ -148,53 +193,55 @@ class RetriveApplication(AsyncBaseService):
         Returns:
             ApplicationOutput: The final answer generated from retrieved context
         """
-        self.memory.clear_memory()
-        for i in range(self.settings.retrive.max_tries):
-            fact_response = await self.get_fact.process(
-                GetFactInput(
-                    query=inputs.query,
-                ),
-            )
-            self.memory.set_memory('fact', fact_response.fact)
-            logger.info(f'Fact need to get: {fact_response.fact}')
-
-            plan = await self.planing.process(
-                PlanningInput(
-                    query=inputs.query,
-                    fact=fact_response.fact,
-                ),
-            )
-            self.memory.set_memory('plan', plan)
-
-            contexts = []
-            for step_metadata in plan.plan:
-                if step_metadata['agent'] == 'sub-agent':
-                    sub_agent = await self.get_sub_agent()
-                    step_output = await sub_agent.process(
-                        SubAgentInput(
-                            step=step_metadata['question'],
-                        ),
+        with request_scope():
+            self.memory.clear_memory()
+            for i in range(self.settings.retrive.max_tries):
+                fact_response = await self.get_fact.process(
+                    GetFactInput(
+                        query=inputs.query,
+                    ),
+                )
+                self.memory.set_memory('fact', fact_response.fact)
+                logger.info(f'Fact need to get: {fact_response.fact}')
+
+                plan = await self.planing.process(
+                    PlanningInput(
+                        query=inputs.query,
+                        fact=fact_response.fact,
+                    ),
+                )
+                self.memory.set_memory('plan', plan)
+
+                contexts = []
+                for step_metadata in plan.plan:
+                    if step_metadata['agent'] == 'sub-agent':
+                        sub_agent = await self.get_sub_agent()
+                        step_output = await sub_agent.process(
+                            SubAgentInput(
+                                step=step_metadata['question'],
+                                filters=inputs.filters,
+                            ),
+                        )
+                    contexts.append(
+                        {
+                            'query': step_metadata['question'],
+                            'content': step_output.info,
+                        },
                     )
-                contexts.append(
-                    {
-                        'query': step_metadata['question'],
-                        'content': step_output.info,
-                    },
+
+                final_answer = await self.answer_generator.process(
+                    AnswerGeneratorInput(
+                        query=inputs.query,
+                        context=str(contexts),
+                    ),
                 )
 
-            final_answer = await self.answer_generator.process(
-                AnswerGeneratorInput(
-                    query=inputs.query,
-                    context=str(contexts),
-                ),
-            )
+                return ApplicationOutput(
+                    answer=final_answer.answer,
+                    metadata=None,
+                )
 
             return ApplicationOutput(
-                answer=final_answer.answer,
+                answer='',
                 metadata=None,
             )
-
-        return ApplicationOutput(
-            answer='',
-            metadata=None,
-        )
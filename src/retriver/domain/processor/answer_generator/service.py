@@ -4,6 +4,8 @@ from infra.llm import CompletionMessage
 from infra.llm import LLMBaseInput
 from infra.llm import LLMBaseService
 from infra.llm import MessageRole
+from infra.llm import PromptSection
+from infra.llm import SectionedMessage
 from shared.base import BaseModel
 from shared.base import BaseService
 from shared.logging import get_logger
@@ -80,12 +82,13 @@ class AnswerGenerator(BaseService):
                     role=MessageRole.SYSTEM,
                     content=SYSTEM_MESSAGE,
                 ),
-                CompletionMessage(
+                SectionedMessage(
                     role=MessageRole.USER,
-                    content=USER_MESSAGE.format(
-                        query=input.query,
-                        context=input.context,
-                    ),
+                    template=USER_MESSAGE,
+                    sections={
+                        'query': PromptSection(text=input.query, truncatable=False),
+                        'context': PromptSection(text=input.context),
+                    },
                 ),
             ]
         except Exception as e:
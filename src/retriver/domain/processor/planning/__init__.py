@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from .service import Plan
 from .service import PlanningInput
 from .service import PlanningOutput
 from .service import PlanningService
+from .service import PlanStep
@@ -1,13 +1,17 @@
 from __future__ import annotations
 
-import json
+from typing import Any
 from typing import Dict
 from typing import List
+from typing import Literal
 
 from infra.llm import CompletionMessage
 from infra.llm import LLMBaseInput
 from infra.llm import LLMBaseService
 from infra.llm import MessageRole
+from infra.llm import PromptSection
+from infra.llm import SectionedMessage
+from pydantic import model_validator
 from shared.base import BaseModel
 from shared.base import BaseService
 from shared.logging import get_logger
@@ -37,6 +41,40 @@ class PlanningInput(BaseModel):
     fact: str
 
 
+class PlanStep(BaseModel):
+    """
+    A single step of a retrieval plan.
+
+    Attributes:
+        step (str): Identifier of the step, e.g. "step1".
+        question (str): The question the step answers.
+        agent (str): The agent executing the step.
+    """
+
+    step: str
+    question: str
+    agent: Literal['sub-agent', 'answer-generator']
+
+
+class Plan(BaseModel):
+    """
+    Retrieval plan returned by the LLM.
+
+    Attributes:
+        steps (List[PlanStep]): The plan steps, ending with the answer-generator step.
+    """
+
+    steps: List[PlanStep]
+
+    @model_validator(mode='before')
+    @classmethod
+    def wrap_step_list(cls, data: Any) -> Any:
+        """Accept a bare list of steps, the format the planning prompt asks for."""
+        if isinstance(data, list):
+            return {'steps': data}
+        return data
+
+
 class PlanningOutput(BaseModel):
     """
     Output model for the Planning service.
@@ -89,9 +127,13 @@ class PlanningService(BaseService):
                     role=MessageRole.SYSTEM,
                     content=SYSTEM_PROMPT,
                 ),
-                CompletionMessage(
+                SectionedMessage(
                     role=MessageRole.USER,
-                    content=USER_PROMPT.format(query=inputs.query, fact=inputs.fact),
+                    template=USER_PROMPT,
+                    sections={
+                        'query': PromptSection(text=inputs.query, truncatable=False),
+                        'fact': PromptSection(text=inputs.fact),
+                    },
                 ),
             ]
 
@@ -105,12 +147,13 @@ class PlanningService(BaseService):
             raise e
 
         try:
-            response = await self.llm_model.process(
+            response = await self.llm_model.process_structured(
                 LLMBaseInput(
                     messages=messages,
                 ),
+                output_model=Plan,
             )
-            plan_steps = self.parse_plan(response.response)
+            plan_steps = [step.model_dump() for step in response.result.steps]
             logger.info(f'Plan steps: {plan_steps}')
             return PlanningOutput(
                 plan=plan_steps,
@@ -124,31 +167,3 @@ class PlanningService(BaseService):
                 },
             )
             raise e
-
-    def parse_plan(self, plan_text: str) -> str:
-        """
-        Parse a plan text that might be in JSON format.
-
-        This method attempts to extract and parse JSON content from the
-        LLM's response, handling various formats and potential errors.
-
-        Args:
-            plan_text (str): The raw plan text from the LLM.
-
-        Returns:
-            str: The parsed JSON plan as a string, or the original text if parsing fails.
-        """
-        try:
-            start_idx = plan_text.find('[')
-            end_idx = plan_text.rfind(']') + 1
-
-            if start_idx >= 0 and end_idx > start_idx:
-                json_text = plan_text[start_idx:end_idx]
-                return json.loads(json_text)
-            return plan_text
-        except json.JSONDecodeError as e:
-            logger.warning(f'Failed to parse plan as JSON: {e}')
-            return plan_text
-        except Exception as e:
-            logger.warning(f'Unexpected error parsing plan: {e}')
-            return plan_text
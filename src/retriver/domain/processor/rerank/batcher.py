@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import Executor
+from typing import Any
+from typing import Callable
+from typing import Optional
+
+import numpy as np
+from shared.logging import get_logger
+"""
+Rerank Batching Module
+
+This module scores query-passage pairs of concurrent requests together. Each
+request queues its pairs and awaits a future; one worker task per event loop
+waits briefly for more requests to arrive, concatenates their pairs into one
+batch, runs the cross-encoder on an executor so the event loop keeps serving
+other requests, and splits the scores back per request. When a merged batch
+fails, its requests are scored one by one so only the failing one errors.
+"""
+
+logger = get_logger(__name__)
+
+
+class _Pending:
+    """Pairs of one request waiting to be scored."""
+
+    __slots__ = ('pairs', 'future')
+
+    def __init__(self, pairs: list[list[str]], future: asyncio.Future):
+        self.pairs = pairs
+        self.future = future
+
+
+class RerankBatcher:
+    """
+    Micro-batching queue in front of a blocking scoring function.
+
+    Attributes:
+        predict (Callable[[list[list[str]]], Any]): Scores a batch of pairs, blocking.
+        executor (Executor): Runs `predict` off the event loop.
+        max_batch_pairs (int): Pairs per batch; a larger single request runs alone.
+        max_wait (float): Seconds the first request of a batch waits for others.
+    """
+
+    def __init__(
+        self,
+        predict: Callable[[list[list[str]]], Any],
+        executor: Executor,
+        max_batch_pairs: int,
+        max_wait: float,
+    ):
+        self.predict = predict
+        self.executor = executor
+        self.max_batch_pairs = max_batch_pairs
+        self.max_wait = max_wait
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        # Request that did not fit the previous batch, first in the next one
+        self._carry: Optional[_Pending] = None
+
+        self.requests = 0
+        self.batches = 0
+        self.pairs = 0
+        self.predict_seconds = 0.0
+
+    def _ensure_worker(self) -> asyncio.Queue:
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._carry = None
+            self._worker = loop.create_task(self._run())
+        return self._queue
+
+    async def score(self, pairs: list[list[str]]) -> np.ndarray:
+        """
+        Score pairs together with those of concurrent requests.
+
+        Args:
+            pairs (list[list[str]]): Query-passage pairs.
+
+        Returns:
+            np.ndarray: One score per pair, in order.
+        """
+        if not pairs:
+            return np.empty(0, dtype=np.float32)
+        queue = self._ensure_worker()
+        pending = _Pending(pairs, asyncio.get_running_loop().create_future())
+        queue.put_nowait(pending)
+        return await pending.future
+
+    async def _collect(self, queue: asyncio.Queue) -> list[_Pending]:
+        """The next batch: the oldest request plus those queued within `max_wait`."""
+        first, self._carry = self._carry, None
+        batch = [first or await queue.get()]
+        size = len(batch[0].pairs)
+        if size < self.max_batch_pairs and self.max_wait > 0:
+            await asyncio.sleep(self.max_wait)
+        while size < self.max_batch_pairs and not queue.empty():
+            pending = queue.get_nowait()
+            if size + len(pending.pairs) > self.max_batch_pairs:
+                self._carry = pending
+                break
+            batch.append(pending)
+            size += len(pending.pairs)
+        return batch
+
+    async def _predict(self, pairs: list[list[str]]) -> np.ndarray:
+        loop = asyncio.get_running_loop()
+        started = time.perf_counter()
+        scores = np.asarray(await loop.run_in_executor(self.executor, self.predict, pairs))
+        self.predict_seconds += time.perf_counter() - started
+        self.batches += 1
+        self.pairs += len(pairs)
+        return scores
+
+    async def _score_alone(self, pending: _Pending) -> None:
+        if pending.future.done():
+            return
+        try:
+            scores = await self._predict(pending.pairs)
+        except Exception as e:
+            logger.exception(f'Error when reranking {len(pending.pairs)} pairs: {e}')
+            if not pending.future.done():
+                pending.future.set_exception(e)
+            return
+        self.requests += 1
+        if not pending.future.done():
+            pending.future.set_result(scores)
+
+    async def _run(self) -> None:
+        queue = self._queue
+        while True:
+            batch = await self._collect(queue)
+            batch = [pending for pending in batch if not pending.future.cancelled()]
+            if len(batch) > 1:
+                pairs = [pair for pending in batch for pair in pending.pairs]
+                try:
+                    scores = await self._predict(pairs)
+                except Exception as e:
+                    # One bad request must not fail the others merged with it
+                    logger.warning(
+                        f'Error when reranking a batch of {len(batch)} requests, '
+                        f'scoring them one by one: {e}',
+                    )
+                else:
+                    self.requests += len(batch)
+                    start = 0
+                    for pending in batch:
+                        end = start + len(pending.pairs)
+                        if not pending.future.done():
+                            pending.future.set_result(scores[start:end])
+                        start = end
+                    continue
+            for pending in batch:
+                await self._score_alone(pending)
+
+    def stats(self) -> dict[str, Any]:
+        """Batch sizes and inference time for metrics."""
+        return {
+            'requests': self.requests,
+            'batches': self.batches,
+            'pairs': self.pairs,
+            'mean_batch_pairs': self.pairs / self.batches if self.batches else None,
+            'mean_requests_per_batch': self.requests / self.batches if self.batches else None,
+            'predict_seconds': self.predict_seconds,
+        }
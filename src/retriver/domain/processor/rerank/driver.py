@@ -1,17 +1,31 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any
+
 import numpy as np
 from sentence_transformers import CrossEncoder
 from shared.base import SingletonMeta
 from shared.logging import get_logger
 from shared.settings import RerankSettings
 
+from .batcher import RerankBatcher
+
 
 logger = get_logger(__name__)
 
 
 class RerankDriver(metaclass=SingletonMeta):
+    """
+    Process-wide cross-encoder.
+
+    Inference runs on a dedicated single-thread executor, so it never blocks
+    the event loop and only one forward pass uses the model at a time; the
+    pairs of concurrent reranks are merged into one call by a batcher.
+    """
+
     _model = None
+    _batcher = None
 
     def __init__(self, settings: RerankSettings = None):
         if settings is not None:
@@ -25,12 +39,35 @@ class RerankDriver(metaclass=SingletonMeta):
             )
         return self._model
 
+    @property
+    def batcher(self) -> RerankBatcher:
+        if self._batcher is None:
+            self._batcher = RerankBatcher(
+                self.predict,
+                ThreadPoolExecutor(max_workers=1, thread_name_prefix='rerank'),
+                max_batch_pairs=self.settings.max_batch_pairs,
+                max_wait=self.settings.max_wait_ms / 1000,
+            )
+        return self._batcher
+
     def predict(self, hits_pairs: list[list[str]]) -> np.ndarray:
         try:
-            scores = self.rerank_model.predict(hits_pairs)
+            scores = self.rerank_model.predict(
+                hits_pairs,
+                batch_size=self.settings.batch_size,
+                show_progress_bar=False,
+            )
             return scores
         except Exception as e:
             logger.exception(
                 f'Error when reranking hits pairs: {e}',
             )
             raise
+
+    async def apredict(self, hits_pairs: list[list[str]]) -> np.ndarray:
+        """Score pairs on the rerank executor, batched with concurrent calls."""
+        return await self.batcher.score(hits_pairs)
+
+    def stats(self) -> dict[str, Any]:
+        """Batching metrics, empty before the first rerank."""
+        return self._batcher.stats() if self._batcher is not None else {}
@@ -78,7 +78,8 @@ class RerankService(BaseService):
         This method:
         1. Extracts all text chunks from retrieved contexts
         2. Creates query-chunk pairs for scoring
-        3. Computes relevance scores using a cross-encoder model
+        3. Computes relevance scores using a cross-encoder model, off the event
+           loop and in one batch with concurrent reranks
         4. Aggregates scores per document and normalizes them
         5. Sorts documents based on their relevance scores
 
@@ -100,7 +101,7 @@ class RerankService(BaseService):
 
             hits_pairs = [[inputs.query, chunk] for _, chunk in all_hits_with_index]
 
-            scores = self.driver.predict(hits_pairs)
+            scores = await self.driver.apredict(hits_pairs)
 
             hit_scores = {}
             hit_counts = {}
@@ -1,5 +1,12 @@
 from __future__ import annotations
 
+from typing import Any
+from typing import Optional
+
+from domain.processor.rerank import RerankInput
+from domain.processor.rerank import RerankService
+from infra.milvus import MilvusFilter
+from infra.milvus import MilvusHit
 from infra.milvus import MilvusInput
 from infra.milvus import MilvusService
 from shared.base import BaseModel
@@ -9,22 +16,40 @@ from shared.logging import get_logger
 Retrieval Service Module
 
 This module provides functionality to retrieve relevant context information
-from a vector database based on input queries.
+from a vector database based on input queries. In two-phase mode, candidates
+are fetched with a short preview, reranked, and only the kept hits are
+loaded in full.
 """
 
 
 logger = get_logger(__name__)
 
 
+def relevance(hit: MilvusHit) -> float:
+    """
+    Similarity of a hit to its query on the dense retriever's scale.
+
+    Fused hybrid and federated scores only rank hits, so the dense score, or
+    the hit's score within its own collection, is used when present. For L2
+    it is a distance, lower meaning closer.
+    """
+    if 'dense' in hit.scores:
+        return hit.scores['dense']
+    return hit.scores.get(hit.collection, hit.score) if hit.collection else hit.score
+
+
 class RetriveInput(BaseModel):
     """
     Input model for the Retrieval service.
 
     Attributes:
         query (list[str]): List of query strings to search for in the vector database.
+        filters (list[MilvusFilter]): Conditions on scalar fields every retrieved
+            chunk must meet, such as its source, tenant or ingestion time.
     """
 
     query: list[str]
+    filters: list[MilvusFilter] = []
 
 
 class RetriveOutput(BaseModel):
@@ -33,9 +58,58 @@ class RetriveOutput(BaseModel):
 
     Attributes:
         context (list[str]): List of retrieved context strings relevant to the input queries.
+        hits (list[list[MilvusHit]]): Scored hits grouped per query, in input order.
+        higher_is_better (bool): Whether a higher `relevance` means a closer match,
+            False for L2 distances.
     """
 
     context: list[str]
+    hits: list[list[MilvusHit]] = []
+    higher_is_better: bool = True
+
+    @property
+    def contexts(self) -> list[dict[str, Any]]:
+        """
+        Hits as the context dicts taken by the rerank stage, like web search results.
+
+        Returns:
+            list[dict[str, Any]]: Title, url, chunks and score of each distinct
+                content, in rank order.
+        """
+        contexts = {}
+        for hit in (hit for query_hits in self.hits for hit in query_hits):
+            if not hit.content or hit.content in contexts:
+                continue
+            contexts[hit.content] = {
+                'title': str(hit.entity.get('title') or hit.entity.get('source', '')),
+                'url': str(hit.entity.get('url', '')),
+                'chunks': [hit.content],
+                'score': relevance(hit),
+            }
+        return list(contexts.values())
+
+    @property
+    def best_score(self) -> Optional[float]:
+        """Relevance of the closest hit, None without hits."""
+        scores = [relevance(hit) for query_hits in self.hits for hit in query_hits]
+        if not scores:
+            return None
+        return max(scores) if self.higher_is_better else min(scores)
+
+    def reaches(self, threshold: float) -> bool:
+        """
+        Whether the closest hit is at least as close as a threshold.
+
+        Args:
+            threshold (float): Minimum similarity, or maximum distance for L2.
+
+        Returns:
+            bool: False without hits.
+        """
+        best = self.best_score
+        if best is None:
+            return False
+        return best >= threshold if self.higher_is_better else best <= threshold
 
 
 class RetriveService(BaseService):
@@ -47,9 +121,72 @@ class RetriveService(BaseService):
 
     Attributes:
         milvus_service (MilvusService): The vector database service used for retrieval.
+        rerank_service (Optional[RerankService]): Scores two-phase candidates on their
+            previews; without it candidates are kept in search order.
     """
 
     milvus_service: MilvusService
+    rerank_service: Optional[RerankService] = None
+
+    @property
+    def higher_is_better(self) -> bool:
+        """Direction of `relevance`: per-collection scores when federated, dense scores otherwise."""
+        if self.milvus_service.settings.federation.collections:
+            return self.milvus_service.higher_is_better
+        return self.milvus_service.dense_higher_is_better
+
+    async def select(self, query: str, hits: list[MilvusHit]) -> list[MilvusHit]:
+        """
+        Keep the `top_k` best candidates of a query, reranked on their previews.
+
+        Args:
+            query (str): The query text.
+            hits (list[MilvusHit]): Candidates from the first phase, best first.
+
+        Returns:
+            list[MilvusHit]: The kept hits, with the rerank score in `scores`.
+        """
+        top_k = self.milvus_service.settings.top_k
+        if self.rerank_service is None or not any(hit.content for hit in hits):
+            return hits[:top_k]
+
+        rerank_output = await self.rerank_service.process(
+            RerankInput(
+                query=query,
+                hits=[{'position': position, 'chunks': [hit.content]} for position, hit in enumerate(hits)],
+            ),
+        )
+        ranked = rerank_output.ranked_contexts
+        return [
+            hits[context['position']].model_copy(
+                update={
+                    'scores': {
+                        **hits[context['position']].scores,
+                        'rerank': context.get('reranking_score', 0.0),
+                    },
+                },
+            )
+            for context in ranked[:top_k]
+        ]
+
+    async def retrive_two_phase(self, inputs: RetriveInput) -> list[list[MilvusHit]]:
+        """
+        Fetch candidates with previews only, rerank them and load the kept ones in full.
+
+        Args:
+            inputs (RetriveInput): The queries and filters.
+
+        Returns:
+            list[list[MilvusHit]]: The kept hits of each query, with their full content.
+        """
+        candidates = await self.milvus_service.phase_one.process(
+            MilvusInput(
+                query=inputs.query,
+                filters=inputs.filters,
+            ),
+        )
+        kept = [await self.select(query, hits) for query, hits in zip(inputs.query, candidates.hits)]
+        return await self.milvus_service.hydrate(kept)
 
     async def process(self, inputs: RetriveInput) -> RetriveOutput:
         """
@@ -65,12 +202,22 @@ class RetriveService(BaseService):
             Exception: If there's an error during retrieval from the vector database.
         """
         try:
-            context = self.milvus_service.process(
+            if self.milvus_service.settings.two_phase.enabled:
+                hits = await self.retrive_two_phase(inputs)
+                context = list(dict.fromkeys(hit.content for query_hits in hits for hit in query_hits))
+                return RetriveOutput(context=context, hits=hits, higher_is_better=self.higher_is_better)
+
+            milvus_output = await self.milvus_service.process(
                 MilvusInput(
                     query=inputs.query,
+                    filters=inputs.filters,
                 ),
             )
-            return RetriveOutput(context=context)
+            return RetriveOutput(
+                context=milvus_output.output,
+                hits=milvus_output.hits,
+                higher_is_better=self.higher_is_better,
+            )
         except Exception as e:
             logger.exception(
                 f'Error while retriving data from vector db: {e}',
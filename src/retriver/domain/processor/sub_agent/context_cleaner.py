@@ -4,6 +4,8 @@ from infra.llm import CompletionMessage
 from infra.llm import LLMBaseInput
 from infra.llm import LLMService
 from infra.llm import MessageRole
+from infra.llm import PromptSection
+from infra.llm import SectionedMessage
 from shared.base import BaseService
 from shared.logging import get_logger
 
@@ -43,9 +45,13 @@ class ContextCleanerHandler(BaseService):
                 role=MessageRole.SYSTEM,
                 content=CLEAN_CONTEXT_SYSTEM_PROMPT,
             ),
-            CompletionMessage(
+            SectionedMessage(
                 role=MessageRole.USER,
-                content=CLEAN_CONTEXT_USER_PROMPT.format(query=step, context=context),
+                template=CLEAN_CONTEXT_USER_PROMPT,
+                sections={
+                    'query': PromptSection(text=step, truncatable=False),
+                    'context': PromptSection(text=context),
+                },
             ),
         ]
         response = await self.llm_service.process(
@@ -9,6 +9,8 @@ from infra.llm import CompletionMessage
 from infra.llm import LLMBaseInput
 from infra.llm import LLMService
 from infra.llm import MessageRole
+from infra.llm import PromptSection
+from infra.llm import SectionedMessage
 from shared.base import BaseModel
 from shared.base import BaseService
 from shared.logging import get_logger
@@ -237,13 +239,14 @@ class MemoryManager(BaseService):
                 role=MessageRole.SYSTEM,
                 content=MERGE_CONTEXT_SYSTEM_PROMPT,
             ),
-            CompletionMessage(
+            SectionedMessage(
                 role=MessageRole.USER,
-                content=MERGE_CONTEXT_USER_PROMPT.format(
-                    query=query,
-                    existing_info=memory.complete_info,
-                    new_info=new_context,
-                ),
+                template=MERGE_CONTEXT_USER_PROMPT,
+                sections={
+                    'query': PromptSection(text=query, truncatable=False),
+                    'existing_info': PromptSection(text=memory.complete_info),
+                    'new_info': PromptSection(text=new_context, priority=10),
+                },
             ),
         ]
 
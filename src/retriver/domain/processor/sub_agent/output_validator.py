@@ -1,13 +1,18 @@
 from __future__ import annotations
 
-import json
 from typing import Any
 from typing import Dict
+from typing import List
+from typing import Optional
 
 from infra.llm import CompletionMessage
 from infra.llm import LLMBaseInput
 from infra.llm import LLMService
+from infra.llm import LLMStructuredOutputError
 from infra.llm import MessageRole
+from infra.llm import PromptSection
+from infra.llm import SectionedMessage
+from shared.base import BaseModel
 from shared.base import BaseService
 from shared.logging import get_logger
 
@@ -17,6 +22,23 @@ from .prompt.validate_output import VALIDATE_OUTPUT_USER_PROMPT
 logger = get_logger(__name__)
 
 
+class ValidationResult(BaseModel):
+    """
+    Assessment of whether retrieved information answers a step.
+
+    Attributes:
+        is_sufficient (bool): Whether the information is enough to answer the step.
+        reasoning (str): Short explanation of the assessment.
+        missing_aspects (List[str]): Aspects of the step still unanswered.
+        reformulated_query (Optional[str]): Query to search with next, if needed.
+    """
+
+    is_sufficient: bool
+    reasoning: str = ''
+    missing_aspects: List[str] = []
+    reformulated_query: Optional[str] = None
+
+
 class OutputValidatorHandler(BaseService):
     """
     Handler for validating the quality and sufficiency of retrieved information against the query.
@@ -48,44 +70,33 @@ class OutputValidatorHandler(BaseService):
                 role=MessageRole.SYSTEM,
                 content=VALIDATE_OUTPUT_SYSTEM_PROMPT,
             ),
-            CompletionMessage(
+            SectionedMessage(
                 role=MessageRole.USER,
-                content=VALIDATE_OUTPUT_USER_PROMPT.format(step=step, info=info),
+                template=VALIDATE_OUTPUT_USER_PROMPT,
+                sections={
+                    'step': PromptSection(text=step, truncatable=False),
+                    'info': PromptSection(text=info),
+                },
             ),
         ]
 
-        response = await self.llm_service.process(
-            LLMBaseInput(messages=messages),
-        )
-
-        self.prompt_tokens += int(response.metadata['prompt_tokens'])
-        self.completion_tokens += int(response.metadata['completion_tokens'])
-        self.total_tokens += int(response.metadata['total_tokens'])
-
-        validation_result_str = response.response.strip()
-
         try:
-            validation_result = json.loads(validation_result_str)
-            logger.info(f'Validation result: {validation_result}')
-            return validation_result
-        except json.JSONDecodeError:
-            try:
-                import re
-
-                json_pattern = r'(\{.*?\})'
-                match = re.search(json_pattern, validation_result_str, re.DOTALL)
-                if match:
-                    cleaned_json = match.group(1)
-                    validation_result = json.loads(cleaned_json)
-                    logger.info(
-                        f'Validation result: {validation_result}',
-                    )
-                    return validation_result
-            except Exception as e2:
-                logger.warning(f'Failed second attempt to parse JSON: {str(e2)}')
-
+            response = await self.llm_service.process_structured(
+                LLMBaseInput(messages=messages),
+                output_model=ValidationResult,
+            )
+        except LLMStructuredOutputError as e:
+            logger.warning(f'Failed to parse validation result: {e}')
             return {
                 'is_sufficient': True,
                 'reasoning': 'Failed to parse validation result',
                 'reformulated_query': step,
             }
+
+        self.prompt_tokens += int(response.metadata['prompt_tokens'])
+        self.completion_tokens += int(response.metadata['completion_tokens'])
+        self.total_tokens += int(response.metadata['total_tokens'])
+
+        validation_result = response.result.model_dump(exclude_none=True)
+        logger.info(f'Validation result: {validation_result}')
+        return validation_result
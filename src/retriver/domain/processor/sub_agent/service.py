@@ -8,6 +8,8 @@ from domain.processor.rerank import RerankService
 from domain.processor.retrive import RetriveService
 from domain.processor.web_searching import WebSearchService
 from infra.llm import LLMService
+from infra.llm import LLMStage
+from infra.milvus import MilvusFilter
 from shared.base import BaseModel
 from shared.base import BaseService
 from shared.logging import get_logger
@@ -30,10 +32,12 @@ class SubAgentInput(BaseModel):
     Attributes:
         step: A specific information retrieval step or query to be processed
         query_id: Optional unique identifier for the query/conversation
+        filters: Conditions restricting vector database retrieval
     """
 
     step: str
     query_id: str = ''
+    filters: list[MilvusFilter] = []
 
 
 class SubAgentOutput(BaseModel):
@@ -102,28 +106,52 @@ class SubAgentService(BaseService):
         self.rerank_service = rerank_service
 
         if llm_service is not None:
-            self._memory_manager = MemoryManager(llm_service=self.llm_service)
+            self._memory_manager = MemoryManager(
+                llm_service=self.stage_llm(LLMStage.MEMORY),
+            )
+
+    def stage_llm(self, stage: LLMStage) -> LLMService:
+        """
+        Get the LLM service configured for a pipeline stage.
+
+        Falls back to the shared llm_service when no settings are available.
+
+        Args:
+            stage: The pipeline stage
+
+        Returns:
+            LLMService: The stage's LLM service
+        """
+        if self.settings is None:
+            return self.llm_service
+        return LLMService.for_stage(self.settings.llm, stage)
 
     @property
     def tool_decision_handler(self) -> ToolDecisionHandler:
         """Get the tool decision handler instance."""
         if self.llm_service is None:
             raise ValueError('LLMService not initialized')
-        return ToolDecisionHandler(llm_service=self.llm_service)
+        return ToolDecisionHandler(
+            llm_service=self.stage_llm(LLMStage.TOOL_DECISION),
+        )
 
     @property
     def context_cleaner_handler(self) -> ContextCleanerHandler:
         """Get the context cleaner handler instance."""
         if self.llm_service is None:
             raise ValueError('LLMService not initialized')
-        return ContextCleanerHandler(llm_service=self.llm_service)
+        return ContextCleanerHandler(
+            llm_service=self.stage_llm(LLMStage.CONTEXT_CLEANER),
+        )
 
     @property
     def output_validator_handler(self) -> OutputValidatorHandler:
         """Get the output validator handler instance."""
         if self.llm_service is None:
             raise ValueError('LLMService not initialized')
-        return OutputValidatorHandler(llm_service=self.llm_service)
+        return OutputValidatorHandler(
+            llm_service=self.stage_llm(LLMStage.OUTPUT_VALIDATOR),
+        )
 
     @property
     def tool_operation_handler(self) -> ToolOperationHandler:
@@ -214,6 +242,7 @@ class SubAgentService(BaseService):
                     contexts, search_failed = await self.tool_operation_handler.process(
                         tool=tool,
                         step=current_step,
+                        filters=inputs.filters,
                     )
 
                     if not search_failed and contexts:
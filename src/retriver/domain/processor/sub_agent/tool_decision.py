@@ -12,6 +12,8 @@ from .prompt.decide_tool import DECIDE_TOOL_USER_PROMPT
 
 logger = get_logger(__name__)
 
+TOOLS = ('web_search', 'vector_db')
+
 
 class ToolDecisionHandler(BaseService):
     """
@@ -48,12 +50,25 @@ class ToolDecisionHandler(BaseService):
             ),
         ]
 
-        response = await self.llm_service.process(
+        response = await self.llm_service.process_with_escalation(
             LLMBaseInput(messages=messages),
+            is_valid=lambda text: self.parse_tool(text) in TOOLS,
         )
-        tool = response.response.strip().lower()
+        tool = self.parse_tool(response.response)
         logger.info(f'Decided to use tool: {tool} for step: {step}')
         self.prompt_tokens += int(response.metadata['prompt_tokens'])
         self.completion_tokens += int(response.metadata['completion_tokens'])
         self.total_tokens += int(response.metadata['total_tokens'])
         return tool
+
+    def parse_tool(self, text: str) -> str:
+        """
+        Normalize the tool name returned by the LLM.
+
+        Args:
+            text: The raw LLM response
+
+        Returns:
+            str: The lower-cased tool name without surrounding quotes or whitespace
+        """
+        return text.strip().strip('"\'`').strip().lower()
@@ -3,15 +3,19 @@ from __future__ import annotations
 from typing import Any
 from typing import Dict
 from typing import List
+from typing import Optional
 from typing import Tuple
+from typing import Union
 
 from domain.processor.rerank import RerankInput
 from domain.processor.rerank import RerankService
+from domain.processor.retrive import RetriveInput
 from domain.processor.retrive import RetriveOutput
 from domain.processor.retrive import RetriveService
 from domain.processor.web_searching import WebSearchingInput
 from domain.processor.web_searching import WebSearchingOutput
 from domain.processor.web_searching import WebSearchService
+from infra.milvus import MilvusFilter
 from shared.base import BaseService
 from shared.logging import get_logger
 from shared.settings import RetrieveSettings
@@ -35,7 +39,8 @@ class ToolOperationHandler(BaseService):
         Handle web search for a given information need.
 
         Delegates to the WebSearchService to retrieve up-to-date information
-        from the internet based on the query.
+        from the internet based on the query, unless recently fetched pages
+        in the web cache answer it.
 
         Args:
             step: The search query
@@ -43,6 +48,10 @@ class ToolOperationHandler(BaseService):
         Returns:
             Tuple[WebSearchingOutput, bool]: Container with search results and a flag indicating if search failed
         """
+        cached = await self.web_search_service.lookup_cache(step)
+        if cached is not None:
+            return cached, False
+
         output = await self.web_search_service.process(
             WebSearchingInput(
                 query=step,
@@ -66,27 +75,55 @@ class ToolOperationHandler(BaseService):
 
         return output, search_failed
 
-    async def handle_retriver(self, step: str) -> Tuple[RetriveOutput, bool]:
+    async def handle_retriver(
+        self,
+        step: str,
+        filters: Optional[List[MilvusFilter]] = None,
+    ) -> Tuple[Union[RetriveOutput, WebSearchingOutput], bool]:
         """
         Handle vector database query for a given information need.
 
-        Note: Currently implemented to use web search as a fallback.
+        Falls back to web search when retrieval fails, finds nothing, or its
+        closest hit does not reach `settings.min_score`.
 
         Args:
             step: The vector database query
+            filters: Conditions every retrieved chunk must meet
 
         Returns:
-            Tuple[RetriveOutput, bool]: Container with retrieved contexts and a flag indicating if search failed
+            Tuple[Union[RetriveOutput, WebSearchingOutput], bool]: Container with retrieved
+                contexts and a flag indicating if search failed
         """
-        # return await self.retrive_service.process(
-        #     RetriveInput(
-        #         query=step,
-        #     ),
-        # )
-        output, search_failed = await self.handle_web_search(step=step)
-        return output, search_failed
-
-    async def process(self, tool: str, step: str) -> Tuple[List[Dict[str, Any]], bool]:
+        try:
+            output = await self.retrive_service.process(
+                RetriveInput(
+                    query=[step],
+                    filters=filters or [],
+                ),
+            )
+        except Exception as e:
+            logger.warning(f'Vector DB retrieval failed, falling back to web search: {e}')
+            return await self.handle_web_search(step=step)
+
+        best_score = output.best_score
+        if best_score is None:
+            logger.info(f'No vector DB hits for step, falling back to web search: {step}')
+            return await self.handle_web_search(step=step)
+        if self.settings.min_score is not None and not output.reaches(self.settings.min_score):
+            logger.info(
+                f'Best vector DB score {best_score:.3f} does not reach {self.settings.min_score}, '
+                f'falling back to web search: {step}',
+            )
+            return await self.handle_web_search(step=step)
+
+        return output, False
+
+    async def process(
+        self,
+        tool: str,
+        step: str,
+        filters: Optional[List[MilvusFilter]] = None,
+    ) -> Tuple[List[Dict[str, Any]], bool]:
         """
         Process a step using the selected retrieval tool.
 
@@ -96,6 +133,7 @@ class ToolOperationHandler(BaseService):
         Args:
             tool: The tool to use ("web_search" or "vector_db")
             step: The processing step/query
+            filters: Conditions restricting vector DB retrieval
 
         Returns:
             Tuple[List[Dict[str, Any]], bool]: List of context dictionaries and a flag indicating if search failed
@@ -111,10 +149,8 @@ class ToolOperationHandler(BaseService):
             contexts = web_search_output.contexts
 
         elif tool == 'vector_db':
-            vector_db_output, search_failed = await self.handle_retriver(step=step)
+            vector_db_output, search_failed = await self.handle_retriver(step=step, filters=filters)
             contexts = vector_db_output.contexts
-            # for context in vector_db_output.context:
-            #     contexts.append({'content': context})
 
         else:
             logger.error(f'Unsupported tool selected: {tool}')
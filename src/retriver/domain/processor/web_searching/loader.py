@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import asyncio
 
+from infra.cassette import CassetteRegistry
 from playwright.async_api import async_playwright
 from shared.base import BaseModel
 from shared.base import BaseService
@@ -24,7 +25,19 @@ class LoaderService(BaseService):
 
     async def fetch(self, url: str) -> str:
         """
-        Fetch the HTML content from a specified URL.
+        Fetch the HTML content from a specified URL, through the cassette if one is active.
+
+        Args:
+            url (str): The URL to fetch.
+
+        Returns:
+            str: The HTML content of the page or an exception if error occurs.
+        """
+        return await CassetteRegistry().play('loader', {'url': url}, lambda: self.crawl(url))
+
+    async def crawl(self, url: str) -> str:
+        """
+        Load a page in a headless browser and return its HTML.
 
         Args:
             url (str): The URL to fetch.
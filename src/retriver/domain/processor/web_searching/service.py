@@ -1,16 +1,24 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import time
+from typing import Optional
 
 from domain.processor.chunking import ChunkingInput
 from domain.processor.chunking import ChunkingService
 from duckduckgo_search import DDGS
+from infra.cassette import CassetteRegistry
 from infra.llm import CompletionMessage
 from infra.llm import LLMBaseInput
 from infra.llm import LLMBaseService
 from infra.llm import MessageRole
+from infra.milvus import MilvusFilter
+from infra.milvus import MilvusInput
+from infra.milvus import MilvusService
 from shared.base import BaseModel
 from shared.base import BaseService
+from shared.base import SingletonMeta
 from shared.logging import get_logger
 from shared.settings import WebSearchSettings
 
@@ -22,6 +30,9 @@ from .prompt.web_search import WEB_SEARCHING_PROMPT
 
 logger = get_logger(__name__)
 
+# Chunks standing in for a page that could not be fetched
+FETCH_FAILURE_PREFIXES = ('[Error', '[Google captcha detected')
+
 
 class WebSearchingInput(BaseModel):
     """
@@ -64,6 +75,16 @@ class WebSearchingOutput(BaseModel):
     metadata: dict[str, str] | None = None
 
 
+class WebCacheRegistry(metaclass=SingletonMeta):
+    """Process-wide state of the web cache, shared by the services of every request."""
+
+    def __init__(self):
+        # Collections known to exist, so write-backs skip the check
+        self.collections: set[str] = set()
+        # Write-backs in flight, referenced until they finish
+        self.tasks: set[asyncio.Task] = set()
+
+
 class WebSearchService(BaseService):
     """
     Service for performing web searches and processing the results.
@@ -77,11 +98,16 @@ class WebSearchService(BaseService):
 
     The service includes error handling, retry logic, and graceful degradation
     to ensure robustness when dealing with external web resources.
+
+    With a cache service, fetched chunks are embedded and written to a web
+    cache collection with their URL, fetch time and expiry, and recent
+    chunks close to a query can be served from it without crawling.
     """
 
     llm_service: LLMBaseService
     chunking_service: ChunkingService
     settings: WebSearchSettings
+    cache_service: Optional[MilvusService] = None
 
     @property
     def loader(self) -> LoaderService:
@@ -183,6 +209,141 @@ class WebSearchService(BaseService):
         response = await self.llm_service.process(LLMBaseInput(messages=messages))
         return response.response.strip()
 
+    async def search(self, query: str, top_k: int) -> list[dict[str, str]]:
+        """
+        Run a DuckDuckGo text search, through the cassette if one is active.
+
+        Args:
+            query: The optimized search query
+            top_k: Maximum number of results
+
+        Returns:
+            list[dict[str, str]]: Raw search results with title, href and body
+        """
+
+        async def ddgs_search() -> list[dict[str, str]]:
+            return list(DDGS().text(query, max_results=top_k))
+
+        return await CassetteRegistry().play(
+            'web_search',
+            {'query': query, 'max_results': top_k},
+            ddgs_search,
+        )
+
+    async def lookup_cache(self, query: str) -> Optional[WebSearchingOutput]:
+        """
+        Serve a query from the web cache collection.
+
+        Args:
+            query: The search query
+
+        Returns:
+            Optional[WebSearchingOutput]: Unexpired cached chunks reaching
+                `cache.min_score`, grouped per page, best first, or None when the
+                cache is disabled or no chunk is close enough to the query.
+        """
+        if self.cache_service is None:
+            return None
+        try:
+            output = await self.cache_service.process(
+                MilvusInput(
+                    query=[query],
+                    filters=[MilvusFilter(field='expires_at', op='>', value=int(time.time()))],
+                ),
+            )
+        except Exception as e:
+            logger.warning(f'Web cache lookup failed: {str(e)}')
+            return None
+
+        hits = output.hits[0] if output.hits else []
+        min_score = self.settings.cache.min_score
+        if self.cache_service.higher_is_better:
+            hits = [hit for hit in hits if hit.score >= min_score]
+        else:
+            hits = [hit for hit in hits if hit.score <= min_score]
+        if not hits:
+            return None
+
+        pages: dict[str, SearchResult] = {}
+        for hit in hits:
+            url = str(hit.entity.get('url', ''))
+            page = pages.setdefault(
+                url,
+                SearchResult(title=str(hit.entity.get('title', '')), url=url, chunks=[]),
+            )
+            # Rows of an earlier TTL window may still be live next to their refresh
+            if hit.content not in page.chunks:
+                page.chunks.append(hit.content)
+        logger.info(f'Served {len(hits)} chunks from the web cache for: {query}')
+        return WebSearchingOutput(contexts=list(pages.values()), metadata={'source': 'web_cache'})
+
+    async def write_back(self, results: list[SearchResult]) -> int:
+        """
+        Embed the chunks of fetched pages and store them in the web cache collection.
+
+        Captcha and fetch error chunks are skipped. Chunk ids hash the URL,
+        text and TTL window: fetching a page again within the window refreshes
+        its rows in place on Milvus, and after it writes new rows, as the local
+        index never replaces a stored row. The collection is created on the
+        first write of the process.
+
+        Args:
+            results: Fetched pages with their chunks
+
+        Returns:
+            int: Number of chunks written
+        """
+        if self.cache_service is None:
+            return 0
+
+        settings = self.cache_service.settings
+        fetched_at = int(time.time())
+        window = fetched_at // max(1, self.settings.cache.ttl)
+        entities = {}
+        for result in results:
+            for index, chunk in enumerate(result.chunks):
+                if not chunk.strip() or chunk.startswith(FETCH_FAILURE_PREFIXES):
+                    continue
+                key = hashlib.sha256(f'{result.url}\n{window}\n{chunk}'.encode('utf-8')).hexdigest()
+                entities[key] = {
+                    settings.id_field: key,
+                    settings.content_field: chunk,
+                    'title': result.title,
+                    'url': result.url,
+                    'chunk_index': index,
+                    'fetched_at': fetched_at,
+                    'expires_at': fetched_at + self.settings.cache.ttl,
+                }
+        if not entities:
+            return 0
+
+        rows = list(entities.values())
+        registry = WebCacheRegistry()
+        collection = f'{settings.host}:{settings.port}/{settings.db_name}/{settings.collection_name}'
+        try:
+            vectors = await self.cache_service.embed([row[settings.content_field] for row in rows])
+            if collection not in registry.collections:
+                await self.cache_service.ensure_collection(len(vectors[0]))
+                registry.collections.add(collection)
+            return await self.cache_service.upsert(vectors, rows)
+        except Exception as e:
+            logger.warning(f'Could not write web results to the cache: {str(e)}')
+            return 0
+
+    def schedule_write_back(self, results: list[SearchResult]) -> None:
+        """
+        Write fetched pages to the web cache in the background.
+
+        Args:
+            results: Fetched pages with their chunks
+        """
+        if self.cache_service is None:
+            return
+        tasks = WebCacheRegistry().tasks
+        task = asyncio.create_task(self.write_back(results))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
     async def process(self, inputs: WebSearchingInput) -> WebSearchingOutput:
         """
         Perform a web search for the given query, fetch results, and process text.
@@ -195,6 +356,7 @@ class WebSearchService(BaseService):
         2. Web search with retries
         3. Content fetching and processing
         4. Result consolidation
+        5. Background write-back of the fetched chunks to the web cache, when enabled
 
         Args:
             inputs: WebSearchingInput containing query and top_k parameters
@@ -210,12 +372,7 @@ class WebSearchService(BaseService):
             for attempt in range(max_tries):
                 try:
                     processed_query = await self.pre_process_query(inputs.query)
-                    results = list(
-                        DDGS().text(
-                            processed_query,
-                            max_results=inputs.top_k,
-                        ),
-                    )
+                    results = await self.search(processed_query, inputs.top_k)
 
                     if results:
                         break
@@ -260,6 +417,8 @@ class WebSearchService(BaseService):
                         ),
                     )
 
+            self.schedule_write_back(final_results)
+
             return WebSearchingOutput(
                 contexts=final_results,
                 metadata=None,
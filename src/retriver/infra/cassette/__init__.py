@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+from .cassette import Cassette
+from .cassette import CassetteMissError
+from .cassette import CassetteRegistry
+
+__all__ = [
+    'Cassette',
+    'CassetteMissError',
+    'CassetteRegistry',
+]
@@ -0,0 +1,256 @@
+from __future__ import annotations
+
+import asyncio
+import atexit
+import base64
+import gzip
+import hashlib
+import json
+import time
+from pathlib import Path
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+from typing import Optional
+
+import numpy as np
+from shared.base import SingletonMeta
+from shared.logging import get_logger
+from shared.settings import CassetteSettings
+"""
+Cassette Module
+
+This module records the calls the retriever makes to external services and
+replays them later. In record mode every request/response pair crossing a
+service boundary (LLM, embedding, web search, page loading) is kept with its
+latency and written to a gzip-compressed JSON-lines file per boundary. In
+replay mode the same requests are answered from those files, optionally
+sleeping for the recorded latency, so whole-pipeline runs are reproducible
+without network access.
+"""
+
+logger = get_logger(__name__)
+
+
+class CassetteMissError(LookupError):
+    """Raised in replay mode when a request was never recorded."""
+
+
+def request_key(request: Any) -> str:
+    """
+    Stable key identifying a request.
+
+    Args:
+        request (Any): JSON-serializable request description.
+
+    Returns:
+        str: Hex digest of the canonical JSON form of the request.
+    """
+    canonical = json.dumps(request, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:32]
+
+
+def encode_value(value: Any) -> Any:
+    """Make a response JSON-serializable, packing numpy arrays as base64 buffers."""
+    if isinstance(value, np.ndarray):
+        return {
+            '__ndarray__': base64.b64encode(np.ascontiguousarray(value).tobytes()).decode('ascii'),
+            'dtype': str(value.dtype),
+            'shape': list(value.shape),
+        }
+    if isinstance(value, dict):
+        return {key: encode_value(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [encode_value(item) for item in value]
+    return value
+
+
+def decode_value(value: Any) -> Any:
+    """Inverse of `encode_value`."""
+    if isinstance(value, dict):
+        if '__ndarray__' in value:
+            buffer = base64.b64decode(value['__ndarray__'])
+            return np.frombuffer(buffer, dtype=value['dtype']).reshape(value['shape']).copy()
+        return {key: decode_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [decode_value(item) for item in value]
+    return value
+
+
+class Cassette:
+    """
+    Recorded request/response pairs for every service boundary.
+
+    A request recorded several times keeps all its responses, which are
+    replayed in order; once exhausted the last one is repeated.
+
+    Attributes:
+        settings (CassetteSettings): Mode, location and latency simulation.
+    """
+
+    def __init__(self, settings: CassetteSettings):
+        self.settings = settings
+        self.path = Path(settings.path)
+        self._entries: dict[str, dict[str, list[dict[str, Any]]]] = {}
+        self._cursors: dict[tuple[str, str], int] = {}
+        self._dirty: set[str] = set()
+
+        self.hits: dict[str, int] = {}
+        self.misses: dict[str, int] = {}
+        self.recorded: dict[str, int] = {}
+
+        if self.path.is_dir():
+            for file in sorted(self.path.glob('*.jsonl.gz')):
+                self._load(file)
+
+    def _file(self, boundary: str) -> Path:
+        return self.path / f'{boundary}.jsonl.gz'
+
+    def _load(self, file: Path) -> None:
+        boundary = file.name.removesuffix('.jsonl.gz')
+        entries = self._entries.setdefault(boundary, {})
+        with gzip.open(file, 'rt', encoding='utf-8') as f:
+            for line in f:
+                record = json.loads(line)
+                entries.setdefault(record['key'], []).append(record)
+        logger.info(f'Loaded {sum(map(len, entries.values()))} {boundary} cassette entries from {file}')
+
+    async def play(
+        self,
+        boundary: str,
+        request: Any,
+        call: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        Answer a request live, from the cassette, or live while recording it.
+
+        Args:
+            boundary (str): Name of the service boundary, e.g. "llm" or "embed".
+            request (Any): JSON-serializable description of the request.
+            call (Callable[[], Awaitable[Any]]): Performs the live call.
+
+        Returns:
+            Any: The live or replayed response.
+
+        Raises:
+            CassetteMissError: In replay mode, if the request was not recorded.
+        """
+        if self.settings.mode == 'off':
+            return await call()
+
+        key = request_key(request)
+        if self.settings.mode == 'replay':
+            return await self._replay(boundary, key)
+
+        started = time.perf_counter()
+        response = await call()
+        record = {
+            'key': key,
+            'latency': round(time.perf_counter() - started, 4),
+            'response': encode_value(response),
+        }
+        if self.settings.store_requests:
+            record['request'] = encode_value(request)
+        self._entries.setdefault(boundary, {}).setdefault(key, []).append(record)
+        self._dirty.add(boundary)
+        self.recorded[boundary] = self.recorded.get(boundary, 0) + 1
+        return response
+
+    async def _replay(self, boundary: str, key: str) -> Any:
+        records = self._entries.get(boundary, {}).get(key)
+        if not records:
+            self.misses[boundary] = self.misses.get(boundary, 0) + 1
+            raise CassetteMissError(f'No recorded {boundary} response for request {key}')
+
+        cursor = self._cursors.get((boundary, key), 0)
+        self._cursors[(boundary, key)] = cursor + 1
+        record = records[min(cursor, len(records) - 1)]
+        self.hits[boundary] = self.hits.get(boundary, 0) + 1
+
+        if self.settings.simulate_latency:
+            await asyncio.sleep(record['latency'] * self.settings.latency_scale)
+        return decode_value(record['response'])
+
+    def save(self) -> None:
+        """Write the boundaries recorded since the last save to disk."""
+        if not self._dirty:
+            return
+        self.path.mkdir(parents=True, exist_ok=True)
+        for boundary in sorted(self._dirty):
+            with gzip.open(self._file(boundary), 'wt', encoding='utf-8') as f:
+                for records in self._entries[boundary].values():
+                    for record in records:
+                        f.write(json.dumps(record, ensure_ascii=False, separators=(',', ':')))
+                        f.write('\n')
+            logger.info(f'Saved {boundary} cassette to {self._file(boundary)}')
+        self._dirty.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Hits, misses and recordings per boundary for metrics."""
+        return {
+            'mode': self.settings.mode,
+            'path': str(self.path),
+            'hits': dict(self.hits),
+            'misses': dict(self.misses),
+            'recorded': dict(self.recorded),
+        }
+
+
+class CassetteRegistry(metaclass=SingletonMeta):
+    """Process-wide holder of the active cassette, if any."""
+
+    def __init__(self):
+        self.current: Optional[Cassette] = None
+
+    def configure(self, settings: CassetteSettings) -> Optional[Cassette]:
+        """
+        Activate a cassette according to the settings.
+
+        Recordings are saved on `close` and, as a safety net, at interpreter exit.
+
+        Args:
+            settings (CassetteSettings): The cassette settings.
+
+        Returns:
+            Optional[Cassette]: The active cassette, None when the mode is "off".
+        """
+        self.close()
+        if settings.mode == 'off':
+            return None
+
+        self.current = Cassette(settings)
+        if settings.mode == 'record':
+            atexit.register(self.current.save)
+        logger.info(f'Cassette {settings.mode} mode enabled at {settings.path}')
+        return self.current
+
+    def close(self) -> None:
+        """Save and deactivate the current cassette."""
+        if self.current is not None:
+            self.current.save()
+            self.current = None
+
+    async def play(
+        self,
+        boundary: str,
+        request: Any,
+        call: Callable[[], Awaitable[Any]],
+    ) -> Any:
+        """
+        Route a call through the active cassette, or call live when there is none.
+
+        Args:
+            boundary (str): Name of the service boundary.
+            request (Any): JSON-serializable description of the request.
+            call (Callable[[], Awaitable[Any]]): Performs the live call.
+
+        Returns:
+            Any: The live or replayed response.
+        """
+        if self.current is None:
+            return await call()
+        return await self.current.play(boundary, request, call)
+
+    def stats(self) -> Optional[dict[str, Any]]:
+        """Metrics of the active cassette."""
+        return self.current.stats() if self.current is not None else None
@@ -2,6 +2,11 @@ from __future__ import annotations
 
 import httpx
 import numpy as np
+import orjson
+from infra.balancer import EndpointResponseError
+from infra.balancer import LoadBalancer
+from infra.balancer import LoadBalancerRegistry
+from infra.cassette import CassetteRegistry
 from shared.base import AsyncBaseService
 from shared.base import BaseModel
 from shared.settings import EmbedSettings
@@ -29,7 +34,8 @@ class EmbedOutput(BaseModel):
     Output model for the Embedding service.
 
     Attributes:
-        embeddings (list[np.ndarray]): List of vector embeddings corresponding to the input texts.
+        embeddings (list[np.ndarray]): List of vector embeddings corresponding to the input texts,
+            in the precision set by `EmbedSettings.dtype`.
     """
 
     embeddings: list[np.ndarray]
@@ -62,6 +68,16 @@ class EmbedService(AsyncBaseService):
             'Content-Type': 'application/json',
         }
 
+    @property
+    def balancer(self) -> LoadBalancer:
+        """
+        Load balancer over the configured embedding endpoints.
+
+        Returns:
+            LoadBalancer: Balancer sharing the process-wide endpoint health and latency.
+        """
+        return LoadBalancerRegistry().get('embed', self.settings.endpoints, self.settings.balancer)
+
     async def process(self, inputs: EmbedInput) -> EmbedOutput:
         """
         Process text inputs into vector embeddings.
@@ -78,16 +94,36 @@ class EmbedService(AsyncBaseService):
         body = {
             'query': inputs.query,
         }
+        embeddings = await CassetteRegistry().play('embed', body, lambda: self.embed(body))
+        return EmbedOutput(embeddings=embeddings)
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                str(self.settings.url),
-                headers=self.header,
-                json=body,
-                timeout=None,
-            )
+    async def embed(self, body: dict[str, list[str]]) -> list[np.ndarray]:
+        """
+        Call the embedding API on the endpoint chosen by the load balancer.
 
-        data = response.json()['info']['data']
-        embeddings = [np.array(item['embedding']) for item in data]
+        Args:
+            body (dict[str, list[str]]): The JSON request body.
 
-        return EmbedOutput(embeddings=embeddings)
+        Returns:
+            list[np.ndarray]: One embedding per input text.
+        """
+        url = self.balancer.pick().url
+        async with self.balancer.track(url):
+            async with httpx.AsyncClient() as client:
+                response = await client.post(
+                    url,
+                    headers=self.header,
+                    content=orjson.dumps(body),
+                    timeout=None,
+                )
+            if response.status_code != 200:
+                raise EndpointResponseError(
+                    f'Embed request failed with status code {response.status_code}: {response.text}',
+                    status_code=response.status_code,
+                )
+
+        data = orjson.loads(response.content)['info']['data']
+        if not data:
+            return []
+        # One conversion of the whole batch straight to the configured precision
+        return list(np.asarray([item['embedding'] for item in data], dtype=self.settings.dtype))
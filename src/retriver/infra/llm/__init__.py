@@ -3,8 +3,23 @@ from __future__ import annotations
 from .base import LLMBaseInput
 from .base import LLMBaseOutput
 from .base import LLMBaseService
+from .base import LLMStructuredOutput
+from .budget import PromptBudgetRegistry
 from .datatypes import CompletionMessage
+from .datatypes import LLMStage
 from .datatypes import MessageRole
+from .datatypes import PromptSection
+from .datatypes import SectionedMessage
+from .datatypes import StructuredOutput
+from .exceptions import LLMCircuitOpenError
+from .exceptions import LLMError
+from .exceptions import LLMOverloadError
+from .exceptions import LLMRequestError
+from .exceptions import LLMStructuredOutputError
+from .hedging import HedgePolicyRegistry
+from .limiter import LLMGuardRegistry
+from .scheduler import LLMScheduler
+from .scheduler import request_scope
 from .service import LLMInput
 from .service import LLMOutput
 from .service import LLMService
@@ -16,6 +31,21 @@ __all__ = [
     'LLMBaseInput',
     'LLMOutput',
     'LLMBaseOutput',
+    'LLMStructuredOutput',
+    'StructuredOutput',
     'CompletionMessage',
     'MessageRole',
+    'PromptSection',
+    'SectionedMessage',
+    'LLMStage',
+    'LLMError',
+    'LLMRequestError',
+    'LLMOverloadError',
+    'LLMCircuitOpenError',
+    'LLMStructuredOutputError',
+    'LLMGuardRegistry',
+    'HedgePolicyRegistry',
+    'LLMScheduler',
+    'PromptBudgetRegistry',
+    'request_scope',
 ]
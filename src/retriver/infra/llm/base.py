@@ -2,6 +2,10 @@ from __future__ import annotations
 
 from abc import abstractmethod
 from typing import Any
+from typing import Callable
+from typing import Generic
+from typing import Optional
+from typing import TypeVar
 
 from shared.base import BaseModel
 from shared.base import BaseService
@@ -10,6 +14,9 @@ from .datatypes import BatchMessage
 from .datatypes import BatchResponse
 from .datatypes import Message
 from .datatypes import Response
+from .datatypes import StructuredOutput
+
+T = TypeVar('T')
 
 
 class LLMBaseInput(BaseModel):
@@ -21,7 +28,31 @@ class LLMBaseOutput(BaseModel):
     metadata: dict[str, Any] = {}
 
 
+class LLMStructuredOutput(BaseModel, Generic[T]):
+    result: T
+    response: str
+    metadata: dict[str, Any] = {}
+
+
 class LLMBaseService(BaseService):
     @abstractmethod
     def process(self, input: LLMBaseInput) -> LLMBaseOutput:
         raise NotImplementedError('process method not implemented')
+
+    async def process_with_escalation(
+        self,
+        input: LLMBaseInput,
+        is_valid: Callable[[str], bool],
+    ) -> LLMBaseOutput:
+        """Process the input, services supporting escalation retry invalid responses"""
+        return await self.process(input)
+
+    @abstractmethod
+    async def process_structured(
+        self,
+        input: LLMBaseInput,
+        output_model: type[T],
+        structured_output: Optional[StructuredOutput] = None,
+    ) -> LLMStructuredOutput[T]:
+        """Process the input and validate the response into `output_model`"""
+        raise NotImplementedError('process_structured method not implemented')
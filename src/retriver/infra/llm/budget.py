@@ -0,0 +1,264 @@
+from __future__ import annotations
+
+import math
+from typing import Any
+from typing import Optional
+
+from shared.base import BaseModel
+from shared.base import SingletonMeta
+from shared.logging import get_logger
+from shared.settings import LLMSettings
+
+from .datatypes import CompletionMessage
+from .datatypes import Message
+from .datatypes import SectionedMessage
+
+try:
+    from tokenizers import Tokenizer
+except ImportError:  # pragma: no cover - the heuristic counter is used instead
+    Tokenizer = None
+"""
+LLM Prompt Budget Module
+
+This module measures prompts before they are sent to the LLM. Tokens are
+counted with a local tokenizer file when one is configured, or estimated
+from the character count otherwise. Prompts over the stage's budget have
+their lowest-priority sections truncated or dropped, and the tokens saved
+are recorded per stage.
+"""
+
+logger = get_logger(__name__)
+
+
+class TokenCounter:
+    """
+    Counts and truncates text by tokens.
+
+    Attributes:
+        path (Optional[str]): Path of a local `tokenizer.json` file.
+        chars_per_token (float): Characters per token used when no tokenizer is loaded.
+    """
+
+    def __init__(self, path: Optional[str], chars_per_token: float):
+        self.path = path
+        self.chars_per_token = chars_per_token
+        self._tokenizer = None
+
+        if path is None:
+            return
+        if Tokenizer is None:
+            logger.warning(f'tokenizers is not installed, estimating tokens instead of loading {path}')
+            return
+        try:
+            self._tokenizer = Tokenizer.from_file(path)
+        except Exception as e:
+            logger.warning(f'Could not load tokenizer from {path}, estimating tokens instead: {e}')
+
+    @property
+    def exact(self) -> bool:
+        """Whether counts come from a real tokenizer rather than an estimate."""
+        return self._tokenizer is not None
+
+    def count(self, text: str) -> int:
+        """
+        Count the tokens of a text.
+
+        Args:
+            text (str): The text to measure.
+
+        Returns:
+            int: Number of tokens.
+        """
+        if not text:
+            return 0
+        if self._tokenizer is not None:
+            return len(self._tokenizer.encode(text, add_special_tokens=False).ids)
+        return math.ceil(len(text) / self.chars_per_token)
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """
+        Keep the head of a text up to a number of tokens.
+
+        Args:
+            text (str): The text to truncate.
+            max_tokens (int): Number of tokens to keep.
+
+        Returns:
+            str: The truncated text.
+        """
+        if max_tokens <= 0:
+            return ''
+        if self._tokenizer is not None:
+            offsets = self._tokenizer.encode(text, add_special_tokens=False).offsets
+            if len(offsets) <= max_tokens:
+                return text
+            return text[: offsets[max_tokens - 1][1]]
+        return text[: int(max_tokens * self.chars_per_token)]
+
+
+class BudgetReport(BaseModel):
+    """
+    Outcome of fitting one prompt into its budget.
+
+    Attributes:
+        budget (int): The prompt token budget.
+        original_tokens (int): Prompt tokens before trimming.
+        prompt_tokens (int): Prompt tokens actually sent.
+        truncated (list[str]): Sections that were shortened.
+        dropped (list[str]): Sections that were removed entirely.
+    """
+
+    budget: int
+    original_tokens: int
+    prompt_tokens: int
+    truncated: list[str] = []
+    dropped: list[str] = []
+
+    @property
+    def tokens_saved(self) -> int:
+        return self.original_tokens - self.prompt_tokens
+
+
+class PromptBudgeter:
+    """
+    Fits prompts into the token budget of one LLM configuration.
+
+    Sections of SectionedMessage instances are trimmed from the lowest
+    priority up, later messages first among equal priorities, until the
+    prompt fits. Plain messages are never modified.
+
+    Attributes:
+        settings (LLMSettings): Budget, context window and tokenizer settings.
+        counter (TokenCounter): Counter for the configured tokenizer.
+    """
+
+    def __init__(self, settings: LLMSettings, counter: TokenCounter):
+        self.settings = settings
+        self.counter = counter
+
+    def count_message(self, message: CompletionMessage) -> int:
+        """Tokens of a message, including the per-message formatting overhead."""
+        return self.counter.count(message.content) + self.settings.budget.message_overhead
+
+    def fit(self, messages: Message) -> tuple[list[CompletionMessage], BudgetReport]:
+        """
+        Trim a prompt to the budget.
+
+        Args:
+            messages (Message): The prompt messages.
+
+        Returns:
+            tuple[list[CompletionMessage], BudgetReport]: Plain messages ready to
+                send and a report of what was trimmed.
+        """
+        budget = self.settings.effective_prompt_budget
+        marker = self.settings.budget.truncation_marker
+        marker_tokens = self.counter.count(marker)
+
+        contents = [message.content for message in messages]
+        tokens = [self.count_message(message) for message in messages]
+        texts = {
+            index: {name: section.text for name, section in message.sections.items()}
+            for index, message in enumerate(messages)
+            if isinstance(message, SectionedMessage)
+        }
+        report = BudgetReport(budget=budget, original_tokens=sum(tokens), prompt_tokens=sum(tokens))
+
+        candidates = sorted(
+            (
+                (section.priority, -index, name)
+                for index, message in enumerate(messages)
+                if isinstance(message, SectionedMessage)
+                for name, section in message.sections.items()
+                if section.truncatable
+            ),
+        )
+        for _, negative_index, name in candidates:
+            index = -negative_index
+            message = messages[index]
+            while sum(tokens) > budget and texts[index][name]:
+                current = texts[index][name]
+                keep = self.counter.count(current) - (sum(tokens) - budget) - marker_tokens
+                shortened = self.counter.truncate(current, keep) + marker if keep > 0 else ''
+                if shortened and len(shortened) < len(current):
+                    texts[index][name] = shortened
+                    if name not in report.truncated:
+                        report.truncated.append(name)
+                else:
+                    texts[index][name] = ''
+                    report.dropped.append(name)
+                    if name in report.truncated:
+                        report.truncated.remove(name)
+
+                contents[index] = message.render(texts[index])
+                tokens[index] = (
+                    self.counter.count(contents[index]) + self.settings.budget.message_overhead
+                )
+            if sum(tokens) <= budget:
+                break
+
+        report.prompt_tokens = sum(tokens)
+        fitted = [
+            CompletionMessage(role=message.role, content=content)
+            for message, content in zip(messages, contents)
+        ]
+        return fitted, report
+
+
+class PromptBudgetRegistry(metaclass=SingletonMeta):
+    """Process-wide cache of token counters and per-stage budget statistics."""
+
+    def __init__(self):
+        self._counters: dict[tuple[Optional[str], float], TokenCounter] = {}
+        self._stages: dict[str, dict[str, int]] = {}
+
+    def counter(self, path: Optional[str], chars_per_token: float) -> TokenCounter:
+        """
+        Get the token counter for a tokenizer file, loading it on first use.
+
+        Args:
+            path (Optional[str]): Path of a local tokenizer file.
+            chars_per_token (float): Estimate used when the tokenizer is unavailable.
+
+        Returns:
+            TokenCounter: The shared counter.
+        """
+        key = (path, chars_per_token)
+        if key not in self._counters:
+            self._counters[key] = TokenCounter(path, chars_per_token)
+        return self._counters[key]
+
+    def budgeter(self, settings: LLMSettings) -> PromptBudgeter:
+        """Build a budgeter for an LLM configuration."""
+        return PromptBudgeter(
+            settings,
+            self.counter(settings.tokenizer_path, settings.budget.chars_per_token),
+        )
+
+    def record(self, stage: str, report: BudgetReport) -> None:
+        """Add one prompt's report to the stage statistics."""
+        stats = self._stages.setdefault(
+            stage,
+            {
+                'prompts': 0,
+                'prompt_tokens': 0,
+                'max_measured_tokens': 0,
+                'trimmed_prompts': 0,
+                'over_budget': 0,
+                'truncated_sections': 0,
+                'dropped_sections': 0,
+                'tokens_saved': 0,
+            },
+        )
+        stats['prompts'] += 1
+        stats['prompt_tokens'] += report.prompt_tokens
+        stats['max_measured_tokens'] = max(stats['max_measured_tokens'], report.original_tokens)
+        stats['trimmed_prompts'] += int(report.tokens_saved > 0)
+        stats['over_budget'] += int(report.prompt_tokens > report.budget)
+        stats['truncated_sections'] += len(report.truncated)
+        stats['dropped_sections'] += len(report.dropped)
+        stats['tokens_saved'] += report.tokens_saved
+
+    def stats(self) -> dict[str, Any]:
+        """Per-stage prompt sizes and tokens saved for metrics."""
+        return {stage: dict(stats) for stage, stats in self._stages.items()}
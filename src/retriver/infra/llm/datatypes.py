@@ -5,7 +5,9 @@ from enum import Enum
 from typing import Any
 from typing import Optional
 
+from pydantic import model_validator
 from shared.base import BaseModel
+from shared.settings import LLMStage
 
 
 class BaseLLMMessage(BaseModel):
@@ -24,9 +26,51 @@ class CompletionMessage(BaseLLMMessage):
     role: MessageRole
 
 
+class PromptSection(BaseModel):
+    """
+    A templated part of a prompt that may be trimmed to fit the prompt budget.
+
+    Attributes:
+        text (str): The section text.
+        priority (int): Sections with the lowest priority are trimmed first.
+        truncatable (bool): Whether the section may be trimmed at all.
+    """
+
+    text: str
+    priority: int = 0
+    truncatable: bool = True
+
+
+class SectionedMessage(CompletionMessage):
+    """
+    Completion message rendered from a template and prioritized sections.
+
+    The content is rendered from `template` on creation. Before the message is
+    sent, the LLM service may shorten or drop its lowest-priority sections to
+    keep the prompt within budget.
+
+    Attributes:
+        template (str): Format string with one field per section.
+        sections (dict[str, PromptSection]): Sections keyed by template field.
+    """
+
+    content: str = ''
+    template: str
+    sections: dict[str, PromptSection]
+
+    @model_validator(mode='after')
+    def render_content(self) -> SectionedMessage:
+        self.content = self.render({name: section.text for name, section in self.sections.items()})
+        return self
+
+    def render(self, texts: dict[str, str]) -> str:
+        """Render the template with the given section texts."""
+        return self.template.format(**texts)
+
+
 class StructuredOutput(BaseModel):
     name: str
-    schema: dict[str, object]
+    json_schema: dict[str, object]
     strict: bool = False
     description: Optional[str] = None
 
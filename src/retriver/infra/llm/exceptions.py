@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+from typing import Optional
+"""
+LLM Exceptions Module
+
+This module defines the errors raised by the LLM client so callers can tell
+transient backend failures apart from overload and circuit-breaker rejections.
+"""
+
+
+class LLMError(Exception):
+    """Base class for all errors raised by the LLM client."""
+
+
+class LLMRequestError(LLMError):
+    """
+    Raised when a request to the LLM backend fails.
+
+    Attributes:
+        status_code (Optional[int]): HTTP status code, None for transport errors.
+        retryable (bool): Whether the request may succeed if sent again.
+        retry_after (Optional[float]): Delay in seconds requested by the backend.
+    """
+
+    def __init__(
+        self,
+        message: str,
+        status_code: Optional[int] = None,
+        retryable: bool = False,
+        retry_after: Optional[float] = None,
+    ):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retryable = retryable
+        self.retry_after = retry_after
+
+
+class LLMOverloadError(LLMRequestError):
+    """
+    Raised when the concurrency limiter rejects a request instead of queueing it.
+
+    Retryable, so the retry loop can fail over to another endpoint.
+    """
+
+    def __init__(self, message: str):
+        super().__init__(message, retryable=True)
+
+
+class LLMCircuitOpenError(LLMRequestError):
+    """
+    Raised when the circuit breaker is open and the backend is considered unhealthy.
+
+    Retryable, so the retry loop can fail over to another endpoint.
+    """
+
+    def __init__(self, message: str):
+        super().__init__(message, retryable=True)
+
+
+class LLMStructuredOutputError(LLMError):
+    """
+    Raised when a response does not match the requested schema, even after repair.
+
+    Attributes:
+        response (str): The last raw response received.
+    """
+
+    def __init__(self, message: str, response: str):
+        super().__init__(message)
+        self.response = response
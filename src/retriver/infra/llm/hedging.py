@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+import math
+import random
+from collections import deque
+from typing import Any
+from typing import Optional
+
+from shared.base import SingletonMeta
+from shared.settings import LLMHedgingSettings
+"""
+LLM Hedging Module
+
+This module decides when a slow LLM call should be duplicated. It learns the
+latency distribution of recent calls, fires a hedge once a call has been
+outstanding longer than the configured percentile, and keeps the extra load
+within a token-bucket budget. A small control group of requests is never
+hedged so the tail-latency improvement can be measured against it.
+"""
+
+
+def percentile(samples: list[float] | deque[float], q: float) -> Optional[float]:
+    """
+    Nearest-rank percentile of a set of samples.
+
+    Args:
+        samples: Latency samples in seconds.
+        q (float): Percentile in [0, 1].
+
+    Returns:
+        Optional[float]: The percentile value, or None when there are no samples.
+    """
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, math.ceil(q * len(ordered)) - 1))
+    return ordered[rank]
+
+
+class HedgePolicy:
+    """
+    Hedging state for one LLM endpoint.
+
+    Attributes:
+        settings (LLMHedgingSettings): Percentile, budget and warm-up settings.
+    """
+
+    def __init__(self, settings: LLMHedgingSettings):
+        self.settings = settings
+        self._latencies: deque[float] = deque(maxlen=settings.window)
+        self._treated: deque[float] = deque(maxlen=settings.window)
+        self._control: deque[float] = deque(maxlen=settings.window)
+        self._tokens = float(settings.max_hedge_burst)
+
+        self.requests = 0
+        self.control_requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.budget_denied = 0
+
+    def hedge_delay(self) -> Optional[float]:
+        """
+        How long to wait for the primary call before sending a hedge.
+
+        Returns:
+            Optional[float]: Seconds to wait, or None while there are too few
+                samples to estimate the latency percentile.
+        """
+        if len(self._latencies) < self.settings.min_samples:
+            return None
+        return max(self.settings.min_delay, percentile(self._latencies, self.settings.percentile))
+
+    def start_request(self) -> bool:
+        """
+        Count a request and earn its share of the hedge budget.
+
+        Returns:
+            bool: True if the request belongs to the control group and must not
+                be hedged.
+        """
+        if random.random() < self.settings.control_ratio:
+            self.control_requests += 1
+            return True
+        self.requests += 1
+        self._tokens = min(
+            float(self.settings.max_hedge_burst),
+            self._tokens + self.settings.max_hedge_ratio,
+        )
+        return False
+
+    def try_hedge(self) -> bool:
+        """
+        Spend one hedge from the budget.
+
+        Returns:
+            bool: True if a hedge may be sent.
+        """
+        if self._tokens < 1.0:
+            self.budget_denied += 1
+            return False
+        self._tokens -= 1.0
+        self.hedged += 1
+        return True
+
+    def record_call(self, latency: float) -> None:
+        """Record the latency of a single completed call (primary or hedge)."""
+        self._latencies.append(latency)
+
+    def record_request(self, latency: float, control: bool, hedge_won: bool = False) -> None:
+        """
+        Record the end-to-end latency of a request.
+
+        Args:
+            latency (float): Latency seen by the caller.
+            control (bool): Whether the request was in the unhedged control group.
+            hedge_won (bool): Whether the hedge returned first.
+        """
+        if control:
+            self._control.append(latency)
+            return
+        self._treated.append(latency)
+        if hedge_won:
+            self.hedge_wins += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Hedge rate and tail-latency comparison for metrics."""
+        p99 = percentile(self._treated, 0.99)
+        p99_control = percentile(self._control, 0.99)
+        return {
+            'requests': self.requests,
+            'control_requests': self.control_requests,
+            'hedged': self.hedged,
+            'hedge_wins': self.hedge_wins,
+            'budget_denied': self.budget_denied,
+            'hedge_rate': self.hedged / self.requests if self.requests else 0.0,
+            'hedge_delay': self.hedge_delay(),
+            'p99_latency': p99,
+            'p99_latency_control': p99_control,
+            'p99_improvement': (
+                p99_control - p99 if p99 is not None and p99_control is not None else None
+            ),
+        }
+
+
+class HedgePolicyRegistry(metaclass=SingletonMeta):
+    """Process-wide registry of HedgePolicy instances keyed by endpoint URL."""
+
+    def __init__(self):
+        self._policies: dict[str, HedgePolicy] = {}
+
+    def get(self, url: str, settings: LLMHedgingSettings) -> HedgePolicy:
+        """
+        Get the hedging policy for an endpoint, creating it on first use.
+
+        Args:
+            url (str): The primary endpoint URL.
+            settings (LLMHedgingSettings): Settings used if the policy is created.
+
+        Returns:
+            HedgePolicy: The shared policy for the endpoint.
+        """
+        if url not in self._policies:
+            self._policies[url] = HedgePolicy(settings)
+        return self._policies[url]
+
+    def stats(self) -> dict[str, Any]:
+        """Metrics for every known endpoint."""
+        return {url: policy.stats() for url, policy in self._policies.items()}
@@ -0,0 +1,271 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from enum import Enum
+from typing import Any
+
+from shared.base import SingletonMeta
+from shared.logging import get_logger
+from shared.settings import LLMResilienceSettings
+
+from .exceptions import LLMCircuitOpenError
+from .exceptions import LLMOverloadError
+"""
+LLM Limiter Module
+
+This module protects the LLM backend from bursts of requests. It provides an
+AIMD (additive increase, multiplicative decrease) concurrency limiter, a
+circuit breaker that fails fast while the backend is unhealthy, and a
+process-wide registry so every LLMService pointing at the same endpoint
+shares the same limits.
+"""
+
+logger = get_logger(__name__)
+
+
+class LimiterOutcome(str, Enum):
+    SUCCESS = 'success'
+    OVERLOAD = 'overload'
+    IGNORE = 'ignore'
+
+
+class CircuitState(str, Enum):
+    CLOSED = 'closed'
+    OPEN = 'open'
+    HALF_OPEN = 'half_open'
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD concurrency limiter for calls to a single backend.
+
+    The limit grows by roughly one slot per window of successful calls and is
+    multiplied by `backoff_ratio` whenever the backend signals overload
+    (429/503 responses or timeouts). Callers above the limit wait in a queue;
+    when the queue is full or the wait exceeds `queue_timeout` the call is
+    rejected with LLMOverloadError.
+
+    Attributes:
+        settings (LLMResilienceSettings): Limits, queue size and decrease ratio.
+    """
+
+    def __init__(self, settings: LLMResilienceSettings):
+        self.settings = settings
+        self._limit = float(settings.initial_limit)
+        self._in_flight = 0
+        self._waiting = 0
+        self._condition = asyncio.Condition()
+
+        self.accepted = 0
+        self.rejected = 0
+        self.overloads = 0
+
+    @property
+    def limit(self) -> int:
+        """Current integer concurrency limit."""
+        return max(self.settings.min_limit, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        """Number of calls currently holding a slot."""
+        return self._in_flight
+
+    async def acquire(self) -> None:
+        """
+        Wait for a free slot under the current limit.
+
+        Raises:
+            LLMOverloadError: If the queue is full or the wait times out.
+        """
+        async with self._condition:
+            if self._in_flight < self.limit and self._waiting == 0:
+                self._in_flight += 1
+                self.accepted += 1
+                return
+
+            if self._waiting >= self.settings.max_queue:
+                self.rejected += 1
+                raise LLMOverloadError(
+                    f'LLM limiter queue is full ({self._waiting} waiting, limit {self.limit})',
+                )
+
+            self._waiting += 1
+            try:
+                await asyncio.wait_for(
+                    self._condition.wait_for(lambda: self._in_flight < self.limit),
+                    timeout=self.settings.queue_timeout,
+                )
+            except asyncio.TimeoutError:
+                self.rejected += 1
+                raise LLMOverloadError(
+                    f'Timed out after {self.settings.queue_timeout}s waiting for an LLM slot',
+                )
+            finally:
+                self._waiting -= 1
+
+            self._in_flight += 1
+            self.accepted += 1
+
+    async def release(self, outcome: LimiterOutcome) -> None:
+        """
+        Release a slot and adapt the limit to the outcome of the call.
+
+        Args:
+            outcome (LimiterOutcome): SUCCESS grows the limit, OVERLOAD shrinks it,
+                IGNORE leaves it unchanged.
+        """
+        async with self._condition:
+            self._in_flight -= 1
+
+            if outcome == LimiterOutcome.SUCCESS:
+                self._limit = min(
+                    float(self.settings.max_limit),
+                    self._limit + 1.0 / max(self._limit, 1.0),
+                )
+            elif outcome == LimiterOutcome.OVERLOAD:
+                self.overloads += 1
+                self._limit = max(
+                    float(self.settings.min_limit),
+                    self._limit * self.settings.backoff_ratio,
+                )
+                logger.warning(f'LLM backend overloaded, concurrency limit lowered to {self.limit}')
+
+            self._condition.notify_all()
+
+    def stats(self) -> dict[str, Any]:
+        """Snapshot of the limiter state for metrics."""
+        return {
+            'limit': self.limit,
+            'in_flight': self._in_flight,
+            'waiting': self._waiting,
+            'accepted': self.accepted,
+            'rejected': self.rejected,
+            'overloads': self.overloads,
+        }
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker that fails fast while the backend is unhealthy.
+
+    After `failure_threshold` consecutive failures the circuit opens and every
+    call is rejected for `reset_timeout` seconds. The next call after that is
+    let through as a probe: success closes the circuit, failure re-opens it.
+
+    Attributes:
+        settings (LLMResilienceSettings): Failure threshold and reset timeout.
+    """
+
+    def __init__(self, settings: LLMResilienceSettings):
+        self.settings = settings
+        self.state = CircuitState.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+
+        self.short_circuited = 0
+        self.trips = 0
+
+    def before_call(self) -> None:
+        """
+        Check whether a call may proceed.
+
+        Raises:
+            LLMCircuitOpenError: If the circuit is open or a probe is already running.
+        """
+        if self.state == CircuitState.OPEN:
+            if time.monotonic() - self._opened_at < self.settings.reset_timeout:
+                self.short_circuited += 1
+                raise LLMCircuitOpenError('LLM circuit is open, backend considered unhealthy')
+            self.state = CircuitState.HALF_OPEN
+
+        if self.state == CircuitState.HALF_OPEN:
+            if self._probe_in_flight:
+                self.short_circuited += 1
+                raise LLMCircuitOpenError('LLM circuit is half-open, waiting for probe result')
+            self._probe_in_flight = True
+
+    def rejecting(self) -> bool:
+        """Whether `before_call` would reject a call right now, without counting it."""
+        if self.state == CircuitState.OPEN:
+            return time.monotonic() - self._opened_at < self.settings.reset_timeout
+        return self.state == CircuitState.HALF_OPEN and self._probe_in_flight
+
+    def record_success(self) -> None:
+        """Record a healthy response from the backend."""
+        if self.state != CircuitState.CLOSED:
+            logger.info('LLM circuit closed after successful probe')
+        self.state = CircuitState.CLOSED
+        self._consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def abandon(self) -> None:
+        """Forget an in-flight probe whose call ended without a backend response."""
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed call, opening the circuit when the threshold is reached."""
+        self._consecutive_failures += 1
+        self._probe_in_flight = False
+
+        if (
+            self.state == CircuitState.HALF_OPEN
+            or self._consecutive_failures >= self.settings.failure_threshold
+        ):
+            if self.state != CircuitState.OPEN:
+                self.trips += 1
+                logger.error(
+                    f'LLM circuit opened after {self._consecutive_failures} consecutive failures',
+                )
+            self.state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
+
+    def stats(self) -> dict[str, Any]:
+        """Snapshot of the breaker state for metrics."""
+        return {
+            'state': self.state.value,
+            'consecutive_failures': self._consecutive_failures,
+            'short_circuited': self.short_circuited,
+            'trips': self.trips,
+        }
+
+
+class LLMGuard:
+    """Limiter and circuit breaker pair protecting one LLM endpoint."""
+
+    def __init__(self, settings: LLMResilienceSettings):
+        self.limiter = AdaptiveConcurrencyLimiter(settings)
+        self.breaker = CircuitBreaker(settings)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            'limiter': self.limiter.stats(),
+            'circuit': self.breaker.stats(),
+        }
+
+
+class LLMGuardRegistry(metaclass=SingletonMeta):
+    """Process-wide registry of LLMGuard instances keyed by endpoint URL."""
+
+    def __init__(self):
+        self._guards: dict[str, LLMGuard] = {}
+
+    def get(self, url: str, settings: LLMResilienceSettings) -> LLMGuard:
+        """
+        Get the guard for an endpoint, creating it on first use.
+
+        Args:
+            url (str): The endpoint URL.
+            settings (LLMResilienceSettings): Settings used if the guard is created.
+
+        Returns:
+            LLMGuard: The shared guard for the endpoint.
+        """
+        if url not in self._guards:
+            self._guards[url] = LLMGuard(settings)
+        return self._guards[url]
+
+    def stats(self) -> dict[str, Any]:
+        """Metrics for every known endpoint."""
+        return {url: guard.stats() for url, guard in self._guards.items()}
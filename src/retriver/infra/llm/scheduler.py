@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import math
+import time
+import uuid
+from collections import deque
+from contextlib import asynccontextmanager
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any
+from typing import AsyncIterator
+from typing import Iterator
+from typing import Optional
+
+from shared.base import BaseModel
+from shared.base import SingletonMeta
+from shared.settings import LLMSchedulerSettings
+
+from .hedging import percentile
+"""
+LLM Scheduler Module
+
+This module orders LLM calls across all concurrent user requests. Calls are
+ranked by the priority of the pipeline stage that issues them plus the age of
+the request they belong to, so a request about to produce its final answer
+does not wait behind another request's first tool decision. Each request is
+held to a fair share of the global concurrency cap while others are waiting.
+"""
+
+
+class RequestContext(BaseModel):
+    """
+    Identity of the user request an LLM call belongs to.
+
+    Attributes:
+        request_id (str): Unique identifier of the request.
+        started_at (float): Monotonic time the request started.
+    """
+
+    request_id: str
+    started_at: float
+
+
+_current_request: ContextVar[Optional[RequestContext]] = ContextVar(
+    'llm_current_request',
+    default=None,
+)
+
+
+@contextmanager
+def request_scope(request_id: Optional[str] = None) -> Iterator[RequestContext]:
+    """
+    Mark every LLM call made inside the block as belonging to one user request.
+
+    Args:
+        request_id (Optional[str]): Identifier of the request, generated if omitted.
+
+    Yields:
+        RequestContext: The bound request context.
+    """
+    context = RequestContext(
+        request_id=request_id or str(uuid.uuid4()),
+        started_at=time.monotonic(),
+    )
+    token = _current_request.set(context)
+    try:
+        yield context
+    finally:
+        _current_request.reset(token)
+
+
+class _Ticket:
+    """A pending or granted LLM call slot."""
+
+    __slots__ = ('stage', 'priority', 'request_id', 'request_started', 'seq', 'enqueued', 'future')
+
+    def __init__(
+        self,
+        stage: str,
+        priority: int,
+        request_id: str,
+        request_started: float,
+        seq: int,
+        future: asyncio.Future,
+    ):
+        self.stage = stage
+        self.priority = priority
+        self.request_id = request_id
+        self.request_started = request_started
+        self.seq = seq
+        self.enqueued = time.monotonic()
+        self.future = future
+
+
+class LLMScheduler(metaclass=SingletonMeta):
+    """
+    Process-wide scheduler enforcing the global LLM concurrency cap.
+
+    A waiting call's effective priority is its stage priority plus
+    `aging_rate` points per second of its request's age. Since every waiting
+    call ages at the same rate, ranking by `priority - aging_rate * started_at`
+    is equivalent and does not change over time. While slots are contended a
+    request may hold at most `ceil(max_concurrency / active_requests)` of them;
+    idle slots are always handed out so the scheduler stays work-conserving.
+
+    Attributes:
+        settings (LLMSchedulerSettings): Concurrency cap, aging rate and stage priorities.
+    """
+
+    def __init__(self, settings: LLMSchedulerSettings):
+        self.settings = settings
+        self._waiting: list[_Ticket] = []
+        self._in_flight = 0
+        self._per_request: dict[str, int] = {}
+        self._seq = itertools.count()
+
+        self._dispatched: dict[str, int] = {}
+        self._wait_times: dict[str, deque[float]] = {}
+
+    def _rank(self, ticket: _Ticket) -> tuple[float, int]:
+        return (
+            self.settings.aging_rate * ticket.request_started - ticket.priority,
+            ticket.seq,
+        )
+
+    def _fair_share(self) -> int:
+        active = set(self._per_request) | {ticket.request_id for ticket in self._waiting}
+        return max(1, math.ceil(self.settings.max_concurrency / max(len(active), 1)))
+
+    def _dispatch(self) -> None:
+        """Grant free slots to the best-ranked eligible waiting calls."""
+        # Waiters cancelled since the last dispatch have not cleaned up yet
+        self._waiting = [ticket for ticket in self._waiting if not ticket.future.done()]
+        while self._waiting and self._in_flight < self.settings.max_concurrency:
+            share = self._fair_share()
+            eligible = [
+                ticket
+                for ticket in self._waiting
+                if self._per_request.get(ticket.request_id, 0) < share
+            ] or self._waiting
+            ticket = min(eligible, key=self._rank)
+            self._waiting.remove(ticket)
+
+            self._in_flight += 1
+            self._per_request[ticket.request_id] = self._per_request.get(ticket.request_id, 0) + 1
+            self._dispatched[ticket.stage] = self._dispatched.get(ticket.stage, 0) + 1
+            self._wait_times.setdefault(ticket.stage, deque(maxlen=500)).append(
+                time.monotonic() - ticket.enqueued,
+            )
+            ticket.future.set_result(None)
+
+    async def acquire(self, stage: str) -> _Ticket:
+        """
+        Wait until the call is granted a slot.
+
+        Args:
+            stage (str): The pipeline stage issuing the call.
+
+        Returns:
+            _Ticket: The granted ticket, to be passed to `release`.
+        """
+        context = _current_request.get()
+        seq = next(self._seq)
+        if context is None:
+            context = RequestContext(request_id=f'anonymous-{seq}', started_at=time.monotonic())
+
+        ticket = _Ticket(
+            stage=stage,
+            priority=self.settings.stage_priorities.get(stage, 0),
+            request_id=context.request_id,
+            request_started=context.started_at,
+            seq=seq,
+            future=asyncio.get_running_loop().create_future(),
+        )
+        self._waiting.append(ticket)
+        self._dispatch()
+
+        try:
+            await ticket.future
+        except asyncio.CancelledError:
+            if ticket.future.done() and not ticket.future.cancelled():
+                self.release(ticket)
+            elif ticket in self._waiting:
+                self._waiting.remove(ticket)
+            raise
+        return ticket
+
+    def release(self, ticket: _Ticket) -> None:
+        """
+        Return a granted slot and wake the next waiting call.
+
+        Args:
+            ticket (_Ticket): The ticket returned by `acquire`.
+        """
+        self._in_flight -= 1
+        remaining = self._per_request.get(ticket.request_id, 1) - 1
+        if remaining > 0:
+            self._per_request[ticket.request_id] = remaining
+        else:
+            self._per_request.pop(ticket.request_id, None)
+        self._dispatch()
+
+    @asynccontextmanager
+    async def slot(self, stage: str) -> AsyncIterator[None]:
+        """
+        Hold a scheduler slot for the duration of the block.
+
+        Does nothing when the scheduler is disabled.
+
+        Args:
+            stage (str): The pipeline stage issuing the call.
+        """
+        if not self.settings.enabled:
+            yield
+            return
+
+        ticket = await self.acquire(stage)
+        try:
+            yield
+        finally:
+            self.release(ticket)
+
+    def stats(self) -> dict[str, Any]:
+        """Queue depth and per-stage wait times for metrics."""
+        return {
+            'max_concurrency': self.settings.max_concurrency,
+            'in_flight': self._in_flight,
+            'waiting': len(self._waiting),
+            'active_requests': len(self._per_request),
+            'stages': {
+                stage: {
+                    'dispatched': self._dispatched.get(stage, 0),
+                    'p50_wait': percentile(waits, 0.5),
+                    'p95_wait': percentile(waits, 0.95),
+                }
+                for stage, waits in self._wait_times.items()
+            },
+        }
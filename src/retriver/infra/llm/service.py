@@ -1,28 +1,115 @@
 from __future__ import annotations
 
+import asyncio
+import random
+import time
+from datetime import datetime
+from datetime import timezone
+from email.utils import parsedate_to_datetime
 from typing import Any
+from typing import Callable
+from typing import Optional
 
 import httpx
+import orjson
 from fastapi.encoders import jsonable_encoder
+from infra.balancer import LoadBalancer
+from infra.balancer import LoadBalancerRegistry
+from infra.cassette import CassetteRegistry
+from pydantic import ValidationError
 from shared.base import BaseModel
 from shared.logging import get_logger
 from shared.settings import LLMSettings
 
 from .base import LLMBaseService
+from .base import LLMStructuredOutput
+from .budget import PromptBudgeter
+from .budget import PromptBudgetRegistry
 from .datatypes import BatchMessage
 from .datatypes import BatchResponse
+from .datatypes import CompletionMessage
+from .datatypes import LLMStage
 from .datatypes import Message
 from .datatypes import Response
+from .datatypes import StructuredOutput
+from .exceptions import LLMCircuitOpenError
+from .exceptions import LLMOverloadError
+from .exceptions import LLMRequestError
+from .exceptions import LLMStructuredOutputError
+from .hedging import HedgePolicy
+from .hedging import HedgePolicyRegistry
+from .limiter import LimiterOutcome
+from .limiter import LLMGuard
+from .limiter import LLMGuardRegistry
+from .scheduler import LLMScheduler
+from .structured import parse_structured
+from .structured import repair_messages
+from .structured import response_format
+from .structured import structured_output_for
+from .structured import T
 """
 LLM Service Module
 
 This module provides functionality to interact with external language models
 through an API interface, handling message formatting, request processing,
-and response parsing.
+retries with backoff, and response parsing.
 """
 
 logger = get_logger(__name__)
 
+RETRYABLE_STATUS_CODES = {429, 500, 502, 503, 504}
+OVERLOAD_STATUS_CODES = {429, 503}
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header given either as seconds or as an HTTP date.
+
+    Args:
+        value (Optional[str]): The raw header value.
+
+    Returns:
+        Optional[float]: The delay in seconds, or None if absent or invalid.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def is_endpoint_failure(error: Exception) -> bool:
+    """Whether an error says the endpoint is unhealthy: transport errors and 5xx responses."""
+    if isinstance(error, (LLMOverloadError, LLMCircuitOpenError)):
+        return False
+    return isinstance(error, LLMRequestError) and (
+        error.status_code is None or error.status_code >= 500
+    )
+
+
+def merge_usage(*metadata: dict[str, Any]) -> dict[str, str]:
+    """
+    Sum the token counts of several LLM calls.
+
+    Args:
+        *metadata (dict[str, Any]): Metadata of each call.
+
+    Returns:
+        dict[str, str]: Combined prompt, completion and total token counts.
+    """
+    return {
+        key: str(sum(int(item.get(key, 0)) for item in metadata))
+        for key in ('prompt_tokens', 'completion_tokens', 'total_tokens')
+    }
+
 
 class LLMInput(BaseModel):
     """
@@ -58,23 +145,293 @@ class LLMService(LLMBaseService):
 
     Attributes:
         settings (LLMSettings): Configuration settings for the LLM service.
+        stage (str): Pipeline stage the service is used by.
+        escalation (Optional[LLMService]): Larger model to retry on when this
+            service's response does not parse.
     """
 
     settings: LLMSettings
+    stage: str = LLMStage.DEFAULT.value
+    escalation: Optional[LLMService] = None
+
+    @classmethod
+    def for_stage(cls, settings: LLMSettings, stage: LLMStage | str) -> LLMService:
+        """
+        Build the LLM service used by a pipeline stage.
+
+        The stage's overrides from `settings.stages` are applied. When the stage
+        has `escalate` set, the service falls back to the default model for
+        responses that do not parse.
+
+        Args:
+            settings (LLMSettings): The default LLM settings.
+            stage (LLMStage | str): The pipeline stage.
+
+        Returns:
+            LLMService: The service configured for the stage.
+        """
+        stage = LLMStage(stage).value
+        override = settings.stages.get(stage)
+        escalation = None
+        if override is not None and override.escalate:
+            escalation = cls(settings=settings, stage=stage)
+        return cls(settings=settings.for_stage(stage), stage=stage, escalation=escalation)
 
     @property
     def header(self) -> dict[str, str]:
         """
         HTTP headers for LLM API requests.
 
+        The pipeline stage is sent as `X-LLM-Stage` so local stub servers and
+        proxies can tell calls apart; OpenAI-compatible backends ignore it.
+
         Returns:
             dict[str, str]: Dictionary of HTTP headers for the LLM API requests.
         """
         return {
             'accept': 'application/json',
             'Content-Type': 'application/json',
+            'X-LLM-Stage': self.stage,
+        }
+
+    def guard(self, url: str) -> LLMGuard:
+        """
+        Concurrency limiter and circuit breaker shared by all calls to an endpoint.
+
+        Args:
+            url (str): The endpoint URL.
+
+        Returns:
+            LLMGuard: The process-wide guard for the endpoint.
+        """
+        return LLMGuardRegistry().get(url, self.settings.resilience)
+
+    @property
+    def hedge_policy(self) -> HedgePolicy:
+        """
+        Hedging state shared by all calls to the configured endpoint.
+
+        Returns:
+            HedgePolicy: The process-wide hedging policy for the configured URL.
+        """
+        return HedgePolicyRegistry().get(self.settings.endpoints[0], self.settings.hedging)
+
+    @property
+    def balancer(self) -> LoadBalancer:
+        """
+        Load balancer over the configured endpoints.
+
+        Returns:
+            LoadBalancer: Balancer sharing the process-wide endpoint health and latency.
+        """
+        return LoadBalancerRegistry().get('llm', self.settings.endpoints, self.settings.balancer)
+
+    def _open_circuits(self) -> set[str]:
+        """
+        Endpoints whose circuit breaker would reject a call right now.
+
+        The balancer ejects an endpoint for less time than its breaker stays
+        open, so these are excluded when picking or the idle endpoint would
+        keep winning and fail fast.
+
+        Returns:
+            set[str]: URLs of the endpoints to avoid.
+        """
+        return {
+            endpoint.url
+            for endpoint in self.balancer.endpoints
+            if self.guard(endpoint.url).breaker.rejecting()
         }
 
+    def _retry_delay(self, attempt: int, retry_after: Optional[float]) -> Optional[float]:
+        """
+        Compute how long to wait before the next attempt.
+
+        Uses full-jitter exponential backoff, or the backend's Retry-After value
+        when one was given. A Retry-After longer than the maximum delay means the
+        request is not worth holding, so None is returned and the caller gives up.
+
+        Args:
+            attempt (int): Zero-based index of the attempt that just failed.
+            retry_after (Optional[float]): Delay requested by the backend, if any.
+
+        Returns:
+            Optional[float]: Seconds to sleep, or None to stop retrying.
+        """
+        resilience = self.settings.resilience
+        if retry_after is not None:
+            if retry_after > resilience.retry_max_delay:
+                return None
+            return retry_after + random.uniform(0, resilience.retry_base_delay)
+        ceiling = min(resilience.retry_max_delay, resilience.retry_base_delay * 2**attempt)
+        return random.uniform(0, ceiling)
+
+    @property
+    def scheduler(self) -> LLMScheduler:
+        """
+        Process-wide scheduler ordering LLM calls across concurrent requests.
+
+        Returns:
+            LLMScheduler: The shared scheduler instance.
+        """
+        return LLMScheduler(self.settings.scheduler)
+
+    async def _send(self, body: dict[str, Any], url: str) -> dict[str, Any]:
+        """
+        Send a single request through the circuit breaker, scheduler and concurrency limiter.
+
+        The call counts as outstanding on its endpoint in the load balancer.
+        When a cassette is active the request is recorded or replayed once it
+        has been granted a scheduler slot.
+
+        Args:
+            body (dict[str, Any]): The JSON request body.
+            url (str): The endpoint to send the request to.
+
+        Returns:
+            dict[str, Any]: The decoded JSON response.
+
+        Raises:
+            LLMCircuitOpenError: If the circuit is open.
+            LLMOverloadError: If the limiter rejects the request.
+            LLMRequestError: If the request fails or returns a non-200 status.
+        """
+        guard = self.guard(url)
+        guard.breaker.before_call()
+
+        async def call() -> dict[str, Any]:
+            async with self.balancer.track(url, is_failure=is_endpoint_failure):
+                return await self._post(body, url, guard)
+
+        try:
+            async with self.scheduler.slot(self.stage):
+                return await CassetteRegistry().play('llm', body, call)
+        except BaseException:
+            guard.breaker.abandon()
+            raise
+
+    async def _post(self, body: dict[str, Any], url: str, guard: LLMGuard) -> dict[str, Any]:
+        """
+        Post a request while holding a slot of the endpoint's concurrency limiter.
+
+        Args:
+            body (dict[str, Any]): The JSON request body.
+            url (str): The endpoint to send the request to.
+            guard (LLMGuard): The endpoint's limiter and circuit breaker.
+
+        Returns:
+            dict[str, Any]: The decoded JSON response.
+        """
+        await guard.limiter.acquire()
+
+        outcome = LimiterOutcome.IGNORE
+        try:
+            try:
+                async with httpx.AsyncClient() as client:
+                    response = await client.post(
+                        url,
+                        headers=self.header,
+                        content=orjson.dumps(body),
+                        timeout=self.settings.request_timeout,
+                    )
+            except httpx.TimeoutException as e:
+                outcome = LimiterOutcome.OVERLOAD
+                guard.breaker.record_failure()
+                raise LLMRequestError(f'LLM request timed out: {e}', retryable=True) from e
+            except httpx.TransportError as e:
+                guard.breaker.record_failure()
+                raise LLMRequestError(f'LLM request failed: {e}', retryable=True) from e
+
+            if response.status_code >= 500:
+                guard.breaker.record_failure()
+            else:
+                guard.breaker.record_success()
+
+            if response.status_code == 200:
+                outcome = LimiterOutcome.SUCCESS
+                return orjson.loads(response.content)
+
+            if response.status_code in OVERLOAD_STATUS_CODES:
+                outcome = LimiterOutcome.OVERLOAD
+            raise LLMRequestError(
+                f'LLM request failed with status code {response.status_code}: {response.text}',
+                status_code=response.status_code,
+                retryable=response.status_code in RETRYABLE_STATUS_CODES,
+                retry_after=parse_retry_after(response.headers.get('retry-after')),
+            )
+        finally:
+            await guard.limiter.release(outcome)
+
+    async def _send_hedged(self, body: dict[str, Any]) -> dict[str, Any]:
+        """
+        Send a request, duplicating it if it is slower than usual.
+
+        When hedging is enabled and the primary call has not returned within the
+        learned latency percentile, a second identical call is sent to the
+        secondary endpoint, or another balanced endpoint, if the hedge budget allows. The
+        first successful response wins and the other call is cancelled.
+        Requests in the control group are never hedged. The secondary endpoint
+        is outside the load balancer, which does not track its health.
+
+        If the caller is cancelled, the calls in flight are cancelled too so
+        they release their limiter, scheduler and balancer slots.
+
+        Args:
+            body (dict[str, Any]): The JSON request body.
+
+        Returns:
+            dict[str, Any]: The decoded JSON response of the winning call.
+        """
+        primary_url = self.balancer.pick(exclude=self._open_circuits()).url
+        if not self.settings.hedging.enabled:
+            return await self._send(body, primary_url)
+
+        policy = self.hedge_policy
+        control = policy.start_request()
+        started = time.perf_counter()
+
+        async def timed(url: str) -> dict[str, Any]:
+            call_started = time.perf_counter()
+            data = await self._send(body, url)
+            policy.record_call(time.perf_counter() - call_started)
+            return data
+
+        primary = asyncio.create_task(timed(primary_url))
+        pending = {primary}
+        try:
+            delay = None if control else policy.hedge_delay()
+            if delay is not None:
+                await asyncio.wait({primary}, timeout=delay)
+
+            if primary.done() or delay is None or not policy.try_hedge():
+                data = await primary
+                policy.record_request(time.perf_counter() - started, control=control)
+                return data
+
+            if self.settings.hedging.secondary_url is not None:
+                hedge_url = str(self.settings.hedging.secondary_url)
+            else:
+                hedge_url = self.balancer.pick(exclude=self._open_circuits() | {primary_url}).url
+            hedge = asyncio.create_task(timed(hedge_url))
+            pending = {primary, hedge}
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = task.exception()
+                        continue
+                    policy.record_request(
+                        time.perf_counter() - started,
+                        control=False,
+                        hedge_won=task is hedge,
+                    )
+                    return task.result()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
     async def inference(
         self,
         message: Message,
@@ -84,10 +441,14 @@ class LLMService(LLMBaseService):
         presence_penalty: int,
         max_completion_tokens: int,
         temperature: float,
+        response_format: Optional[dict[str, Any]] = None,
     ) -> Response:
         """
         Make an inference request to the LLM API.
 
+        Transient failures (timeouts, connection errors, 429 and 5xx responses)
+        are retried with jittered exponential backoff, honoring Retry-After.
+
         Args:
             message (Message): The message to send to the LLM.
             frequency_penalty (int): Penalty for using frequent tokens.
@@ -96,12 +457,16 @@ class LLMService(LLMBaseService):
             presence_penalty (int): Penalty for repeating tokens.
             max_completion_tokens (int): Maximum number of tokens to generate.
             temperature (float): Sampling temperature for generation.
+            response_format (Optional[dict[str, Any]]): Constraint on the response
+                format, e.g. a JSON schema.
 
         Returns:
             Response: The LLM response with content and token usage statistics.
 
         Raises:
-            Exception: If the LLM request fails or returns an error.
+            LLMRequestError: If the request still fails after all retries.
+            LLMOverloadError: If the concurrency limiter rejects the request.
+            LLMCircuitOpenError: If the backend is considered unhealthy.
         """
         body = {
             'model': model,
@@ -112,34 +477,90 @@ class LLMService(LLMBaseService):
             'max_completion_tokens': max_completion_tokens,
             'temperature': temperature,
         }
+        if response_format is not None:
+            body['response_format'] = response_format
+
+        max_retries = self.settings.resilience.max_retries
+        for attempt in range(max_retries + 1):
+            try:
+                data = await self._send_hedged(body)
+                break
+            except LLMRequestError as e:
+                delay = self._retry_delay(attempt, e.retry_after) if e.retryable else None
+                if attempt == max_retries or delay is None:
+                    raise
+                logger.warning(
+                    f'LLM request failed (attempt {attempt + 1}/{max_retries + 1}), '
+                    f'retrying in {delay:.2f}s: {e}',
+                )
+                await asyncio.sleep(delay)
 
-        async with httpx.AsyncClient() as client:
-            response = await client.post(
-                str(self.settings.url),
-                headers=self.header,
-                json=body,
-                timeout=None,
-            )
-        if response.status_code != 200:
-            raise Exception(
-                f'LLM request failed with status code {response.status_code}: {response.text}',
-            )
         return {
-            'message': response.json()['choices'][0]['message']['content'],
-            'prompt_tokens': response.json()['usage']['prompt_tokens'],
-            'completion_tokens': response.json()['usage']['completion_tokens'],
-            'total_tokens': response.json()['usage']['total_tokens'],
+            'message': data['choices'][0]['message']['content'],
+            'prompt_tokens': data['usage']['prompt_tokens'],
+            'completion_tokens': data['usage']['completion_tokens'],
+            'total_tokens': data['usage']['total_tokens'],
         }
 
-    async def process(self, input: LLMInput) -> LLMOutput:
+    @property
+    def budgeter(self) -> PromptBudgeter:
+        """
+        Prompt budgeter for this service's context window and tokenizer.
+
+        Returns:
+            PromptBudgeter: Budgeter sharing the process-wide token counter.
+        """
+        return PromptBudgetRegistry().budgeter(self.settings)
+
+    def fit_prompt(self, messages: Message | BatchMessage) -> Message | BatchMessage:
+        """
+        Measure a prompt and trim its lowest-priority sections to the budget.
+
+        Batched prompts are passed through unchanged. Sectioned messages are
+        always rendered to plain messages so only role and content are sent.
+
+        Args:
+            messages (Message | BatchMessage): The prompt to send.
+
+        Returns:
+            Message | BatchMessage: The prompt to send after trimming.
+        """
+        if not messages or not isinstance(messages[0], CompletionMessage):
+            return messages
+        if not self.settings.budget.enabled:
+            return [CompletionMessage(role=m.role, content=m.content) for m in messages]
+
+        fitted, report = self.budgeter.fit(messages)
+        PromptBudgetRegistry().record(self.stage, report)
+        if report.tokens_saved:
+            logger.info(
+                f'Trimmed {self.stage} prompt from {report.original_tokens} to '
+                f'{report.prompt_tokens} tokens (truncated: {report.truncated}, '
+                f'dropped: {report.dropped})',
+            )
+        if report.prompt_tokens > report.budget:
+            logger.warning(
+                f'{self.stage} prompt is {report.prompt_tokens} tokens, over its budget '
+                f'of {report.budget} tokens after trimming',
+            )
+        return fitted
+
+    async def process(
+        self,
+        input: LLMInput,
+        structured_output: Optional[StructuredOutput] = None,
+    ) -> LLMOutput:
         """
         Process an LLM request and return the response.
 
         This method handles the high-level workflow of sending a request to the LLM
-        and formatting the response for use by the application.
+        and formatting the response for use by the application. The prompt is
+        fitted to the token budget before it is sent.
 
         Args:
             input (LLMInput): The input containing messages for the LLM.
+            structured_output (Optional[StructuredOutput]): JSON schema the
+                response must follow, sent as the response format.
 
         Returns:
             LLMOutput: The LLM's response text and associated metadata.
@@ -148,13 +569,16 @@ class LLMService(LLMBaseService):
             Exception: If there's an error during the API request or response processing.
         """
         response = await self.inference(
-            message=input.messages,
+            message=self.fit_prompt(input.messages),
             frequency_penalty=self.settings.frequency_penalty,
             n=self.settings.n,
             model=self.settings.model,
             presence_penalty=self.settings.presence_penalty,
             max_completion_tokens=self.settings.max_completion_tokens,
             temperature=self.settings.temperature,
+            response_format=(
+                response_format(structured_output) if structured_output is not None else None
+            ),
         )
         return LLMOutput(
             response=response['message'],
@@ -164,3 +588,108 @@ class LLMService(LLMBaseService):
                 'total_tokens': str(response['total_tokens']),
             },
         )
+
+    async def process_with_escalation(
+        self,
+        input: LLMInput,
+        is_valid: Callable[[str], bool],
+    ) -> LLMOutput:
+        """
+        Process an LLM request, retrying on the larger model if the response does not parse.
+
+        Args:
+            input (LLMInput): The input containing messages for the LLM.
+            is_valid (Callable[[str], bool]): Returns True if a response can be parsed
+                by the caller.
+
+        Returns:
+            LLMOutput: The first valid response, or the escalated model's response.
+                Token counts include both calls when escalation happened.
+        """
+        output = await self.process(input)
+        if self.escalation is None or is_valid(output.response):
+            return output
+
+        logger.info(
+            f'Escalating {self.stage} from {self.settings.model} '
+            f'to {self.escalation.settings.model} after unparsable response',
+        )
+        escalated = await self.escalation.process(input)
+        escalated.metadata = merge_usage(output.metadata, escalated.metadata)
+        escalated.metadata['escalated'] = 'true'
+        return escalated
+
+    async def process_structured(
+        self,
+        input: LLMInput,
+        output_model: type[T],
+        structured_output: Optional[StructuredOutput] = None,
+    ) -> LLMStructuredOutput[T]:
+        """
+        Process an LLM request constrained to a JSON schema and validate the result.
+
+        The schema is sent as the response format. A response that still does
+        not validate gets one cheap repair call that only sends the schema, the
+        response and the validation errors. If that fails too, the request is
+        escalated to the larger model when the stage is configured to.
+
+        Args:
+            input (LLMInput): The input containing messages for the LLM.
+            output_model (type[T]): Pydantic model the response must validate into.
+            structured_output (Optional[StructuredOutput]): The constraint to send,
+                derived from `output_model` when omitted.
+
+        Returns:
+            LLMStructuredOutput[T]: The validated result, the raw response and the
+                token counts of every call made.
+
+        Raises:
+            LLMStructuredOutputError: If no valid response could be obtained.
+        """
+        structured_output = structured_output or structured_output_for(output_model)
+        output = await self.process(input, structured_output=structured_output)
+        try:
+            return LLMStructuredOutput(
+                result=parse_structured(output.response, output_model),
+                response=output.response,
+                metadata=output.metadata,
+            )
+        except ValidationError as e:
+            error = e
+        logger.warning(
+            f'{self.stage} response does not match {structured_output.name}, '
+            f'attempting repair: {error.error_count()} errors',
+        )
+
+        repair = await self.process(
+            LLMInput(messages=repair_messages(structured_output, output.response, error)),
+            structured_output=structured_output,
+        )
+        metadata = merge_usage(output.metadata, repair.metadata)
+        metadata['repaired'] = 'true'
+        try:
+            return LLMStructuredOutput(
+                result=parse_structured(repair.response, output_model),
+                response=repair.response,
+                metadata=metadata,
+            )
+        except ValidationError:
+            pass
+
+        if self.escalation is None:
+            raise LLMStructuredOutputError(
+                f'{self.stage} response does not match {structured_output.name} after repair',
+                response=repair.response,
+            )
+
+        logger.info(
+            f'Escalating {self.stage} from {self.settings.model} '
+            f'to {self.escalation.settings.model} after unrepairable response',
+        )
+        escalated = await self.escalation.process_structured(input, output_model, structured_output)
+        escalated.metadata = {
+            **merge_usage(metadata, escalated.metadata),
+            'repaired': 'true',
+            'escalated': 'true',
+        }
+        return escalated
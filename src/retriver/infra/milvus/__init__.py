@@ -1,11 +1,33 @@
 from __future__ import annotations
 
+from .cache import SearchCache
+from .cache import SearchCacheRegistry
+from .factory import create_vector_service
+from .local_index import LocalIndexRegistry
+from .local_index import LocalIndexService
+from .local_index import LocalVectorIndex
+from .milvus_driver import MilvusDriver
 from .milvus_service import MilvusService
+from .models import MilvusFilter
+from .models import MilvusHit
 from .models import MilvusInput
 from .models import MilvusOutput
+from .pool import MilvusConnectionPool
+from .pool import MilvusPoolUnavailableError
 
 __all__ = [
+    'LocalIndexRegistry',
+    'LocalIndexService',
+    'LocalVectorIndex',
+    'MilvusConnectionPool',
+    'MilvusDriver',
+    'MilvusFilter',
+    'MilvusHit',
     'MilvusService',
     'MilvusInput',
     'MilvusOutput',
+    'MilvusPoolUnavailableError',
+    'SearchCache',
+    'SearchCacheRegistry',
+    'create_vector_service',
 ]
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+from typing import Optional
+
+import numpy as np
+from shared.base import SingletonMeta
+from shared.logging import get_logger
+from shared.settings import SearchCacheSettings
+"""
+Search Cache Module
+
+This module caches vector search results per query. Entries are keyed by
+the query text, or by the quantized query embedding so that near-identical
+phrasings share an entry, together with everything that shapes the result:
+collection, search parameters, top_k and output fields. Entries expire
+after a TTL and the least recently used ones are evicted first. Each
+collection carries a version counter bumped on every write; when a newer
+version is observed the collection's cache is dropped.
+"""
+
+logger = get_logger(__name__)
+
+
+def search_signature(**params: Any) -> str:
+    """Canonical form of the parameters a search result depends on."""
+    return json.dumps(params, sort_keys=True, ensure_ascii=False, default=str)
+
+
+def text_key(signature: str, query: str) -> str:
+    """Cache key of a query text."""
+    digest = hashlib.sha256(' '.join(query.split()).encode('utf-8')).hexdigest()
+    return f'{signature}|text|{digest}'
+
+
+def vector_key(signature: str, vector: Any, step: float) -> str:
+    """Cache key of a query embedding, normalized then quantized to a grid of the given step."""
+    vector = np.asarray(vector, dtype=np.float32)
+    vector = vector / max(float(np.linalg.norm(vector)), np.finfo(np.float32).tiny)
+    cells = np.round(vector / step).astype(np.int32)
+    return f'{signature}|vector|{hashlib.sha256(cells.tobytes()).hexdigest()}'
+
+
+class SearchCache:
+    """
+    LRU cache with TTL for the search results of one collection.
+
+    Attributes:
+        settings (SearchCacheSettings): Capacity, TTL and version refresh interval.
+    """
+
+    def __init__(self, settings: SearchCacheSettings):
+        self.settings = settings
+        self.version = 0
+        self.version_checked = 0.0
+        self._entries: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def version_due(self, now: float) -> bool:
+        """Whether the collection version should be read again."""
+        return now - self.version_checked >= self.settings.version_refresh_interval
+
+    def observe_version(self, version: int, now: Optional[float] = None) -> None:
+        """Record the collection version, dropping every entry if it changed."""
+        with self._lock:
+            self.version_checked = time.monotonic() if now is None else now
+            if version == self.version:
+                return
+            if self._entries:
+                self.invalidations += 1
+                logger.info(
+                    f'Collection version {self.version} -> {version}, '
+                    f'dropping {len(self._entries)} cached searches',
+                )
+            self._entries.clear()
+            self.version = version
+
+    def get(self, key: str) -> Optional[Any]:
+        """The cached value of a key, None on a miss or expired entry."""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires, value = entry
+            if now >= expires:
+                del self._entries[key]
+                self.expired += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entries beyond capacity."""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.settings.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.settings.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Hit rate and entry counts for metrics."""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'version': self.version,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else None,
+            'expired': self.expired,
+            'evictions': self.evictions,
+            'invalidations': self.invalidations,
+        }
+
+
+class SearchCacheRegistry(metaclass=SingletonMeta):
+    """Process-wide search caches, one per collection."""
+
+    def __init__(self):
+        self._caches: dict[str, SearchCache] = {}
+
+    def get(self, collection: str, settings: SearchCacheSettings) -> SearchCache:
+        """
+        Get the cache of a collection, creating it on first use.
+
+        Args:
+            collection (str): Identifier of the collection, including its backend.
+            settings (SearchCacheSettings): Settings used if the cache is created.
+
+        Returns:
+            SearchCache: The shared cache.
+        """
+        if collection not in self._caches:
+            self._caches[collection] = SearchCache(settings)
+        return self._caches[collection]
+
+    def stats(self) -> dict[str, Any]:
+        """Per-collection cache metrics."""
+        return {collection: cache.stats() for collection, cache in self._caches.items()}
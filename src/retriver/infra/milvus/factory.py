@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from infra.embed import EmbedService
+from shared.settings import MilvusSettings
+
+from .local_index import LocalIndexService
+from .milvus_service import MilvusService
+
+
+def create_vector_service(settings: MilvusSettings, embed_service: EmbedService) -> MilvusService:
+    """
+    Build the vector store service selected by `settings.backend`.
+
+    Args:
+        settings (MilvusSettings): Vector store settings.
+        embed_service (EmbedService): Service used to embed queries.
+
+    Returns:
+        MilvusService: A MilvusService, or a LocalIndexService for the "local" backend.
+    """
+    service_class = LocalIndexService if settings.backend == 'local' else MilvusService
+    return service_class(settings=settings, embed_service=embed_service)
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import json
+import re
+from typing import Any
+
+from .models import MilvusFilter
+"""
+Search Filter Module
+
+This module turns structured search filters into Milvus boolean
+expressions, evaluated by Milvus before the vector search so only matching
+entities, and only the partitions of a partition key value, are scanned.
+The local index evaluates the same filters on its entities.
+"""
+
+
+def literal(value: Any) -> str:
+    """Milvus expression literal of a filter value."""
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (int, float)):
+        return json.dumps(value)
+    if isinstance(value, list):
+        return '[' + ', '.join(literal(item) for item in value) + ']'
+    return json.dumps(str(value), ensure_ascii=False)
+
+
+def compile_filters(filters: list[MilvusFilter]) -> str:
+    """
+    Compile filters into one Milvus boolean expression.
+
+    Args:
+        filters (list[MilvusFilter]): Conditions to AND together.
+
+    Returns:
+        str: The expression, empty when there are no filters.
+    """
+    return ' and '.join(f'{condition.field} {condition.op} {literal(condition.value)}' for condition in filters)
+
+
+def like_pattern(pattern: str) -> re.Pattern:
+    """Regular expression of a Milvus "like" pattern, "%" matching any run of characters."""
+    return re.compile('.*'.join(re.escape(part) for part in pattern.split('%')), re.DOTALL)
+
+
+def matches(entity: dict[str, Any], condition: MilvusFilter) -> bool:
+    """Whether an entity meets a condition; a missing field never does."""
+    actual = entity.get(condition.field)
+    if actual is None:
+        return False
+    value = condition.value
+    try:
+        if condition.op == '==':
+            return actual == value
+        if condition.op == '!=':
+            return actual != value
+        if condition.op == '>':
+            return actual > value
+        if condition.op == '>=':
+            return actual >= value
+        if condition.op == '<':
+            return actual < value
+        if condition.op == '<=':
+            return actual <= value
+        if condition.op == 'in':
+            return actual in value
+        if condition.op == 'not in':
+            return actual not in value
+        return like_pattern(value).fullmatch(str(actual)) is not None
+    except TypeError:
+        return False
+
+
+def match_filters(entity: dict[str, Any], filters: list[MilvusFilter]) -> bool:
+    """Whether an entity meets every condition."""
+    return all(matches(entity, condition) for condition in filters)
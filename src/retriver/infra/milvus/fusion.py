@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+from .models import MilvusHit
+"""
+Rank Fusion Module
+
+This module merges the ranked hits of several retrievers with weighted
+reciprocal-rank fusion: a hit at rank r (from 1) of a retriever with weight
+w contributes w / (k + r), and contributions of the same id add up. Only
+ranks matter, so dense similarities and BM25 scores need no normalization.
+Hits of separate collections are merged on min-max normalized scores
+instead, so that a collection's best hit scores 1 whatever its score scale.
+"""
+
+
+def reciprocal_rank_fusion(
+    rankings: dict[str, list[MilvusHit]],
+    weights: dict[str, float],
+    k: int,
+    limit: int,
+) -> list[MilvusHit]:
+    """
+    Fuse the ranked hits of several retrievers.
+
+    Args:
+        rankings (dict[str, list[MilvusHit]]): Hits of each retriever, best first.
+        weights (dict[str, float]): Weight of each retriever, 1.0 when missing.
+        k (int): RRF constant damping the advantage of the top ranks.
+        limit (int): Number of fused hits to return.
+
+    Returns:
+        list[MilvusHit]: The best fused hits, scored by their fused score, with
+            each retriever's own score in `scores`.
+    """
+    fused: dict[str, float] = {}
+    hits: dict[str, MilvusHit] = {}
+    scores: dict[str, dict[str, float]] = {}
+    for name, ranking in rankings.items():
+        weight = weights.get(name, 1.0)
+        for rank, hit in enumerate(ranking, start=1):
+            key = str(hit.id)
+            fused[key] = fused.get(key, 0.0) + weight / (k + rank)
+            hits.setdefault(key, hit)
+            scores.setdefault(key, {})[name] = hit.score
+
+    best = sorted(fused, key=fused.get, reverse=True)[:limit]
+    return [
+        hits[key].model_copy(update={'score': fused[key], 'scores': scores[key]})
+        for key in best
+    ]
+
+
+def normalize_scores(hits: list[MilvusHit], higher_is_better: bool = True) -> list[float]:
+    """
+    Min-max normalize the scores of one ranking to [0, 1], 1 being the best.
+
+    Args:
+        hits (list[MilvusHit]): Hits of one query in one collection.
+        higher_is_better (bool): False for distances such as L2.
+
+    Returns:
+        list[float]: Normalized score of each hit; 1.0 for all when they tie.
+    """
+    if not hits:
+        return []
+    scores = [hit.score if higher_is_better else -hit.score for hit in hits]
+    low, high = min(scores), max(scores)
+    if high == low:
+        return [1.0] * len(scores)
+    return [(score - low) / (high - low) for score in scores]
+
+
+def merge_collections(
+    rankings: dict[str, list[MilvusHit]],
+    weights: dict[str, float],
+    higher_is_better: dict[str, bool],
+    limit: int,
+) -> list[MilvusHit]:
+    """
+    Merge the hits of one query across collections into a global top-k.
+
+    Args:
+        rankings (dict[str, list[MilvusHit]]): Hits of each collection.
+        weights (dict[str, float]): Weight of each collection, 1.0 when missing.
+        higher_is_better (dict[str, bool]): Score direction of each collection.
+        limit (int): Number of merged hits to return.
+
+    Returns:
+        list[MilvusHit]: The best hits, scored by their weighted normalized score,
+            with their collection set and their own score kept in `scores`.
+    """
+    merged = []
+    for name, ranking in rankings.items():
+        weight = weights.get(name, 1.0)
+        for hit, score in zip(ranking, normalize_scores(ranking, higher_is_better.get(name, True))):
+            merged.append(
+                hit.model_copy(
+                    update={
+                        'score': weight * score,
+                        'scores': {**hit.scores, name: hit.score},
+                        'collection': name,
+                    },
+                ),
+            )
+    merged.sort(key=lambda hit: hit.score, reverse=True)
+    return merged[:limit]
@@ -0,0 +1,742 @@
+from __future__ import annotations
+
+import asyncio
+import heapq
+import json
+import math
+import re
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Any
+from typing import Optional
+
+import numpy as np
+from shared.base import SingletonMeta
+from shared.logging import get_logger
+from shared.settings import LocalIndexSettings
+from shared.settings import MilvusSettings
+
+from .filters import match_filters
+from .milvus_service import MilvusService
+from .models import MilvusFilter
+"""
+Local Vector Index Module
+
+This module provides an in-process alternative to Milvus for development,
+CI and small deployments. Vectors live in a memory-mapped float32 file with
+a JSON-lines sidecar holding each row's id and output fields. Searches are
+exact by default, scoring blocks of rows with one matrix product per batch
+of queries and keeping the best rows with `argpartition`. With `nlist` set,
+rows are grouped into k-means clusters and only the `nprobe` closest
+clusters are scanned. The term frequencies of each row's text are kept in
+another sidecar, from which a BM25 inverted index is built for hybrid
+search.
+"""
+
+logger = get_logger(__name__)
+
+VECTORS_FILE = 'vectors.f32'
+ENTITIES_FILE = 'entities.jsonl'
+META_FILE = 'meta.json'
+IVF_FILE = 'ivf.npz'
+TERMS_FILE = 'terms.jsonl'
+
+TOKEN_PATTERN = re.compile(r'\w+')
+
+
+def tokenize(text: str) -> list[str]:
+    """Lowercased word tokens of a text, keeping names, codes and numbers whole."""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def _top_k(keys: np.ndarray, k: int) -> np.ndarray:
+    """Column indices of the k smallest keys of each row, in ascending order."""
+    k = min(k, keys.shape[1])
+    if k == 0:
+        return np.empty((keys.shape[0], 0), dtype=np.int64)
+    if k < keys.shape[1]:
+        candidates = np.argpartition(keys, k - 1, axis=1)[:, :k]
+    else:
+        candidates = np.broadcast_to(np.arange(keys.shape[1]), keys.shape)
+    order = np.argsort(np.take_along_axis(keys, candidates, axis=1), axis=1, kind='stable')
+    return np.take_along_axis(candidates, order, axis=1)
+
+
+class LocalLexicalIndex:
+    """
+    BM25 inverted index over the texts of a local index's rows.
+
+    Each row has one line of term frequencies in a JSON-lines file, empty for
+    rows added without text; the postings are rebuilt in memory on open.
+
+    Attributes:
+        directory (Path): Directory holding the index files.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.postings: dict[str, list[tuple[int, int]]] = {}
+        self.lengths: list[int] = []
+        self._stored = 0
+
+    def load(self, count: int) -> None:
+        """Read the term frequencies of the first `count` rows."""
+        self.postings, self.lengths, self._stored = {}, [], 0
+        terms_file = self.directory / TERMS_FILE
+        if terms_file.exists():
+            with open(terms_file, encoding='utf-8') as f:
+                for line in f:
+                    if self._stored == count:
+                        break
+                    self._index(json.loads(line))
+                    self._stored += 1
+        # Rows written before texts were indexed have no terms
+        self.lengths.extend([0] * (count - len(self.lengths)))
+
+    def _index(self, frequencies: dict[str, int]) -> None:
+        row = len(self.lengths)
+        for term, frequency in frequencies.items():
+            self.postings.setdefault(term, []).append((row, frequency))
+        self.lengths.append(sum(frequencies.values()))
+
+    def add(self, first_row: int, texts: list[str]) -> None:
+        """Index the texts of rows appended from `first_row` on."""
+        self.lengths.extend([0] * (first_row - len(self.lengths)))
+        frequencies = [{} if not text else dict(Counter(tokenize(text))) for text in texts]
+        with open(self.directory / TERMS_FILE, 'a', encoding='utf-8') as f:
+            f.write('{}\n' * (first_row - self._stored))
+            for row_frequencies in frequencies:
+                f.write(json.dumps(row_frequencies, ensure_ascii=False))
+                f.write('\n')
+        for row_frequencies in frequencies:
+            self._index(row_frequencies)
+        self._stored = first_row + len(texts)
+
+    def search(
+        self,
+        queries: list[str],
+        top_k: int,
+        k1: float,
+        b: float,
+        rows: Optional[set[int]] = None,
+    ) -> list[list[tuple[int, float]]]:
+        """
+        Score rows against each query with BM25.
+
+        Args:
+            queries (list[str]): The query texts.
+            top_k (int): Rows to return per query.
+            k1 (float): Term frequency saturation.
+            b (float): Strength of the document length normalization.
+            rows (Optional[set[int]]): Only score these rows.
+
+        Returns:
+            list[list[tuple[int, float]]]: (row, score) pairs per query, best first;
+                rows sharing no term with the query are left out.
+        """
+        count = len(self.lengths)
+        average = sum(self.lengths) / count if count else 0.0
+        results = []
+        for query in queries:
+            scores: dict[int, float] = {}
+            for term in set(tokenize(query)):
+                postings = self.postings.get(term, [])
+                if not postings:
+                    continue
+                idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                for row, frequency in postings:
+                    if rows is not None and row not in rows:
+                        continue
+                    norm = k1 * (1 - b + b * self.lengths[row] / average)
+                    scores[row] = scores.get(row, 0.0) + idf * frequency * (k1 + 1) / (frequency + norm)
+            results.append(heapq.nlargest(top_k, scores.items(), key=lambda item: item[1]))
+        return results
+
+
+class LocalVectorIndex:
+    """
+    Float32 vectors in a memory-mapped file with an id/metadata sidecar.
+
+    Search keys are ordered so that smaller is better: the negated similarity
+    for COSINE and IP, the squared distance without the query norm for L2.
+    Reported scores follow Milvus: similarity for COSINE and IP, squared
+    distance for L2.
+
+    Attributes:
+        directory (Path): Directory holding the index files.
+        settings (LocalIndexSettings): Metric, IVF and scan settings.
+    """
+
+    def __init__(self, directory: Path, settings: LocalIndexSettings):
+        self.directory = Path(directory)
+        self.settings = settings
+        self.dim: Optional[int] = None
+        self.count = 0
+        self.version = 0
+        self.entities: list[dict[str, Any]] = []
+        self.rows: dict[Any, int] = {}
+
+        self._vectors: Optional[np.ndarray] = None
+        self._sq_norms: Optional[np.ndarray] = None
+        self._ivf: Optional[tuple[np.ndarray, np.ndarray, np.ndarray]] = None
+        self.lexical = LocalLexicalIndex(self.directory)
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        meta_file = self.directory / META_FILE
+        if not meta_file.exists():
+            return
+
+        meta = json.loads(meta_file.read_text())
+        if meta['metric'] != self.settings.metric:
+            raise ValueError(
+                f'Local index at {self.directory} uses {meta["metric"]}, '
+                f'not the configured {self.settings.metric}',
+            )
+        self.dim = meta['dim']
+        self.count = meta['count']
+        self.version = meta.get('version', 0)
+        with open(self.directory / ENTITIES_FILE, encoding='utf-8') as f:
+            self.entities = [json.loads(line) for line in f][: self.count]
+        self.rows = {entity['id']: row for row, entity in enumerate(self.entities)}
+        self.lexical.load(self.count)
+        logger.info(f'Opened local index {self.directory} with {self.count} vectors')
+
+    def stored_version(self) -> int:
+        """Version of the index on disk, which other processes may have written to."""
+        meta_file = self.directory / META_FILE
+        if not meta_file.exists():
+            return 0
+        return json.loads(meta_file.read_text()).get('version', 0)
+
+    def reload(self) -> None:
+        """Re-open the index from disk, picking up rows added by other processes."""
+        with self._lock:
+            self.dim, self.count, self.version = None, 0, 0
+            self.entities, self.rows = [], {}
+            self._vectors = self._sq_norms = self._ivf = None
+            self.lexical = LocalLexicalIndex(self.directory)
+            self._load()
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """The stored vectors, memory-mapped read-only."""
+        if self._vectors is None:
+            if not self.count:
+                return np.empty((0, self.dim or 0), dtype=np.float32)
+            self._vectors = np.memmap(
+                self.directory / VECTORS_FILE,
+                dtype=np.float32,
+                mode='r',
+                shape=(self.count, self.dim),
+            )
+        return self._vectors
+
+    @property
+    def sq_norms(self) -> np.ndarray:
+        """Squared norm of every row, computed block by block on first use."""
+        if self._sq_norms is None:
+            self._sq_norms = np.concatenate(
+                [
+                    np.einsum('ij,ij->i', block, block)
+                    for block in self._blocks(self.vectors)
+                ]
+                or [np.empty(0, dtype=np.float32)],
+            )
+        return self._sq_norms
+
+    def _blocks(self, matrix: np.ndarray):
+        for start in range(0, len(matrix), self.settings.block_rows):
+            yield np.asarray(matrix[start:start + self.settings.block_rows])
+
+    def _normalize(self, vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.maximum(norms, np.finfo(np.float32).tiny)
+
+    def _prepare(self, vectors: Any) -> np.ndarray:
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim == 1:
+            vectors = vectors[None, :]
+        if self.dim is not None and vectors.shape[1] != self.dim:
+            raise ValueError(f'Expected vectors of dimension {self.dim}, got {vectors.shape[1]}')
+        if self.settings.metric == 'COSINE':
+            vectors = self._normalize(vectors)
+        return np.ascontiguousarray(vectors, dtype=np.float32)
+
+    def _keys(
+        self,
+        queries: np.ndarray,
+        matrix: np.ndarray,
+        sq_norms: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        products = queries @ matrix.T
+        if self.settings.metric == 'L2':
+            if sq_norms is None:
+                sq_norms = np.einsum('ij,ij->i', matrix, matrix)
+            return sq_norms[None, :] - 2 * products
+        return -products
+
+    def _score(self, queries: np.ndarray, keys: np.ndarray) -> np.ndarray:
+        if self.settings.metric == 'L2':
+            return keys + np.einsum('ij,ij->i', queries, queries)[:, None]
+        return -keys
+
+    def add(self, vectors: Any, entities: list[dict[str, Any]], texts: Optional[list[str]] = None) -> None:
+        """
+        Append vectors and their entities to the index.
+
+        Args:
+            vectors (Any): A (n, dim) array-like of vectors.
+            entities (list[dict[str, Any]]): One entity per vector with its output
+                fields; rows without an "id" get their row number.
+            texts (Optional[list[str]]): Text of each row for the BM25 index.
+
+        Raises:
+            ValueError: If counts or dimensions do not match.
+        """
+        vectors = self._prepare(vectors)
+        if len(vectors) != len(entities):
+            raise ValueError(f'Got {len(vectors)} vectors for {len(entities)} entities')
+        if not len(vectors):
+            return
+
+        with self._lock:
+            self.dim = self.dim or int(vectors.shape[1])
+            self.directory.mkdir(parents=True, exist_ok=True)
+            entities = [
+                {'id': self.count + offset, **entity} for offset, entity in enumerate(entities)
+            ]
+            with open(self.directory / VECTORS_FILE, 'ab') as f:
+                f.write(vectors.tobytes())
+            with open(self.directory / ENTITIES_FILE, 'a', encoding='utf-8') as f:
+                for entity in entities:
+                    f.write(json.dumps(entity, ensure_ascii=False, default=str))
+                    f.write('\n')
+
+            self.lexical.add(self.count, texts or [''] * len(entities))
+            self.entities.extend(entities)
+            self.rows.update({entity['id']: self.count + offset for offset, entity in enumerate(entities)})
+            self.count += len(vectors)
+            self.version += 1
+            (self.directory / META_FILE).write_text(
+                json.dumps(
+                    {
+                        'dim': self.dim,
+                        'count': self.count,
+                        'metric': self.settings.metric,
+                        'version': self.version,
+                    },
+                ),
+            )
+            self._vectors = None
+            self._sq_norms = None
+            self._ivf = None
+
+    def _cluster_sums(self, vectors: np.ndarray, assignments: np.ndarray, nlist: int) -> np.ndarray:
+        # One-hot matrix products, in chunks keeping the one-hot matrix around 64 MB
+        sums = np.zeros((nlist, vectors.shape[1]), dtype=np.float32)
+        chunk = max(1, 2**24 // nlist)
+        for start in range(0, len(vectors), chunk):
+            labels = assignments[start:start + chunk]
+            one_hot = np.zeros((len(labels), nlist), dtype=np.float32)
+            one_hot[np.arange(len(labels)), labels] = 1.0
+            sums += one_hot.T @ vectors[start:start + chunk]
+        return sums
+
+    def build_ivf(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Cluster the rows with k-means and store the inverted lists.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: Centroids, row ids sorted by
+                cluster and the offset of each cluster in that order.
+        """
+        rng = np.random.default_rng(0)
+        nlist = min(self.settings.nlist, self.count)
+        sample = np.sort(rng.choice(self.count, min(self.settings.train_size, self.count), replace=False))
+        train = np.asarray(self.vectors[sample])
+        centroids = train[rng.choice(len(train), nlist, replace=False)].copy()
+
+        for _ in range(self.settings.kmeans_iterations):
+            assignments = self._keys(train, centroids).argmin(axis=1)
+            counts = np.bincount(assignments, minlength=nlist)
+            filled = counts > 0
+            centroids[filled] = self._cluster_sums(train, assignments, nlist)[filled] / counts[filled, None]
+            if self.settings.metric == 'COSINE':
+                centroids = self._normalize(centroids)
+
+        assignments = np.concatenate(
+            [self._keys(block, centroids).argmin(axis=1) for block in self._blocks(self.vectors)],
+        )
+        order = np.argsort(assignments, kind='stable')
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(assignments, minlength=nlist))])
+
+        np.savez(
+            self.directory / IVF_FILE,
+            centroids=centroids,
+            order=order,
+            offsets=offsets,
+            count=self.count,
+        )
+        logger.info(f'Built {nlist} IVF lists over {self.count} vectors in {self.directory}')
+        self._ivf = (centroids, order, offsets)
+        return self._ivf
+
+    def stored_ivf(self) -> Optional[tuple[np.ndarray, np.ndarray, np.ndarray]]:
+        """The IVF lists on disk, None when missing or built for other rows or settings."""
+        ivf_file = self.directory / IVF_FILE
+        if not ivf_file.exists():
+            return None
+        with np.load(ivf_file) as stored:
+            if int(stored['count']) != self.count or len(stored['centroids']) != min(
+                self.settings.nlist,
+                self.count,
+            ):
+                return None
+            return stored['centroids'], stored['order'], stored['offsets']
+
+    @property
+    def ivf(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """The IVF lists, loaded from disk or rebuilt when the index has grown."""
+        if self._ivf is None:
+            self._ivf = self.stored_ivf() or self.build_ivf()
+        return self._ivf
+
+    def search(self, queries: Any, top_k: int, rows: Optional[np.ndarray] = None) -> list[list[tuple[int, float]]]:
+        """
+        Find the closest rows of each query.
+
+        Args:
+            queries (Any): A (b, dim) array-like of query vectors.
+            top_k (int): Rows to return per query.
+            rows (Optional[np.ndarray]): Only search these rows, exhaustively.
+
+        Returns:
+            list[list[tuple[int, float]]]: (row, score) pairs per query, best first.
+        """
+        queries = self._prepare(queries)
+        if not self.count or (rows is not None and not len(rows)):
+            return [[] for _ in queries]
+        if rows is not None:
+            return self._search_exact(queries, top_k, np.asarray(rows, dtype=np.int64))
+        if self.settings.nlist > 0 and self.count > self.settings.nlist:
+            return self._search_ivf(queries, top_k)
+        return self._search_exact(queries, top_k)
+
+    def _search_exact(
+        self,
+        queries: np.ndarray,
+        top_k: int,
+        subset: Optional[np.ndarray] = None,
+    ) -> list[list[tuple[int, float]]]:
+        best_rows = np.empty((len(queries), 0), dtype=np.int64)
+        best_keys = np.empty((len(queries), 0), dtype=np.float32)
+        sq_norms = self.sq_norms if self.settings.metric == 'L2' else None
+        size = self.count if subset is None else len(subset)
+
+        for start in range(0, size, self.settings.block_rows):
+            if subset is None:
+                block_rows = np.arange(start, min(start + self.settings.block_rows, size))
+                block = np.asarray(self.vectors[start:start + self.settings.block_rows])
+            else:
+                block_rows = subset[start:start + self.settings.block_rows]
+                block = np.asarray(self.vectors[block_rows])
+            block_norms = sq_norms[block_rows] if sq_norms is not None else None
+            keys = self._keys(queries, block, block_norms)
+            selected = _top_k(keys, top_k)
+            keys = np.concatenate([best_keys, np.take_along_axis(keys, selected, axis=1)], axis=1)
+            rows = np.concatenate([best_rows, block_rows[selected]], axis=1)
+            selected = _top_k(keys, top_k)
+            best_keys = np.take_along_axis(keys, selected, axis=1)
+            best_rows = np.take_along_axis(rows, selected, axis=1)
+
+        scores = self._score(queries, best_keys)
+        return [
+            [(int(row), float(score)) for row, score in zip(rows, query_scores)]
+            for rows, query_scores in zip(best_rows, scores)
+        ]
+
+    def _search_ivf(self, queries: np.ndarray, top_k: int) -> list[list[tuple[int, float]]]:
+        centroids, order, offsets = self.ivf
+        probes = _top_k(self._keys(queries, centroids), self.settings.nprobe)
+        sq_norms = self.sq_norms if self.settings.metric == 'L2' else None
+
+        results = []
+        for query, clusters in zip(queries, probes):
+            rows = np.sort(
+                np.concatenate([order[offsets[cluster]:offsets[cluster + 1]] for cluster in clusters]),
+            )
+            matrix = np.asarray(self.vectors[rows])
+            keys = self._keys(query[None, :], matrix, sq_norms[rows] if sq_norms is not None else None)
+            selected = _top_k(keys, top_k)[0]
+            scores = self._score(query[None, :], keys[:, selected])[0]
+            results.append([(int(rows[index]), float(score)) for index, score in zip(selected, scores)])
+        return results
+
+
+class LocalIndexRegistry(metaclass=SingletonMeta):
+    """Process-wide cache of opened local indexes, one per collection directory."""
+
+    def __init__(self):
+        self._indexes: dict[Path, LocalVectorIndex] = {}
+        self._lock = threading.Lock()
+
+    def get(self, settings: MilvusSettings) -> LocalVectorIndex:
+        """
+        Open the index of a collection, or reuse it if already open.
+
+        Args:
+            settings (MilvusSettings): Collection name and local index settings.
+
+        Returns:
+            LocalVectorIndex: The shared index.
+        """
+        directory = Path(settings.local.path) / settings.collection_name
+        with self._lock:
+            if directory not in self._indexes:
+                self._indexes[directory] = LocalVectorIndex(directory, settings.local)
+            return self._indexes[directory]
+
+
+class LocalIndexService(MilvusService):
+    """
+    MilvusService backed by the local memory-mapped index.
+
+    Embedding, hit conversion and output formatting are shared with
+    MilvusService; only the search itself runs in-process, in a worker
+    thread since numpy releases the GIL during the matrix products. The
+    Milvus `search_params` are ignored; `settings.local` controls the scan.
+    """
+
+    @property
+    def index(self) -> LocalVectorIndex:
+        return LocalIndexRegistry().get(self.settings)
+
+    @property
+    def dense_higher_is_better(self) -> bool:
+        return self.settings.local.metric != 'L2'
+
+    async def execute_query(
+        self,
+        vectors: list[np.ndarray],
+        params: dict[str, Any] | None,
+        output_format: list[str],
+        limit: Optional[int] = None,
+        filters: Optional[list[MilvusFilter]] = None,
+    ) -> list[list[dict[str, Any]]]:
+        """
+        Search the local index with a batch of vectors.
+
+        Args:
+            vectors (list[np.ndarray]): The query vectors to search for.
+            params (dict[str, Any] | None): Unused, kept for interface compatibility.
+            output_format (list[str]): Fields to include in the search results.
+            limit (Optional[int]): Hits per vector, `top_k` by default.
+            filters (Optional[list[MilvusFilter]]): Conditions every hit must meet;
+                the matching rows are then searched exhaustively.
+
+        Returns:
+            list[list[dict[str, Any]]]: Milvus-shaped hits of each vector, in input order.
+        """
+        if not len(vectors):
+            return []
+
+        index = self.index
+        top_k = limit or self.settings.top_k
+
+        def search() -> list[list[tuple[int, float]]]:
+            # Filtering scans every entity, so it runs off the event loop too
+            rows = self._filtered_rows(index, filters)
+            return index.search(
+                np.asarray(vectors),
+                top_k,
+                None if rows is None else np.asarray(rows, dtype=np.int64),
+            )
+
+        results = await asyncio.to_thread(search)
+        return self._raw_hits(index, results, output_format)
+
+    async def execute_sparse_query(
+        self,
+        queries: list[str],
+        output_format: list[str],
+        limit: Optional[int] = None,
+        filters: Optional[list[MilvusFilter]] = None,
+    ) -> list[list[dict[str, Any]]]:
+        """
+        Search the local BM25 index with a batch of query texts.
+
+        Args:
+            queries (list[str]): The query texts to search for.
+            output_format (list[str]): Fields to include in the search results.
+            limit (Optional[int]): Hits per query, `top_k` by default.
+            filters (Optional[list[MilvusFilter]]): Conditions every hit must meet.
+
+        Returns:
+            list[list[dict[str, Any]]]: Milvus-shaped hits of each query, in input order.
+        """
+        if not queries:
+            return []
+
+        index = self.index
+        top_k = limit or self.settings.top_k
+        hybrid = self.settings.hybrid
+
+        def search() -> list[list[tuple[int, float]]]:
+            rows = self._filtered_rows(index, filters)
+            return index.lexical.search(
+                list(queries),
+                top_k,
+                hybrid.bm25_k1,
+                hybrid.bm25_b,
+                None if rows is None else set(rows),
+            )
+
+        results = await asyncio.to_thread(search)
+        return self._raw_hits(index, results, output_format)
+
+    async def get_entities(self, ids: list[Any]) -> dict[Any, dict[str, Any]]:
+        """
+        Look up the output fields of entities by id.
+
+        Args:
+            ids (list[Any]): Entity ids.
+
+        Returns:
+            dict[Any, dict[str, Any]]: Output fields of each id found.
+        """
+        index = self.index
+        return {
+            key: {field: index.entities[index.rows[key]].get(field) for field in self.settings.output_field}
+            for key in ids
+            if key in index.rows
+        }
+
+    @staticmethod
+    def _filtered_rows(index: LocalVectorIndex, filters: Optional[list[MilvusFilter]]) -> Optional[list[int]]:
+        """Rows meeting the filters, None without filters."""
+        if not filters:
+            return None
+        return [row for row, entity in enumerate(index.entities) if match_filters(entity, filters)]
+
+    @staticmethod
+    def _raw_hits(
+        index: LocalVectorIndex,
+        results: list[list[tuple[int, float]]],
+        output_format: list[str],
+    ) -> list[list[dict[str, Any]]]:
+        return [
+            [
+                {
+                    'id': index.entities[row]['id'],
+                    'distance': score,
+                    'entity': {field: index.entities[row].get(field) for field in output_format},
+                }
+                for row, score in query_results
+            ]
+            for query_results in results
+        ]
+
+    def _read_version(self) -> int:
+        index = self.index
+        if index.stored_version() != index.version:
+            index.reload()
+        return index.version
+
+    def _bump_version(self) -> int:
+        # Every add already bumps the version stored with the index
+        return self.index.version
+
+    async def ensure_collection(self, dim: int) -> None:
+        """The local index takes its dimension from the first vectors added."""
+
+    async def build_index(self, rebuild: bool = False) -> bool:
+        """
+        Cluster the rows into IVF lists when `local.nlist` is set.
+
+        Args:
+            rebuild (bool): Rebuild lists that are still current.
+
+        Returns:
+            bool: Whether the lists were built.
+        """
+        index = self.index
+        if self.settings.local.nlist <= 0 or not index.count:
+            return False
+        if not rebuild and index.stored_ivf() is not None:
+            return False
+        await asyncio.to_thread(index.build_ivf)
+        return True
+
+    async def describe_index(self) -> dict[str, Any]:
+        """
+        Describe the local index.
+
+        Returns:
+            dict[str, Any]: Index type, metric, IVF parameters, row count, dimension
+                and vector precision, always float32 locally.
+        """
+        index = self.index
+        local = self.settings.local
+        ivf = local.nlist > 0 and index.count > local.nlist
+        return {
+            'index_type': 'IVF_FLAT' if ivf else 'FLAT',
+            'metric_type': local.metric,
+            'nlist': local.nlist if ivf else None,
+            'nprobe': local.nprobe if ivf else None,
+            'rows': index.count,
+            'dim': index.dim,
+            'dtype': 'float32',
+        }
+
+    async def existing_ids(self, ids: list[str]) -> set[str]:
+        """
+        Find which ids are already stored in the local index.
+
+        Args:
+            ids (list[str]): Candidate ids.
+
+        Returns:
+            set[str]: The ids present in the index.
+        """
+        rows = self.index.rows
+        return {key for key in ids if key in rows}
+
+    async def upsert(self, vectors: Any, entities: list[dict[str, Any]]) -> int:
+        """
+        Add vectors and their entities to the local index.
+
+        The index is append-only, so entities whose id is already stored are
+        skipped; with content-hash ids their vectors are identical anyway.
+
+        Args:
+            vectors (Any): A (n, dim) array-like of vectors.
+            entities (list[dict[str, Any]]): Entities holding the id, content and
+                any other fields.
+
+        Returns:
+            int: Number of entities written.
+        """
+        index = self.index
+        id_field = self.settings.id_field
+        keep = [
+            position
+            for position, entity in enumerate(entities)
+            if entity.get(id_field) is None or entity[id_field] not in index.rows
+        ]
+        if not keep:
+            return 0
+
+        vectors = np.asarray(vectors, dtype=np.float32)[keep]
+        rows = []
+        for position in keep:
+            entity = dict(entities[position])
+            if entity.get(id_field) is not None:
+                entity['id'] = entity.pop(id_field)
+            rows.append(entity)
+        texts = [str(row.get(self.settings.content_field) or '') for row in rows]
+        await asyncio.to_thread(index.add, vectors, rows, texts)
+        await self.bump_version()
+        return len(rows)
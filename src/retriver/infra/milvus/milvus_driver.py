@@ -1,58 +1,139 @@
 from __future__ import annotations
 
-import threading
+from typing import Any
+from typing import Optional
 
-from pymilvus import MilvusClient
+from shared.base import SingletonMeta
 from shared.settings import MilvusSettings
 
+from .pool import MilvusConnectionPool
 
-class SingletonMeta(type):
-    _instance: dict = {}
-    _lock: threading.Lock = threading.Lock()
+try:
+    from pymilvus import DataType
+    from pymilvus import Function
+    from pymilvus import FunctionType
+    from pymilvus import MilvusClient
+except ImportError:  # pragma: no cover - only the local index backend is usable
+    DataType = None
+    Function = None
+    FunctionType = None
+    MilvusClient = None
 
-    def __call__(cls, *args, **kwargs):
-        with cls._lock:
-            if cls not in cls._instance:
-                instance = super().__call__(*args, **kwargs)
-                cls._instance[cls] = instance
-        return cls._instance
+try:
+    from pymilvus import AsyncMilvusClient
+except ImportError:  # pragma: no cover - older pymilvus, searches run in a worker thread
+    AsyncMilvusClient = None
 
-    def clear(cls):
-        with cls._lock:
-            _ = cls._instance.pop(cls, None)
+try:
+    from grpc import RpcError
+    from pymilvus.exceptions import ConnectError
+    from pymilvus.exceptions import ConnectionNotExistException
+    from pymilvus.exceptions import MilvusUnavailableException
+
+    CONNECTION_ERRORS: tuple = (
+        ConnectionError,
+        OSError,
+        RpcError,
+        ConnectError,
+        ConnectionNotExistException,
+        MilvusUnavailableException,
+    )
+except ImportError:  # pragma: no cover - only the local index backend is usable
+    CONNECTION_ERRORS = (ConnectionError, OSError)
+
+
+def is_connection_error(error: BaseException) -> bool:
+    """Whether an error, or the gRPC error pymilvus wrapped it from, means the channel is broken."""
+    return isinstance(error, CONNECTION_ERRORS) or isinstance(error.__cause__, CONNECTION_ERRORS)
 
 
 class MilvusDriver(metaclass=SingletonMeta):
-    _driver: MilvusClient
+    """
+    Process-wide Milvus clients.
+
+    The synchronous client, used for administration, connects on first use
+    so an unreachable Milvus does not fail startup. Searches and writes go through a pool of asyncio clients, which open
+    their gRPC channels on the running event loop: the FastAPI lifespan opens
+    the pool on startup, and tools open it on first use.
+    """
+
+    _driver: Optional[MilvusClient]
+    _pool: Optional[MilvusConnectionPool]
 
     def __init__(self, settings: MilvusSettings):
-        try:
-            self._driver = MilvusClient(
-                uri=self._build_uri(settings.host, settings.port),
-                user=settings.user,
-                password=settings.password,
-                db_name=settings.db_name,
-            )
-        except Exception:
-            raise
+        if MilvusClient is None:
+            raise ImportError('pymilvus is required for the "milvus" backend')
+        self.settings = settings
+        self._pool = None
+        self._driver = None
 
     def _build_uri(self, host: str, port: int) -> str:
         return f'http://{host}:{port}'
 
+    def _connection_args(self, settings: MilvusSettings) -> dict:
+        return {
+            'uri': self._build_uri(settings.host, settings.port),
+            'user': settings.user,
+            'password': settings.password,
+            'db_name': settings.db_name,
+        }
+
     @property
     def driver(self) -> MilvusClient:
-        try:
-            return self._driver
-        except Exception:
-            raise
+        if self._driver is None:
+            self._driver = MilvusClient(**self._connection_args(self.settings))
+        return self._driver
+
+    def _connect_async(self) -> AsyncMilvusClient:
+        return AsyncMilvusClient(**self._connection_args(self.settings))
+
+    async def _probe(self, client: AsyncMilvusClient) -> Any:
+        # A primary key lookup matching nothing: one round trip, no data
+        return await client.query(
+            collection_name=self.settings.collection_name,
+            filter=f'{self.settings.id_field} in []',
+            output_fields=[self.settings.id_field],
+        )
+
+    async def _disconnect(self, client: AsyncMilvusClient) -> None:
+        await client.close()
+
+    @property
+    def pool(self) -> Optional[MilvusConnectionPool]:
+        """The pool of asyncio clients, None when the installed pymilvus has none."""
+        if self._pool is None and AsyncMilvusClient is not None:
+            self._pool = MilvusConnectionPool(
+                self.settings.pool,
+                connect=self._connect_async,
+                probe=self._probe,
+                disconnect=self._disconnect,
+                is_connection_error=is_connection_error,
+            )
+        return self._pool
+
+    async def open(self):
+        """Connect the pool of asyncio clients and start its health checks."""
+        if self.pool is not None:
+            await self.pool.open()
+
+    async def aclose(self):
+        """Close the pool of asyncio clients, then the synchronous client."""
+        if self._pool is not None:
+            await self._pool.close()
+            self._pool = None
+        self.close()
+
+    def stats(self) -> dict[str, Any]:
+        """Connection state of the pool for metrics."""
+        if self._pool is None:
+            return {'healthy': 0, 'size': 0, 'clients': []}
+        return self._pool.stats()
 
     def close(self):
         try:
-            self._driver.close()
+            if self._driver is not None:
+                self._driver.close()
         except AttributeError:
             pass
         finally:
             self.__class__.clear()
-
-    def __del__(self):
-        self.close()
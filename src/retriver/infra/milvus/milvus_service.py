@@ -1,14 +1,33 @@
 from __future__ import annotations
 
+import asyncio
+import json
+import time
 from typing import Any
+from typing import Optional
 
 import numpy as np
 from infra.embed import EmbedInput
 from infra.embed import EmbedService
 from shared.base import AsyncBaseService
+from shared.logging import get_logger
 from shared.settings import MilvusSettings
 
+from .cache import search_signature
+from .cache import SearchCache
+from .cache import SearchCacheRegistry
+from .cache import text_key
+from .cache import vector_key
+from .filters import compile_filters
+from .fusion import merge_collections
+from .fusion import reciprocal_rank_fusion
+from .milvus_driver import DataType
+from .milvus_driver import Function
+from .milvus_driver import FunctionType
+from .milvus_driver import MilvusClient
 from .milvus_driver import MilvusDriver
+from .models import MilvusFilter
+from .models import MilvusHit
 from .models import MilvusInput
 from .models import MilvusOutput
 """
@@ -16,8 +35,23 @@ Milvus Service Module
 
 This module provides functionality to interact with a Milvus vector database,
 handling query embedding, vector similarity search, and result processing.
+Search results are cached per query and invalidated through a version
+counter stored as a collection property and bumped on every write. With
+hybrid search enabled, a BM25 search over the content field runs alongside
+the dense one and both rankings are merged with reciprocal-rank fusion.
+Structured filters are compiled into a boolean expression evaluated by
+Milvus before the search. In two-phase mode candidates are first fetched
+with a short preview only, and the full text of the hits kept after
+reranking is loaded with one batched get. Vectors are stored and sent as
+float32 or, with `vector_dtype` set to float16, as half-precision bytes.
+Federated search queries several collections concurrently, each under its
+own timeout, and merges their min-max normalized hits into a global top-k.
 """
 
+logger = get_logger(__name__)
+
+VERSION_PROPERTY = 'agentic_rag.version'
+
 
 class MilvusService(AsyncBaseService):
     """
@@ -36,75 +70,675 @@ class MilvusService(AsyncBaseService):
     embed_service: EmbedService
 
     @property
-    def _driver(self):
+    def _driver(self) -> MilvusDriver:
         """
         Get the Milvus driver instance.
 
         Returns:
             MilvusDriver: The configured Milvus driver for database operations.
         """
-        return MilvusDriver(self.settings).driver
+        return MilvusDriver(self.settings)
 
-    def execute_query(
+    async def execute_query(
         self,
-        vector: np.ndarray,
+        vectors: list[np.ndarray],
         params: dict[str, Any] | None,
         output_format: list[str],
-    ):
+        limit: Optional[int] = None,
+        filters: Optional[list[MilvusFilter]] = None,
+    ) -> list[list[dict[str, Any]]]:
         """
-        Execute a vector similarity search query in Milvus.
+        Execute a batched vector similarity search in Milvus.
+
+        All vectors are sent in a single search request through the asyncio
+        client. With a pymilvus lacking one, the synchronous client runs in a
+        worker thread so the event loop is never blocked.
 
         Args:
-            vector (np.ndarray): The query vector to search for.
+            vectors (list[np.ndarray]): The query vectors to search for.
             params (dict[str, Any] | None): Search parameters for the Milvus query.
             output_format (list[str]): Fields to include in the search results.
+            limit (Optional[int]): Hits per vector, `top_k` by default.
+            filters (Optional[list[MilvusFilter]]): Conditions every hit must meet.
 
         Returns:
-            list: The search results from Milvus, containing the most similar vectors.
+            list[list[dict[str, Any]]]: The hits of each vector, in input order.
         """
-        result = self._driver.search(
+        if not vectors:
+            return []
+
+        result = await self._call(
+            'search',
             collection_name=self.settings.collection_name,
             anns_field=self.settings.anns_field,
-            data=[vector],
-            limit=self.settings.top_k,
+            data=[self._encode_vector(vector) for vector in vectors],
+            filter=compile_filters(filters or []),
+            limit=limit or self.settings.top_k,
             search_params=params,
             output_fields=output_format,
         )
-        return result[0]
+        return [list(hits) for hits in result]
 
-    async def process(self, inputs: MilvusInput) -> MilvusOutput:
+    async def execute_sparse_query(
+        self,
+        queries: list[str],
+        output_format: list[str],
+        limit: Optional[int] = None,
+        filters: Optional[list[MilvusFilter]] = None,
+    ) -> list[list[dict[str, Any]]]:
         """
-        Process a text query through vector similarity search.
+        Execute a batched BM25 full-text search in Milvus.
 
-        This method handles the complete workflow of:
-        1. Converting the query text to a vector embedding
-        2. Searching for similar vectors in the database
-        3. Extracting and formatting the relevant results
+        Milvus tokenizes the query texts with the content field's analyzer and
+        scores them against the sparse vectors its BM25 function stored at
+        insert time.
 
         Args:
-            inputs (MilvusInput): The input containing query text to search for.
+            queries (list[str]): The query texts to search for.
+            output_format (list[str]): Fields to include in the search results.
+            limit (Optional[int]): Hits per query, `top_k` by default.
+            filters (Optional[list[MilvusFilter]]): Conditions every hit must meet.
 
         Returns:
-            MilvusOutput: The results of the vector similarity search.
+            list[list[dict[str, Any]]]: The hits of each query, in input order.
+        """
+        if not queries:
+            return []
 
-        Raises:
-            Exception: If there's an error during embedding or search operations.
+        result = await self._call(
+            'search',
+            collection_name=self.settings.collection_name,
+            anns_field=self.settings.hybrid.sparse_field,
+            data=list(queries),
+            filter=compile_filters(filters or []),
+            limit=limit or self.settings.top_k,
+            search_params={'metric_type': 'BM25'},
+            output_fields=output_format,
+        )
+        return [list(hits) for hits in result]
+
+    async def _call(self, method: str, **kwargs) -> Any:
+        """Call a client method through the pool of asyncio clients, or the synchronous one in a thread."""
+        driver = self._driver
+        pool = driver.pool
+        if pool is not None:
+            if not pool.opened:
+                await pool.open()
+            return await pool.call(method, **kwargs)
+        return await asyncio.to_thread(getattr(driver.driver, method), **kwargs)
+
+    def _encode_vector(self, vector: Any) -> Any:
+        """A vector in the form the vector field takes: float16 arrays go as raw bytes, float32 as a list."""
+        if self.settings.vector_dtype == 'float16':
+            return np.asarray(vector, dtype=np.float16)
+        return np.asarray(vector, dtype=np.float32).tolist()
+
+    def _create_collection(self, dim: int) -> None:
+        client = self._driver.driver
+        if client.has_collection(self.settings.collection_name):
+            return
+
+        schema = MilvusClient.create_schema(auto_id=False, enable_dynamic_field=True)
+        schema.add_field(self.settings.id_field, DataType.VARCHAR, is_primary=True, max_length=64)
+        vector_type = DataType.FLOAT16_VECTOR if self.settings.vector_dtype == 'float16' else DataType.FLOAT_VECTOR
+        schema.add_field(self.settings.anns_field, vector_type, dim=dim)
+        hybrid = self.settings.hybrid.enabled
+        schema.add_field(
+            self.settings.content_field,
+            DataType.VARCHAR,
+            max_length=65535,
+            enable_analyzer=hybrid,
+        )
+        if self.settings.partition_key_field:
+            schema.add_field(
+                self.settings.partition_key_field,
+                DataType.VARCHAR,
+                max_length=256,
+                is_partition_key=True,
+            )
+        index_params = self._vector_index_params(client)
+
+        if hybrid:
+            schema.add_field(self.settings.hybrid.sparse_field, DataType.SPARSE_FLOAT_VECTOR)
+            schema.add_function(
+                Function(
+                    name=f'{self.settings.content_field}_bm25',
+                    function_type=FunctionType.BM25,
+                    input_field_names=[self.settings.content_field],
+                    output_field_names=[self.settings.hybrid.sparse_field],
+                ),
+            )
+            index_params.add_index(
+                field_name=self.settings.hybrid.sparse_field,
+                index_type='SPARSE_INVERTED_INDEX',
+                metric_type='BM25',
+            )
+        options = {'num_partitions': self.settings.num_partitions} if self.settings.partition_key_field else {}
+        client.create_collection(
+            self.settings.collection_name,
+            schema=schema,
+            index_params=index_params,
+            **options,
+        )
+
+    def _vector_index_params(self, client: MilvusClient) -> Any:
+        index_params = client.prepare_index_params()
+        index_params.add_index(
+            field_name=self.settings.anns_field,
+            index_type=self.settings.index.index_type,
+            metric_type=self.settings.metric_type,
+            params=self.settings.index.build_params,
+        )
+        return index_params
+
+    def _build_index(self, rebuild: bool) -> bool:
+        client = self._driver.driver
+        name = self.settings.collection_name
+        existing = client.list_indexes(name, field_name=self.settings.anns_field)
+        if existing and not rebuild:
+            return False
+
+        client.release_collection(name)
+        for index_name in existing:
+            client.drop_index(name, index_name)
+        # Blocks until the index is built over every row
+        client.create_index(name, self._vector_index_params(client))
+        client.load_collection(name)
+        return True
+
+    async def build_index(self, rebuild: bool = False) -> bool:
+        """
+        Build the vector field's index as defined by `settings.index`.
+
+        Rebuilding releases the collection, so it cannot be searched until the
+        new index is built and loaded again.
+
+        Args:
+            rebuild (bool): Drop and rebuild an existing index.
+
+        Returns:
+            bool: Whether an index was built.
+        """
+        built = await asyncio.to_thread(self._build_index, rebuild)
+        if built:
+            logger.info(
+                f'Built {self.settings.index.index_type} index on {self.collection_id} '
+                f'with {self.settings.index.build_params}',
+            )
+            await self.bump_version()
+        return built
+
+    def _describe_index(self) -> dict[str, Any]:
+        client = self._driver.driver
+        name = self.settings.collection_name
+        fields = client.describe_collection(name).get('fields', [])
+        vector_field = next((field for field in fields if field['name'] == self.settings.anns_field), {})
+        dim = vector_field.get('params', {}).get('dim')
+        dtype = 'float16' if vector_field.get('type') == DataType.FLOAT16_VECTOR else 'float32'
+        rows = int(client.get_collection_stats(name).get('row_count', 0))
+        indexes = client.list_indexes(name, field_name=self.settings.anns_field)
+        info = client.describe_index(name, indexes[0]) if indexes else {}
+        return {**info, 'rows': rows, 'dim': int(dim) if dim is not None else None, 'dtype': dtype}
+
+    async def describe_index(self) -> dict[str, Any]:
+        """
+        Describe the vector field's index.
+
+        Returns:
+            dict[str, Any]: Index type, metric and build parameters as reported by
+                Milvus, with the collection's row count, vector dimension and precision.
+        """
+        return await asyncio.to_thread(self._describe_index)
+
+    async def ensure_collection(self, dim: int) -> None:
+        """
+        Create the collection if it does not exist yet.
+
+        The primary key is a VARCHAR id (ingestion uses content hashes), next to
+        the vector and content fields, and the vector field is indexed as
+        defined by `settings.index`; other entity fields are stored as
+        dynamic fields. With `partition_key_field` set, that field hashes
+        entities into `num_partitions` partitions and searches filtering on it
+        only scan the matching partition. With hybrid search enabled, a BM25
+        function derives the sparse lexical vector of the content on insert.
+
+        Args:
+            dim (int): Dimension of the vectors.
+        """
+        await asyncio.to_thread(self._create_collection, dim)
+
+    async def existing_ids(self, ids: list[str]) -> set[str]:
+        """
+        Find which ids are already stored in the collection.
+
+        Milvus rejects queries on a missing collection, so before the first
+        ingestion into it nothing is reported as stored.
+
+        Args:
+            ids (list[str]): Candidate primary keys.
+
+        Returns:
+            set[str]: The ids present in the collection.
+        """
+        if not ids:
+            return set()
+        client = self._driver.driver
+        if not await asyncio.to_thread(client.has_collection, self.settings.collection_name):
+            return set()
+        rows = await self._call(
+            'query',
+            collection_name=self.settings.collection_name,
+            filter=f'{self.settings.id_field} in {json.dumps(ids, ensure_ascii=False)}',
+            output_fields=[self.settings.id_field],
+        )
+        return {row[self.settings.id_field] for row in rows}
+
+    async def upsert(self, vectors: Any, entities: list[dict[str, Any]]) -> int:
+        """
+        Insert or replace entities in one bulk request and bump the collection version.
+
+        Args:
+            vectors (Any): One vector per entity.
+            entities (list[dict[str, Any]]): Entities holding the id, content and
+                any other fields.
+
+        Returns:
+            int: Number of entities written.
+        """
+        rows = [
+            {**entity, self.settings.anns_field: self._encode_vector(vector)}
+            for vector, entity in zip(vectors, entities)
+        ]
+        if not rows:
+            return 0
+        await self._call('upsert', collection_name=self.settings.collection_name, data=rows)
+        await self.bump_version()
+        return len(rows)
+
+    @property
+    def collection_id(self) -> str:
+        """Identifier of the collection across backends and databases."""
+        return f'{self.settings.backend}:{self.settings.db_name}/{self.settings.collection_name}'
+
+    @property
+    def search_signature(self) -> str:
+        """Everything besides the query that shapes a search result."""
+        return search_signature(
+            collection=self.collection_id,
+            anns_field=self.settings.anns_field,
+            index=self.settings.index.model_dump(),
+            params=self.settings.search_params,
+            top_k=self.settings.top_k,
+            output_fields=self.settings.output_field,
+            hybrid=self.settings.hybrid.model_dump() if self.settings.hybrid.enabled else None,
+        )
+
+    @property
+    def cache(self) -> Optional[SearchCache]:
+        """The collection's search cache, None when caching is disabled."""
+        if not self.settings.cache.enabled:
+            return None
+        return SearchCacheRegistry().get(self.collection_id, self.settings.cache)
+
+    def _read_version(self) -> int:
+        info = self._driver.driver.describe_collection(self.settings.collection_name)
+        return int(info.get('properties', {}).get(VERSION_PROPERTY, 0))
+
+    def _bump_version(self) -> int:
+        # A fresh token instead of read-then-increment, so concurrent writers
+        # never store the same version; versions are only compared for equality
+        version = time.time_ns()
+        self._driver.driver.alter_collection_properties(
+            self.settings.collection_name,
+            properties={VERSION_PROPERTY: str(version)},
+        )
+        return version
+
+    async def refresh_version(self, cache: SearchCache) -> None:
+        """
+        Read the collection version if the last read is old enough.
+
+        The version lives with the collection, so writes from other processes,
+        such as the ingestion tool, invalidate this process's cache too.
+
+        Args:
+            cache (SearchCache): The collection's cache.
         """
+        now = time.monotonic()
+        if not cache.version_due(now):
+            return
+        try:
+            version = await asyncio.to_thread(self._read_version)
+        except Exception as e:
+            logger.warning(f'Could not read the version of {self.collection_id}: {e}')
+            cache.observe_version(cache.version, now)
+            return
+        cache.observe_version(version, now)
+
+    async def bump_version(self) -> None:
+        """Mark the collection as changed, invalidating cached searches."""
+        version = await asyncio.to_thread(self._bump_version)
+        cache = self.cache
+        if cache is not None:
+            cache.observe_version(version)
+
+    @property
+    def phase_one(self) -> 'MilvusService':
+        """
+        This service fetching `two_phase.candidate_k` candidates per query with
+        only the preview and minimal fields; their content is the preview.
+        """
+        two_phase = self.settings.two_phase
+        settings = self.settings.model_copy(
+            update={
+                'output_field': [two_phase.preview_field, *two_phase.fields],
+                'top_k': max(two_phase.candidate_k, self.settings.top_k),
+            },
+        )
+        return self.model_copy(update={'settings': settings})
+
+    async def get_entities(self, ids: list[Any]) -> dict[Any, dict[str, Any]]:
+        """
+        Load the output fields of entities by primary key in one request.
+
+        Args:
+            ids (list[Any]): Primary keys.
+
+        Returns:
+            dict[Any, dict[str, Any]]: Output fields of each id found.
+        """
+        if not ids:
+            return {}
+        rows = await self._call(
+            'get',
+            collection_name=self.settings.collection_name,
+            ids=ids,
+            output_fields=self.settings.output_field,
+        )
+        return {row[self.settings.id_field]: row for row in rows}
+
+    async def hydrate(self, hits: list[list[MilvusHit]]) -> list[list[MilvusHit]]:
+        """
+        Fill hits from the first phase with their full output fields.
+
+        Args:
+            hits (list[list[MilvusHit]]): Hits kept per query, with previews.
+
+        Returns:
+            list[list[MilvusHit]]: The same hits with their content and entity
+                loaded; hits deleted in the meantime are dropped.
+        """
+        ids: dict[str, list[Any]] = {}
+        for hit in (hit for query_hits in hits for hit in query_hits):
+            ids.setdefault(hit.collection or self.settings.collection_name, []).append(hit.id)
+        names = list(ids)
+        found = await asyncio.gather(
+            *(self.member(name).get_entities(list(dict.fromkeys(ids[name]))) for name in names),
+        )
+        entities = dict(zip(names, found))
+        return [
+            [
+                hit.model_copy(
+                    update={
+                        'content': str(entity.get(self.settings.content_field, '')),
+                        'entity': {**hit.entity, **entity},
+                    },
+                )
+                for hit in query_hits
+                if (entity := entities[hit.collection or self.settings.collection_name].get(hit.id)) is not None
+            ]
+            for query_hits in hits
+        ]
+
+    def to_hit(self, data: dict[str, Any]) -> MilvusHit:
+        """Convert a raw Milvus hit into a MilvusHit."""
+        entity = data.get('entity', {})
+        return MilvusHit(
+            id=data.get('id'),
+            score=data.get('distance', 0.0),
+            content=str(entity.get(self.settings.content_field, '')),
+            entity=entity,
+        )
+
+    async def embed(self, queries: list[str]) -> list[np.ndarray]:
+        """Embed query texts in one call."""
         embed_result = await self.embed_service.process(
             EmbedInput(
-                query=inputs.query,
+                query=queries,
             ),
         )
-        vector = embed_result.embeddings[0]
+        return embed_result.embeddings
 
-        retrive_output = self.execute_query(
-            vector=vector,
+    async def search_vectors(
+        self,
+        vectors: list[np.ndarray],
+        filters: Optional[list[MilvusFilter]] = None,
+    ) -> list[list[MilvusHit]]:
+        """Search a batch of vectors with the configured parameters."""
+        retrive_output = await self.execute_query(
+            vectors=vectors,
             params=self.settings.search_params,
             output_format=self.settings.output_field,
+            filters=filters,
         )
+        return [[self.to_hit(data) for data in query_hits] for query_hits in retrive_output]
 
-        output = [
-            data['entity'][str(self.settings.output_field)] for data in retrive_output
+    async def retrieve(
+        self,
+        queries: list[str],
+        vectors: list[np.ndarray],
+        filters: Optional[list[MilvusFilter]] = None,
+    ) -> list[list[MilvusHit]]:
+        """
+        Search a batch of queries, dense only or hybrid depending on the settings.
+
+        In hybrid mode the dense and the sparse search run concurrently, each
+        fetching `candidate_k` hits per query, and their rankings are fused with
+        weighted reciprocal-rank fusion down to `top_k` hits.
+
+        Args:
+            queries (list[str]): The query texts, for the sparse search.
+            vectors (list[np.ndarray]): Their embeddings, for the dense search.
+            filters (Optional[list[MilvusFilter]]): Conditions every hit must meet.
+
+        Returns:
+            list[list[MilvusHit]]: The hits of each query, in input order.
+        """
+        hybrid = self.settings.hybrid
+        if not hybrid.enabled:
+            return await self.search_vectors(vectors, filters)
+
+        limit = max(hybrid.candidate_k, self.settings.top_k)
+        dense, sparse = await asyncio.gather(
+            self.execute_query(vectors, self.settings.search_params, self.settings.output_field, limit, filters),
+            self.execute_sparse_query(queries, self.settings.output_field, limit, filters),
+        )
+        return [
+            reciprocal_rank_fusion(
+                {
+                    'dense': [self.to_hit(data) for data in dense_hits],
+                    'sparse': [self.to_hit(data) for data in sparse_hits],
+                },
+                {'dense': hybrid.dense_weight, 'sparse': hybrid.sparse_weight},
+                hybrid.rrf_k,
+                self.settings.top_k,
+            )
+            for dense_hits, sparse_hits in zip(dense, sparse)
         ]
 
-        return MilvusOutput(output=output)
+    @property
+    def dense_higher_is_better(self) -> bool:
+        """Whether a higher dense score means a closer match: similarities, not L2 distances."""
+        return self.settings.metric_type != 'L2'
+
+    @property
+    def higher_is_better(self) -> bool:
+        """Whether a higher hit score means a closer match: dense similarities and fused scores."""
+        return self.settings.hybrid.enabled or self.dense_higher_is_better
+
+    def member(self, name: str) -> 'MilvusService':
+        """
+        This service on another collection of the federation, searching it alone
+        with `federation.candidate_k` hits per query.
+        """
+        if name == self.settings.collection_name and not self.settings.federation.collections:
+            return self
+        federation = self.settings.federation
+        settings = self.settings.model_copy(
+            update={
+                'collection_name': name,
+                'top_k': max(federation.candidate_k, self.settings.top_k),
+                'federation': federation.model_copy(update={'collections': []}),
+            },
+        )
+        return self.model_copy(update={'settings': settings})
+
+    async def _search_member(
+        self,
+        name: str,
+        timeout: float,
+        queries: list[str],
+        vectors: list[np.ndarray],
+        filters: Optional[list[MilvusFilter]],
+    ) -> list[list[MilvusHit]]:
+        try:
+            return await asyncio.wait_for(self.member(name).search(queries, filters, vectors), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f'Federated search skipped {name}: no answer within {timeout}s')
+        except Exception as e:
+            logger.warning(f'Federated search skipped {name}: {e}')
+        return [[] for _ in queries]
+
+    async def search_federated(
+        self,
+        queries: list[str],
+        filters: Optional[list[MilvusFilter]] = None,
+    ) -> list[list[MilvusHit]]:
+        """
+        Search every collection of the federation concurrently and merge their hits.
+
+        The queries are embedded once. Each collection is searched through its
+        own cache and under its own timeout; a collection that times out or
+        fails contributes no hits instead of failing the search. Scores are
+        min-max normalized per collection and query, weighted, and the best
+        `top_k` hits across collections are kept.
+
+        Args:
+            queries (list[str]): The query texts.
+            filters (Optional[list[MilvusFilter]]): Conditions every hit must meet.
+
+        Returns:
+            list[list[MilvusHit]]: The merged hits of each query, in input order,
+                each tagged with its collection.
+        """
+        federation = self.settings.federation
+        vectors = await self.embed(queries)
+        results = await asyncio.gather(
+            *(
+                self._search_member(
+                    collection.name,
+                    collection.timeout or federation.timeout,
+                    queries,
+                    vectors,
+                    filters,
+                )
+                for collection in federation.collections
+            ),
+        )
+        names = [collection.name for collection in federation.collections]
+        weights = {collection.name: collection.weight for collection in federation.collections}
+        directions = {name: self.member(name).higher_is_better for name in names}
+        return [
+            merge_collections(dict(zip(names, query_hits)), weights, directions, self.settings.top_k)
+            for query_hits in zip(*results)
+        ]
+
+    async def search(
+        self,
+        queries: list[str],
+        filters: Optional[list[MilvusFilter]] = None,
+        vectors: Optional[list[np.ndarray]] = None,
+    ) -> list[list[MilvusHit]]:
+        """
+        Embed and search a batch of queries, answering repeated ones from the cache.
+
+        In "text" cache mode cached queries are neither embedded nor searched;
+        in "vector" mode every query is embedded and only uncached vectors are
+        searched. With federated collections configured, they are searched
+        instead of `collection_name`.
+
+        Args:
+            queries (list[str]): The query texts.
+            filters (Optional[list[MilvusFilter]]): Conditions every hit must meet.
+            vectors (Optional[list[np.ndarray]]): Embeddings of the queries, if
+                already computed.
+
+        Returns:
+            list[list[MilvusHit]]: The hits of each query, in input order.
+        """
+        if self.settings.federation.collections:
+            return await self.search_federated(queries, filters)
+
+        cache = self.cache
+        if cache is None:
+            if vectors is None:
+                vectors = await self.embed(queries)
+            return await self.retrieve(queries, vectors, filters)
+
+        await self.refresh_version(cache)
+        signature = self.search_signature
+        if filters:
+            signature = f'{signature}|{compile_filters(filters)}'
+        if self.settings.cache.key == 'vector':
+            if vectors is None:
+                vectors = await self.embed(queries)
+            keys = [
+                vector_key(signature, vector, self.settings.cache.quantization_step)
+                for vector in vectors
+            ]
+        else:
+            keys = [text_key(signature, query) for query in queries]
+
+        hits = [cache.get(key) for key in keys]
+        missing = [index for index, cached in enumerate(hits) if cached is None]
+        if missing:
+            if vectors is None:
+                missing_vectors = await self.embed([queries[index] for index in missing])
+            else:
+                missing_vectors = [vectors[index] for index in missing]
+            version = cache.version
+            fresh_hits = await self.retrieve([queries[index] for index in missing], missing_vectors, filters)
+            for index, fresh in zip(missing, fresh_hits):
+                hits[index] = fresh
+                if cache.version == version:
+                    cache.put(keys[index], fresh)
+        return hits
+
+    async def process(self, inputs: MilvusInput) -> MilvusOutput:
+        """
+        Process text queries through a batched vector similarity search.
+
+        This method handles the complete workflow of:
+        1. Answering queries searched recently from the result cache
+        2. Converting the other query texts to vector embeddings in one call
+        3. Searching for similar vectors of those queries in one request,
+           fused with a BM25 search of their texts in hybrid mode, or in
+           every federated collection concurrently
+        4. Extracting and formatting the results per query
+
+        Args:
+            inputs (MilvusInput): The input containing query texts to search for.
+
+        Returns:
+            MilvusOutput: The hits grouped per query and their deduplicated contents.
+
+        Raises:
+            Exception: If there's an error during embedding or search operations.
+        """
+        if not inputs.query:
+            return MilvusOutput(output=[], hits=[])
+
+        hits = await self.search(inputs.query, inputs.filters)
+        output = list(dict.fromkeys(hit.content for query_hits in hits for hit in query_hits))
+
+        return MilvusOutput(output=output, hits=hits)
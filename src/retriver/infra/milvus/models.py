@@ -1,11 +1,104 @@
 from __future__ import annotations
 
+import re
+from typing import Any
+from typing import Literal
+from typing import Optional
+
+from pydantic import field_validator
+from pydantic import model_validator
 from shared.base import BaseModel
 
+FIELD_PATTERN = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*$')
+
+
+class MilvusFilter(BaseModel):
+    """
+    One condition on a scalar field; the conditions of a search are ANDed.
+
+    Attributes:
+        field (str): Schema or dynamic field, such as "source", "ingested_at"
+            or the partition key field.
+        op (str): Comparison operator.
+        value (Any): Compared value: a list for "in" and "not in", a pattern with
+            "%" wildcards for "like", a scalar otherwise.
+    """
+
+    field: str
+    op: Literal['==', '!=', '>', '>=', '<', '<=', 'in', 'not in', 'like'] = '=='
+    value: Any
+
+    @field_validator('field')
+    @classmethod
+    def check_field(cls, value: str) -> str:
+        if not FIELD_PATTERN.match(value):
+            raise ValueError(f'Invalid field name: {value!r}')
+        return value
+
+    @model_validator(mode='after')
+    def check_value(self) -> 'MilvusFilter':
+        if self.op in ('in', 'not in'):
+            if not isinstance(self.value, list):
+                raise ValueError(f'"{self.op}" needs a list value')
+            scalars = self.value
+        elif self.op == 'like':
+            if not isinstance(self.value, str):
+                raise ValueError('"like" needs a string pattern')
+            scalars = [self.value]
+        else:
+            scalars = [self.value]
+        if any(not isinstance(scalar, (str, int, float, bool)) for scalar in scalars):
+            raise ValueError(f'Unsupported filter value: {self.value!r}')
+        return self
+
 
 class MilvusInput(BaseModel):
-    query: str
+    """
+    Attributes:
+        query (list[str]): Queries searched together in one batched request.
+        filters (list[MilvusFilter]): Conditions every hit must meet, pushed
+            down into the search.
+    """
+
+    query: list[str]
+    filters: list[MilvusFilter] = []
+
+    @field_validator('query', mode='before')
+    @classmethod
+    def wrap_single_query(cls, value: Any) -> Any:
+        return [value] if isinstance(value, str) else value
+
+
+class MilvusHit(BaseModel):
+    """
+    One search result.
+
+    Attributes:
+        id (Any): Primary key of the entity.
+        score (float): Distance reported by Milvus for the collection's metric, the
+            fused score with hybrid search, or the weighted normalized score with
+            federated search.
+        content (str): Value of the content field.
+        entity (dict[str, Any]): All requested output fields.
+        scores (dict[str, float]): With hybrid search, the score of each retriever
+            that returned the hit, "dense" and "sparse".
+        collection (Optional[str]): With federated search, the collection holding the hit.
+    """
+
+    id: Any
+    score: float
+    content: str
+    entity: dict[str, Any] = {}
+    scores: dict[str, float] = {}
+    collection: Optional[str] = None
 
 
 class MilvusOutput(BaseModel):
+    """
+    Attributes:
+        output (list[str]): Contents of every query's hits, deduplicated in rank order.
+        hits (list[list[MilvusHit]]): Hits grouped per query, in input order.
+    """
+
     output: list[str]
+    hits: list[list[MilvusHit]] = []
@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from contextlib import asynccontextmanager
+from typing import Any
+from typing import AsyncIterator
+from typing import Awaitable
+from typing import Callable
+from typing import Optional
+
+from shared.logging import get_logger
+from shared.settings import MilvusPoolSettings
+"""
+Connection Pool Module
+
+This module keeps several asyncio Milvus clients, each with its own gRPC
+channel, so concurrent searches spread over channels instead of queueing
+on one. Each call goes to the connected client with the fewest calls in
+flight. A background task probes every client; clients that fail a probe
+or a call with a connection error are closed and reconnected with
+exponential backoff.
+"""
+
+logger = get_logger(__name__)
+
+
+class MilvusPoolUnavailableError(Exception):
+    """Raised when no client of the pool is connected."""
+
+
+class PooledClient:
+    """
+    One client of the pool with its connection state.
+
+    Attributes:
+        slot (int): Position of the client in the pool.
+    """
+
+    def __init__(self, slot: int):
+        self.slot = slot
+        self.client: Optional[Any] = None
+        self.healthy = False
+        self.outstanding = 0
+        self.failures = 0
+        self.retry_at = 0.0
+
+        self.calls = 0
+        self.errors = 0
+        self.reconnects = 0
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            'healthy': self.healthy,
+            'outstanding': self.outstanding,
+            'calls': self.calls,
+            'errors': self.errors,
+            'reconnects': self.reconnects,
+        }
+
+
+class MilvusConnectionPool:
+    """
+    Pool of health-checked clients.
+
+    Attributes:
+        settings (MilvusPoolSettings): Pool size, health check and backoff settings.
+        connect (Callable[[], Any]): Creates a connected client.
+        probe (Callable[[Any], Awaitable[Any]]): Cheap call proving a client works.
+        disconnect (Callable[[Any], Awaitable[None]]): Closes a client.
+        is_connection_error (Callable[[BaseException], bool]): Whether an error means
+            the client's connection is broken rather than the call being invalid.
+    """
+
+    def __init__(
+        self,
+        settings: MilvusPoolSettings,
+        connect: Callable[[], Any],
+        probe: Callable[[Any], Awaitable[Any]],
+        disconnect: Callable[[Any], Awaitable[None]],
+        is_connection_error: Callable[[BaseException], bool],
+    ):
+        self.settings = settings
+        self.connect = connect
+        self.probe = probe
+        self.disconnect = disconnect
+        self.is_connection_error = is_connection_error
+        self.clients = [PooledClient(slot) for slot in range(max(1, settings.size))]
+        self._health_task: Optional[asyncio.Task] = None
+        # Concurrent first calls open the pool once
+        self._open_lock = asyncio.Lock()
+
+    @property
+    def opened(self) -> bool:
+        return self._health_task is not None
+
+    async def open(self) -> None:
+        """Connect every client and start the health checks."""
+        async with self._open_lock:
+            if self.opened:
+                return
+            for pooled in self.clients:
+                await self._reconnect(pooled)
+            healthy = sum(pooled.healthy for pooled in self.clients)
+            logger.info(f'Milvus connection pool opened with {healthy}/{len(self.clients)} clients')
+            self._health_task = asyncio.create_task(self._run_health_checks())
+
+    async def close(self) -> None:
+        """Stop the health checks and close every client."""
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+            self._health_task = None
+        for pooled in self.clients:
+            await self._drop(pooled)
+
+    def pick(self) -> PooledClient:
+        """
+        The connected client with the fewest calls in flight.
+
+        Raises:
+            MilvusPoolUnavailableError: If no client is connected.
+        """
+        candidates = [pooled for pooled in self.clients if pooled.healthy]
+        if not candidates:
+            raise MilvusPoolUnavailableError('No Milvus connection is available')
+        fewest = min(pooled.outstanding for pooled in candidates)
+        return random.choice([pooled for pooled in candidates if pooled.outstanding == fewest])
+
+    @asynccontextmanager
+    async def acquire(self) -> AsyncIterator[Any]:
+        """
+        Use a client for one call; a connection error takes it out of rotation.
+
+        Yields:
+            Any: The client.
+        """
+        pooled = self.pick()
+        pooled.outstanding += 1
+        pooled.calls += 1
+        try:
+            yield pooled.client
+        except BaseException as e:
+            if self.is_connection_error(e):
+                pooled.errors += 1
+                self._mark_unhealthy(pooled, e)
+            raise
+        finally:
+            pooled.outstanding -= 1
+
+    async def call(self, method: str, **kwargs) -> Any:
+        """
+        Call a client method, retrying once on another client after a connection error.
+
+        Args:
+            method (str): Name of the client method.
+            **kwargs: Arguments of the call.
+
+        Returns:
+            Any: The result of the call.
+        """
+        for attempt in range(2):
+            try:
+                async with self.acquire() as client:
+                    return await getattr(client, method)(**kwargs)
+            except Exception as e:
+                if attempt or not self.is_connection_error(e):
+                    raise
+                logger.warning(f'Milvus {method} failed on a broken connection, retrying: {e}')
+
+    def _mark_unhealthy(self, pooled: PooledClient, error: BaseException) -> None:
+        if pooled.healthy:
+            logger.warning(f'Milvus client {pooled.slot} lost its connection: {error}')
+        pooled.healthy = False
+        pooled.failures += 1
+        delay = min(
+            self.settings.max_reconnect_backoff,
+            self.settings.reconnect_backoff * 2 ** (pooled.failures - 1),
+        )
+        pooled.retry_at = time.monotonic() + delay * random.uniform(0.8, 1.2)
+
+    async def _drop(self, pooled: PooledClient) -> None:
+        client, pooled.client = pooled.client, None
+        pooled.healthy = False
+        if client is None:
+            return
+        try:
+            await self.disconnect(client)
+        except Exception as e:
+            logger.warning(f'Error while closing Milvus client {pooled.slot}: {e}')
+
+    async def _reconnect(self, pooled: PooledClient) -> None:
+        # Wait for in-flight calls before replacing their client
+        if pooled.outstanding:
+            return
+        await self._drop(pooled)
+        try:
+            pooled.client = self.connect()
+            await self._probe(pooled.client)
+        except Exception as e:
+            self._mark_unhealthy(pooled, e)
+            return
+        if pooled.failures:
+            pooled.reconnects += 1
+            logger.info(f'Milvus client {pooled.slot} reconnected')
+        pooled.healthy = True
+        pooled.failures = 0
+
+    async def _probe(self, client: Any) -> None:
+        """Probe a client, raising only on a broken connection: a server error proves it works."""
+        try:
+            await asyncio.wait_for(self.probe(client), self.settings.health_check_timeout)
+        except asyncio.TimeoutError:
+            raise
+        except Exception as e:
+            if self.is_connection_error(e):
+                raise
+
+    async def check(self) -> None:
+        """Probe connected clients and reconnect the broken ones whose backoff has elapsed."""
+        now = time.monotonic()
+        for pooled in self.clients:
+            if not pooled.healthy:
+                if now >= pooled.retry_at:
+                    await self._reconnect(pooled)
+                continue
+            try:
+                await self._probe(pooled.client)
+            except Exception as e:
+                self._mark_unhealthy(pooled, e)
+
+    async def _run_health_checks(self) -> None:
+        while True:
+            await asyncio.sleep(self.settings.health_check_interval)
+            try:
+                await self.check()
+            except Exception as e:
+                logger.warning(f'Milvus health check failed: {e}')
+
+    def stats(self) -> dict[str, Any]:
+        """Connection state and call counts per client."""
+        return {
+            'healthy': sum(pooled.healthy for pooled in self.clients),
+            'size': len(self.clients),
+            'clients': [pooled.stats() for pooled in self.clients],
+        }
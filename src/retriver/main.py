@@ -7,6 +7,9 @@ from api.routers import retrive_router
 from domain.processor.rerank import RerankDriver
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
+from infra.cassette import CassetteRegistry
+from infra.milvus import MilvusDriver
 from shared.logging import get_logger
 from shared.logging import setup_logging
 from shared.utils import get_settings
@@ -21,21 +24,31 @@ async def lifespan(app: FastAPI):
     """Application lifespan manager to handle startup and shutdown events.
 
     This asynchronous context manager initializes the rerank model on startup
-    and performs a warm-up to ensure faster initial inference times.
+    and performs a warm-up to ensure faster initial inference times. It also
+    activates the record/replay cassette, saving recordings on shutdown, and
+    opens the pool of Milvus connections, closing it on shutdown.
 
     Args:
         app (FastAPI): The FastAPI application instance
     """
     settings = get_settings()
     RerankDriver(settings=settings.rerank)
+    CassetteRegistry().configure(settings.cassette)
+    if settings.milvus.backend == 'milvus':
+        await MilvusDriver(settings.milvus).open()
 
     yield
 
+    if settings.milvus.backend == 'milvus':
+        await MilvusDriver(settings.milvus).aclose()
+    CassetteRegistry().close()
+
 
 app = FastAPI(
     title='Agentic-RAG API',
     description='API for Agentic-RAG',
     version='0.1.0',
+    default_response_class=ORJSONResponse,
     lifespan=lifespan,
 )
 
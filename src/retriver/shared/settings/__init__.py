@@ -1,21 +1,57 @@
 from __future__ import annotations
 
+from .balancer import BalancerSettings
+from .cassette import CassetteSettings
 from .chunking import ChunkingSettings
 from .embed import EmbedSettings
+from .ingest import IngestSettings
+from .llm import LLMBudgetSettings
+from .llm import LLMHedgingSettings
+from .llm import LLMResilienceSettings
+from .llm import LLMSchedulerSettings
 from .llm import LLMSettings
+from .llm import LLMStage
+from .llm import LLMStageSettings
+from .milvus import FederatedCollectionSettings
+from .milvus import FederatedSearchSettings
+from .milvus import HybridSearchSettings
+from .milvus import LocalIndexSettings
+from .milvus import MilvusPoolSettings
 from .milvus import MilvusSettings
+from .milvus import SearchCacheSettings
+from .milvus import TwoPhaseSettings
+from .milvus import VectorIndexSettings
 from .rerank import RerankSettings
 from .retrive import RetrieveSettings
 from .settings import Settings
+from .web_search import WebCacheSettings
 from .web_search import WebSearchSettings
 
 __all__ = [
     'Settings',
     'LLMSettings',
+    'LLMResilienceSettings',
+    'LLMHedgingSettings',
+    'LLMStage',
+    'LLMStageSettings',
+    'LLMSchedulerSettings',
+    'LLMBudgetSettings',
     'MilvusSettings',
+    'LocalIndexSettings',
+    'SearchCacheSettings',
+    'HybridSearchSettings',
+    'VectorIndexSettings',
+    'TwoPhaseSettings',
+    'MilvusPoolSettings',
+    'FederatedCollectionSettings',
+    'FederatedSearchSettings',
     'RerankSettings',
     'RetrieveSettings',
     'EmbedSettings',
     'WebSearchSettings',
+    'WebCacheSettings',
     'ChunkingSettings',
+    'CassetteSettings',
+    'BalancerSettings',
+    'IngestSettings',
 ]
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from typing import Literal
+
+from shared.base import BaseModel
+
+
+class BalancerSettings(BaseModel):
+    """Settings for client-side load balancing across several endpoints of a service"""
+
+    strategy: Literal['least_outstanding', 'p2c'] = 'p2c'
+    failure_threshold: int = 3
+    eject_duration: float = 10.0
+    max_eject_duration: float = 120.0
+    latency_window: int = 200
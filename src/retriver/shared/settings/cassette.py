@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from typing import Literal
+
+from shared.base import BaseModel
+
+
+class CassetteSettings(BaseModel):
+    """Settings for recording and replaying calls to the LLM, embedding and web search services"""
+
+    mode: Literal['off', 'record', 'replay'] = 'off'
+    path: str = 'cassettes/default'
+    store_requests: bool = False
+    simulate_latency: bool = False
+    latency_scale: float = 1.0
@@ -1,10 +1,32 @@
 from __future__ import annotations
 
+from typing import List
+from typing import Literal
+from typing import Optional
+
 from pydantic import HttpUrl
+from pydantic import model_validator
 from shared.base import BaseModel
 
+from .balancer import BalancerSettings
+
 
 class EmbedSettings(BaseModel):
     """Settings for the Embedding Service"""
 
-    url: HttpUrl
+    url: Optional[HttpUrl] = None
+    urls: List[HttpUrl] = []
+    balancer: BalancerSettings = BalancerSettings()
+    # Precision embeddings are decoded to; float16 halves their memory
+    dtype: Literal['float32', 'float16'] = 'float32'
+
+    @model_validator(mode='after')
+    def check_endpoints(self) -> EmbedSettings:
+        if self.url is None and not self.urls:
+            raise ValueError('Either url or urls must be set')
+        return self
+
+    @property
+    def endpoints(self) -> list[str]:
+        """Endpoint URLs to balance over, `urls` taking precedence over `url`"""
+        return [str(url) for url in self.urls] if self.urls else [str(self.url)]
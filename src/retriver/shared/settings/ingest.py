@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from typing import Optional
+
+from shared.base import BaseModel
+
+
+class IngestSettings(BaseModel):
+    """Settings for the batched document ingestion pipeline"""
+
+    extensions: list[str] = ['.html', '.htm', '.md', '.markdown', '.txt']
+    parse_workers: Optional[int] = None
+    file_batch_size: int = 32
+    chunk_concurrency: int = 8
+    embed_batch_size: int = 256
+    upsert_batch_size: int = 1000
+    checkpoint_path: str = 'data/ingest_checkpoint.json'
@@ -1,13 +1,119 @@
 from __future__ import annotations
 
+from enum import Enum
+from typing import Dict
+from typing import List
+from typing import Optional
+
+from pydantic import Field
 from pydantic import HttpUrl
+from pydantic import model_validator
 from shared.base import BaseModel
 
+from .balancer import BalancerSettings
+
+
+class LLMStage(str, Enum):
+    """Pipeline stages that may be configured with their own LLM settings"""
+
+    DEFAULT = 'default'
+    GET_FACT = 'get_fact'
+    PLANNING = 'planning'
+    TOOL_DECISION = 'tool_decision'
+    CONTEXT_CLEANER = 'context_cleaner'
+    OUTPUT_VALIDATOR = 'output_validator'
+    MEMORY = 'memory'
+    WEB_SEARCH = 'web_search'
+    ANSWER_GENERATOR = 'answer_generator'
+
+
+class LLMResilienceSettings(BaseModel):
+    """Settings for concurrency limiting, retries and circuit breaking of LLM calls"""
+
+    initial_limit: int = 8
+    min_limit: int = 1
+    max_limit: int = 64
+    backoff_ratio: float = 0.5
+    queue_timeout: float = 30.0
+    max_queue: int = 256
+
+    max_retries: int = 3
+    retry_base_delay: float = 0.5
+    retry_max_delay: float = 20.0
+
+    failure_threshold: int = 5
+    reset_timeout: float = 30.0
+
+
+class LLMHedgingSettings(BaseModel):
+    """Settings for hedged (duplicated) LLM requests to cut tail latency"""
+
+    enabled: bool = False
+    # Endpoint hedges are sent to instead of another balanced endpoint; it is
+    # not a balancer endpoint, so it gets no health tracking or ejection
+    secondary_url: Optional[HttpUrl] = None
+    percentile: float = 0.95
+    min_samples: int = 20
+    window: int = 500
+    min_delay: float = 0.05
+    max_hedge_ratio: float = 0.1
+    max_hedge_burst: int = 5
+    control_ratio: float = 0.05
+
+
+class LLMSchedulerSettings(BaseModel):
+    """
+    Settings for the process-wide, priority-aware LLM call scheduler
+
+    The scheduler is a singleton built from the settings of its first caller,
+    so `scheduler` values given to later stages' settings are ignored.
+    """
+
+    enabled: bool = False
+    max_concurrency: int = 32
+    aging_rate: float = 1.0
+    stage_priorities: Dict[str, int] = Field(
+        default_factory=lambda: {
+            'answer_generator': 100,
+            'memory': 80,
+            'output_validator': 70,
+            'context_cleaner': 60,
+            'web_search': 40,
+            'tool_decision': 40,
+            'planning': 30,
+            'get_fact': 20,
+            'default': 0,
+        },
+    )
+
+
+class LLMBudgetSettings(BaseModel):
+    """Settings for pre-flight token counting and trimming of prompts"""
+
+    enabled: bool = True
+    chars_per_token: float = 4.0
+    message_overhead: int = 4
+    truncation_marker: str = ' ...[truncated]'
+
+
+class LLMStageSettings(BaseModel):
+    """Per-stage overrides of the LLM settings, unset fields fall back to the defaults"""
+
+    url: Optional[HttpUrl] = None
+    urls: Optional[List[HttpUrl]] = None
+    model: Optional[str] = None
+    max_completion_tokens: Optional[int] = None
+    context_window: Optional[int] = None
+    prompt_budget: Optional[int] = None
+    tokenizer_path: Optional[str] = None
+    escalate: bool = False
+
 
 class LLMSettings(BaseModel):
     """Settings for the LLM (Large Language Model)"""
 
-    url: HttpUrl
+    url: Optional[HttpUrl] = None
+    urls: List[HttpUrl] = []
     model: str
     frequency_penalty: int = 0
     n: int = 1
@@ -15,3 +121,51 @@ class LLMSettings(BaseModel):
     temperature: int = 0
     top_p: int = 1
     max_completion_tokens: int = 4096
+    request_timeout: Optional[float] = None
+    context_window: int = 32768
+    prompt_budget: Optional[int] = None
+    tokenizer_path: Optional[str] = None
+
+    budget: LLMBudgetSettings = LLMBudgetSettings()
+    balancer: BalancerSettings = BalancerSettings()
+    resilience: LLMResilienceSettings = LLMResilienceSettings()
+    hedging: LLMHedgingSettings = LLMHedgingSettings()
+    scheduler: LLMSchedulerSettings = LLMSchedulerSettings()
+    # Keyed by stage name; a misspelled stage fails validation
+    stages: Dict[LLMStage, LLMStageSettings] = {}
+
+    @model_validator(mode='after')
+    def check_endpoints(self) -> LLMSettings:
+        if self.url is None and not self.urls:
+            raise ValueError('Either url or urls must be set')
+        return self
+
+    @property
+    def endpoints(self) -> list[str]:
+        """Endpoint URLs to balance over, `urls` taking precedence over `url`"""
+        return [str(url) for url in self.urls] if self.urls else [str(self.url)]
+
+    def for_stage(self, stage: LLMStage | str) -> LLMSettings:
+        """
+        Resolve the settings used by a pipeline stage.
+
+        Args:
+            stage (LLMStage | str): The stage, e.g. "tool_decision" or "answer_generator".
+
+        Returns:
+            LLMSettings: These settings with the stage's overrides applied.
+        """
+        override = self.stages.get(stage)
+        if override is None:
+            return self
+        update = override.model_dump(exclude={'escalate'}, exclude_none=True)
+        if 'url' in update and 'urls' not in update:
+            update['urls'] = []
+        return self.model_copy(update=update)
+
+    @property
+    def effective_prompt_budget(self) -> int:
+        """Prompt token budget, defaulting to what the context window leaves after the completion"""
+        if self.prompt_budget is not None:
+            return self.prompt_budget
+        return self.context_window - self.max_completion_tokens
@@ -2,6 +2,7 @@ from __future__ import annotations
 
 from typing import Any
 from typing import Dict
+from typing import Literal
 from typing import Optional
 
 from pydantic import Field
@@ -9,15 +10,144 @@ from pydantic import Field
 from ..base import BaseModel
 
 
+class LocalIndexSettings(BaseModel):
+    """Settings for the in-process memory-mapped vector index"""
+
+    path: str = 'data/local_index'
+    metric: Literal['COSINE', 'IP', 'L2'] = 'COSINE'
+    # 0 searches exhaustively, otherwise vectors are grouped into nlist IVF clusters
+    nlist: int = 0
+    nprobe: int = 8
+    kmeans_iterations: int = 20
+    train_size: int = 50000
+    block_rows: int = 65536
+
+
+class SearchCacheSettings(BaseModel):
+    """Settings for the LRU cache of vector search results"""
+
+    # Opt-in: writes that bypass the collection version, such as deletes made
+    # directly in Milvus, are served stale for up to `ttl` seconds
+    enabled: bool = False
+    # 'text' keys on the query text, 'vector' on the quantized query embedding
+    key: Literal['text', 'vector'] = 'text'
+    max_entries: int = 1024
+    ttl: float = 300.0
+    quantization_step: float = 0.01
+    version_refresh_interval: float = 5.0
+
+
+class HybridSearchSettings(BaseModel):
+    """Settings for fusing dense and sparse (BM25) search with reciprocal-rank fusion"""
+
+    enabled: bool = False
+    sparse_field: str = 'sparse'
+    # Hits fetched from each retriever before fusion, at least top_k
+    candidate_k: int = 20
+    rrf_k: int = 60
+    dense_weight: float = 1.0
+    sparse_weight: float = 1.0
+    # BM25 parameters of the local index; Milvus uses its own defaults
+    bm25_k1: float = 1.2
+    bm25_b: float = 0.75
+
+
+class TwoPhaseSettings(BaseModel):
+    """Settings for fetching ids and scores first and the full text of the kept hits only"""
+
+    enabled: bool = False
+    # Short prefix of each chunk stored at ingestion, fetched in the first phase for reranking
+    preview_field: str = 'preview'
+    preview_chars: int = 320
+    # Other small fields fetched in the first phase
+    fields: list[str] = []
+    candidate_k: int = 20
+
+
+class MilvusPoolSettings(BaseModel):
+    """Settings for the pool of asyncio Milvus clients"""
+
+    size: int = 4
+    health_check_interval: float = 15.0
+    health_check_timeout: float = 3.0
+    reconnect_backoff: float = 0.5
+    max_reconnect_backoff: float = 30.0
+
+
+class FederatedCollectionSettings(BaseModel):
+    """One collection searched by federated search"""
+
+    name: str
+    # Multiplies the collection's normalized scores
+    weight: float = 1.0
+    # Seconds before the collection is skipped, the federation timeout when unset
+    timeout: Optional[float] = None
+
+
+class FederatedSearchSettings(BaseModel):
+    """Settings for searching several collections at once and merging their hits"""
+
+    # Collections sharing the embedding model; empty searches `collection_name` only
+    collections: list[FederatedCollectionSettings] = []
+    timeout: float = 2.0
+    # Hits fetched from each collection before the global top_k, at least top_k
+    candidate_k: int = 10
+
+
+# Build parameters used when the index settings leave them out
+DEFAULT_INDEX_PARAMS: Dict[str, Dict[str, Any]] = {
+    'IVF_FLAT': {'nlist': 1024},
+    'IVF_SQ8': {'nlist': 1024},
+    'IVF_PQ': {'nlist': 1024, 'm': 16, 'nbits': 8},
+    'HNSW': {'M': 16, 'efConstruction': 200},
+}
+
+
+class VectorIndexSettings(BaseModel):
+    """Settings for the Milvus index of the vector field"""
+
+    # IVF_SQ8 stores 1 byte per dimension and IVF_PQ m * nbits / 8 bytes per
+    # vector, against 4 bytes per dimension for FLAT, IVF_FLAT and HNSW
+    index_type: Literal['AUTOINDEX', 'FLAT', 'IVF_FLAT', 'IVF_SQ8', 'IVF_PQ', 'HNSW'] = 'AUTOINDEX'
+    params: Dict[str, Any] = Field(default_factory=dict)
+
+    @property
+    def build_params(self) -> Dict[str, Any]:
+        """Build parameters of the index type, overridden by `params`."""
+        return {**DEFAULT_INDEX_PARAMS.get(self.index_type, {}), **self.params}
+
+
 class MilvusSettings(BaseModel):
-    host: str
-    port: int
+    backend: Literal['milvus', 'local'] = 'milvus'
+
+    host: str = 'localhost'
+    port: int = 19530
     user: Optional[str] = None
     password: Optional[str] = None
     db_name: str
     collection_name: str
+    id_field: str = 'id'
+    # Scalar field whose value selects the partition of an entity, such as a tenant
+    partition_key_field: Optional[str] = None
+    num_partitions: int = 16
     anns_field: str
+    # FLOAT16_VECTOR halves the memory of the stored vectors and the bytes sent per search
+    vector_dtype: Literal['float32', 'float16'] = 'float32'
     output_field: list[str]
+    metric_type: Literal['COSINE', 'IP', 'L2'] = 'COSINE'
 
+    index: VectorIndexSettings = VectorIndexSettings()
     search_params: Dict[str, Any] = Field(default_factory=lambda: {'nprobe': 16})
     top_k: int = 3
+
+    local: LocalIndexSettings = LocalIndexSettings()
+    cache: SearchCacheSettings = SearchCacheSettings()
+    hybrid: HybridSearchSettings = HybridSearchSettings()
+    two_phase: TwoPhaseSettings = TwoPhaseSettings()
+    pool: MilvusPoolSettings = MilvusPoolSettings()
+    federation: FederatedSearchSettings = FederatedSearchSettings()
+
+    @property
+    def content_field(self) -> str:
+        """Output field holding the text returned as context."""
+        return self.output_field[0]
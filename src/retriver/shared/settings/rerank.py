@@ -7,3 +7,9 @@ class RerankSettings(BaseModel):
     """Settings for the Reranking service"""
 
     model_name: str
+    # Pairs of concurrent requests scored in one cross-encoder call
+    max_batch_pairs: int = 256
+    # Milliseconds a rerank waits for others to join its batch
+    max_wait_ms: float = 2.0
+    # Pairs per forward pass inside a cross-encoder call
+    batch_size: int = 32
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
+from typing import Optional
+
 from shared.base import BaseModel
 
 
 class RetrieveSettings(BaseModel):
     max_tries: int
     top_k: int
+    # Best vector DB similarity below which a step falls back to web search,
+    # or the distance above which for L2; None falls back on empty results only.
+    min_score: Optional[float] = None
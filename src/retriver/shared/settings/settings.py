@@ -4,8 +4,10 @@ from dotenv import find_dotenv
 from dotenv import load_dotenv
 from pydantic_settings import BaseSettings
 
+from .cassette import CassetteSettings
 from .chunking import ChunkingSettings
 from .embed import EmbedSettings
+from .ingest import IngestSettings
 from .llm import LLMSettings
 from .milvus import MilvusSettings
 from .rerank import RerankSettings
@@ -23,6 +25,8 @@ class Settings(BaseSettings):
     milvus: MilvusSettings
     web_search: WebSearchSettings
     chunking: ChunkingSettings
+    cassette: CassetteSettings = CassetteSettings()
+    ingest: IngestSettings = IngestSettings()
 
     class Config:
         env_nested_delimiter = '__'
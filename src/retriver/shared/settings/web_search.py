@@ -3,6 +3,19 @@ from __future__ import annotations
 from shared.base import BaseModel
 
 
+class WebCacheSettings(BaseModel):
+    """Settings for storing fetched web chunks in a vector collection for reuse"""
+
+    enabled: bool = False
+    collection_name: str = 'web_cache'
+    # Seconds a fetched chunk is served from the cache
+    ttl: int = 86400
+    # Cached chunks looked up per step, and the similarity each one must reach
+    # to be served, or the largest distance for L2
+    top_k: int = 10
+    min_score: float = 0.8
+
+
 class WebSearchSettings(BaseModel):
     """Settings for the LLM (Large Language Model)"""
 
@@ -12,3 +25,5 @@ class WebSearchSettings(BaseModel):
     target_tags: list[str]
     exclude_tags: list[str]
     exclude_classes: list[str]
+
+    cache: WebCacheSettings = WebCacheSettings()
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from typing import Callable
+
+import numpy as np
+from infra.embed import EmbedOutput
+from shared.settings import LocalIndexSettings
+from shared.settings import MilvusSettings
+
+"""Fakes and settings factories shared by the test modules."""
+
+
+class FakeEmbedService:
+    """Embeds each text with ``embed`` (every text on ``[1, 0]`` by default) and records each batch."""
+
+    def __init__(self, embed: Callable[[str], list[float]] | None = None, dtype=np.float32):
+        self.embed = embed or (lambda text: [1.0, 0.0])
+        self.dtype = dtype
+        self.calls: list[list[str]] = []
+
+    async def process(self, inputs):
+        self.calls.append(list(inputs.query))
+        return EmbedOutput(embeddings=[np.array(self.embed(text), dtype=self.dtype) for text in inputs.query])
+
+
+def milvus_settings(**update) -> MilvusSettings:
+    defaults = {
+        'db_name': 'default',
+        'collection_name': 'docs',
+        'anns_field': 'vector',
+        'output_field': ['text'],
+        'top_k': 5,
+    }
+    return MilvusSettings(**{**defaults, **update})
+
+
+def local_milvus_settings(path: str, **update) -> MilvusSettings:
+    return milvus_settings(**{'backend': 'local', 'local': LocalIndexSettings(path=path), **update})
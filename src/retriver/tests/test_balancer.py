@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import asyncio
+import unittest
+from unittest import mock
+
+from infra.balancer import EndpointResponseError
+from infra.balancer import EndpointState
+from infra.balancer import LoadBalancer
+from infra.balancer.balancer import Endpoint
+from shared.settings import BalancerSettings
+
+
+def make_balancer(strategy: str = 'least_outstanding') -> LoadBalancer:
+    settings = BalancerSettings(strategy=strategy, failure_threshold=2, eject_duration=10.0)
+    return LoadBalancer([Endpoint(url, settings) for url in ('http://a', 'http://b')], settings)
+
+
+async def call(balancer: LoadBalancer, url: str, error: Exception | None = None) -> None:
+    try:
+        async with balancer.track(url):
+            if error is not None:
+                raise error
+    except type(error) if error is not None else ():
+        pass
+
+
+class TestLoadBalancer(unittest.TestCase):
+    def test_least_outstanding(self):
+        balancer = make_balancer()
+        balancer.endpoints[0].outstanding = 3
+        self.assertEqual(balancer.pick().url, 'http://b')
+        self.assertEqual(balancer.pick(exclude={'http://b'}).url, 'http://a')
+
+    def test_eject_and_probe_back(self):
+        balancer = make_balancer()
+        a, b = balancer.endpoints
+
+        asyncio.run(call(balancer, a.url, EndpointResponseError('bad request', status_code=400)))
+        self.assertEqual(a.state, EndpointState.HEALTHY)
+
+        for _ in range(2):
+            asyncio.run(call(balancer, a.url, ConnectionError('down')))
+        self.assertEqual(a.state, EndpointState.EJECTED)
+        self.assertTrue(all(balancer.pick().url == b.url for _ in range(10)))
+
+        with mock.patch('time.monotonic', return_value=a.ejected_until + 1):
+            self.assertTrue(a.available(a.ejected_until + 1))
+            asyncio.run(call(balancer, a.url))
+        self.assertEqual(a.state, EndpointState.HEALTHY)
+        self.assertEqual(a.stats()['ejections'], 1)
+        self.assertIsNotNone(a.stats()['p50_latency'])
+
+    def test_all_ejected_uses_soonest(self):
+        balancer = make_balancer(strategy='p2c')
+        for endpoint in balancer.endpoints:
+            for _ in range(2):
+                asyncio.run(call(balancer, endpoint.url, ConnectionError('down')))
+        soonest = min(balancer.endpoints, key=lambda endpoint: endpoint.ejected_until)
+        self.assertEqual(balancer.pick().url, soonest.url)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import unittest
+
+import numpy as np
+from infra.cassette import Cassette
+from infra.cassette import CassetteMissError
+from shared.settings import CassetteSettings
+
+
+class TestCassette(unittest.TestCase):
+    def test_record_then_replay(self):
+        with tempfile.TemporaryDirectory() as path:
+            recorder = Cassette(CassetteSettings(mode='record', path=path))
+            responses = iter([[np.arange(4, dtype=np.float32)], [np.ones(4, dtype=np.float32)]])
+
+            async def call():
+                return next(responses)
+
+            async def record():
+                await recorder.play('embed', {'query': ['a']}, call)
+                await recorder.play('embed', {'query': ['a']}, call)
+
+            asyncio.run(record())
+            recorder.save()
+
+            player = Cassette(CassetteSettings(mode='replay', path=path, simulate_latency=True))
+
+            async def live():
+                raise AssertionError('replay must not call the live service')
+
+            async def replay():
+                return [await player.play('embed', {'query': ['a']}, live) for _ in range(3)]
+
+            first, second, third = asyncio.run(replay())
+            np.testing.assert_array_equal(first[0], np.arange(4, dtype=np.float32))
+            np.testing.assert_array_equal(second[0], np.ones(4, dtype=np.float32))
+            np.testing.assert_array_equal(third[0], np.ones(4, dtype=np.float32))
+            self.assertEqual(player.stats()['hits'], {'embed': 3})
+
+            with self.assertRaises(CassetteMissError):
+                asyncio.run(player.play('embed', {'query': ['b']}, live))
+
+
+if __name__ == '__main__':
+    unittest.main()
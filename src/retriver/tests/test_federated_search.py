@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+from infra.milvus import LocalIndexService
+from infra.milvus import MilvusHit
+from infra.milvus import MilvusInput
+from infra.milvus.fusion import merge_collections
+from shared.settings import FederatedCollectionSettings
+from shared.settings import FederatedSearchSettings
+from tests.helpers import FakeEmbedService
+from tests.helpers import local_milvus_settings
+
+
+def hit(key: str, score: float) -> MilvusHit:
+    return MilvusHit(id=key, score=score, content=key)
+
+
+class TestMergeCollections(unittest.TestCase):
+    def test_scores_are_normalized_per_collection(self):
+        merged = merge_collections(
+            {
+                'docs': [hit('a', 0.91), hit('b', 0.90), hit('c', 0.10)],
+                'faq': [hit('x', 4.0), hit('y', 40.0)],
+            },
+            {'docs': 1.0, 'faq': 0.5},
+            {'docs': True, 'faq': False},
+            limit=4,
+        )
+        self.assertEqual([h.id for h in merged], ['a', 'b', 'x', 'c'])
+        self.assertAlmostEqual(merged[1].score, 0.8 / 0.81)
+        self.assertEqual(merged[2].score, 0.5)
+        self.assertEqual(merged[2].collection, 'faq')
+        self.assertEqual(merged[2].scores, {'faq': 4.0})
+
+
+class TestFederatedSearch(unittest.TestCase):
+    def test_collections_are_merged_and_slow_ones_skipped(self):
+        with tempfile.TemporaryDirectory() as directory:
+            federation = FederatedSearchSettings(
+                collections=[
+                    FederatedCollectionSettings(name='docs'),
+                    FederatedCollectionSettings(name='faq', weight=0.9),
+                    FederatedCollectionSettings(name='slow', timeout=0.05),
+                ],
+                candidate_k=2,
+            )
+            settings = local_milvus_settings(directory, top_k=3, federation=federation)
+            embed_service = FakeEmbedService()
+            service = LocalIndexService.model_construct(settings=settings, embed_service=embed_service)
+            vectors = np.array([[1.0, 0.0], [0.0, 1.0]], dtype=np.float32)
+            for name in ['docs', 'faq', 'slow']:
+                asyncio.run(
+                    service.member(name).upsert(
+                        vectors,
+                        [{'id': f'{name}-{i}', 'text': f'{name} {i}'} for i in range(2)],
+                    ),
+                )
+
+            retrieve = LocalIndexService.retrieve
+
+            async def slow_retrieve(self, queries, vectors, filters=None):
+                if self.settings.collection_name == 'slow':
+                    await asyncio.sleep(1)
+                return await retrieve(self, queries, vectors, filters)
+
+            with mock.patch.object(LocalIndexService, 'retrieve', slow_retrieve):
+                output = asyncio.run(service.process(MilvusInput(query='q')))
+
+            self.assertEqual(len(embed_service.calls), 1)
+            hits = output.hits[0]
+            self.assertEqual([h.id for h in hits], ['docs-0', 'faq-0', 'docs-1'])
+            self.assertEqual([h.collection for h in hits], ['docs', 'faq', 'docs'])
+            self.assertAlmostEqual(hits[1].score, 0.9)
+
+            hydrated = asyncio.run(service.hydrate([[h.model_copy(update={'content': ''}) for h in hits]]))
+            self.assertEqual([h.content for h in hydrated[0]], ['docs 0', 'faq 0', 'docs 1'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import unittest
+from unittest import mock
+
+import httpx
+import numpy as np
+import orjson
+from infra.embed import EmbedInput
+from infra.embed import EmbedService
+from infra.milvus import LocalIndexService
+from infra.milvus import MilvusInput
+from infra.milvus import MilvusService
+from shared.settings import EmbedSettings
+from tests.helpers import FakeEmbedService
+from tests.helpers import local_milvus_settings
+from tests.helpers import milvus_settings
+
+
+class TestFloat16Vectors(unittest.TestCase):
+    def test_embeddings_are_decoded_to_the_configured_precision(self):
+        body = orjson.dumps({'info': {'data': [{'embedding': [0.1, 0.2]}, {'embedding': [0.3, 0.4]}]}})
+        response = httpx.Response(200, content=body)
+        service = EmbedService(settings=EmbedSettings(url='http://embed.test/embed', dtype='float16'))
+        with mock.patch('httpx.AsyncClient.post', new=mock.AsyncMock(return_value=response)):
+            output = asyncio.run(service.process(EmbedInput(query=['a', 'b'])))
+        self.assertEqual([embedding.dtype for embedding in output.embeddings], [np.float16, np.float16])
+        np.testing.assert_allclose(output.embeddings[1], [0.3, 0.4], rtol=1e-3)
+
+    def test_vectors_are_encoded_for_the_vector_field(self):
+        half = MilvusService.model_construct(settings=milvus_settings(vector_dtype='float16'))
+        encoded = half._encode_vector([0.5, 0.25])
+        self.assertEqual(encoded.dtype, np.float16)
+        self.assertEqual(encoded.tobytes(), np.array([0.5, 0.25], dtype=np.float16).tobytes())
+
+        full = MilvusService.model_construct(settings=milvus_settings())
+        self.assertEqual(full._encode_vector(np.array([0.5, 0.25])), [0.5, 0.25])
+
+    def test_local_index_accepts_float16_embeddings(self):
+        with tempfile.TemporaryDirectory() as directory:
+            settings = local_milvus_settings(directory, top_k=1)
+            embed_service = FakeEmbedService(dtype=np.float16)
+            service = LocalIndexService.model_construct(settings=settings, embed_service=embed_service)
+            vectors = np.array([[0.0, 1.0], [1.0, 0.1]], dtype=np.float16)
+            asyncio.run(service.upsert(vectors, [{'id': 'a', 'text': 'a'}, {'id': 'b', 'text': 'b'}]))
+
+            output = asyncio.run(service.process(MilvusInput(query='q')))
+            self.assertEqual([hit.id for hit in output.hits[0]], ['b'])
+
+
+if __name__ == '__main__':
+    unittest.main()
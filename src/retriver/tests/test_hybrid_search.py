@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import unittest
+
+import numpy as np
+from infra.milvus import LocalIndexService
+from infra.milvus import LocalVectorIndex
+from infra.milvus import MilvusHit
+from infra.milvus import MilvusInput
+from infra.milvus.fusion import reciprocal_rank_fusion
+from shared.settings import HybridSearchSettings
+from tests.helpers import FakeEmbedService
+from tests.helpers import local_milvus_settings
+
+
+def hit(key: str, score: float) -> MilvusHit:
+    return MilvusHit(id=key, score=score, content=key)
+
+
+class TestReciprocalRankFusion(unittest.TestCase):
+    def test_weights_and_agreement_decide_the_order(self):
+        fused = reciprocal_rank_fusion(
+            {'dense': [hit('a', 0.9), hit('b', 0.8)], 'sparse': [hit('b', 7.0), hit('c', 5.0)]},
+            {'dense': 1.0, 'sparse': 1.0},
+            k=60,
+            limit=3,
+        )
+        self.assertEqual([h.id for h in fused], ['b', 'a', 'c'])
+        self.assertEqual(fused[0].scores, {'dense': 0.8, 'sparse': 7.0})
+        self.assertAlmostEqual(fused[0].score, 1 / 62 + 1 / 61)
+
+        fused = reciprocal_rank_fusion(
+            {'dense': [hit('a', 0.9)], 'sparse': [hit('c', 5.0)]},
+            {'dense': 0.5, 'sparse': 1.0},
+            k=60,
+            limit=1,
+        )
+        self.assertEqual([h.id for h in fused], ['c'])
+
+
+class TestLocalHybridSearch(unittest.TestCase):
+    def test_bm25_finds_exact_terms_and_survives_reopen(self):
+        with tempfile.TemporaryDirectory() as directory:
+            settings = local_milvus_settings(
+                directory,
+                collection_name='hybrid',
+                top_k=2,
+                hybrid=HybridSearchSettings(enabled=True, candidate_k=1),
+            )
+            # Every query lands on the first document, whatever its text
+            service = LocalIndexService.model_construct(settings=settings, embed_service=FakeEmbedService())
+            texts = ['general overview of the system', 'error code E-4021 means disk full', 'unrelated']
+            vectors = np.array([[1.0, 0.0], [-1.0, 0.0], [0.6, 0.8]], dtype=np.float32)
+            asyncio.run(service.upsert(vectors, [{'id': str(i), 'text': text} for i, text in enumerate(texts)]))
+
+            output = asyncio.run(service.process(MilvusInput(query='What is E-4021?')))
+            # Dense alone ranks the error code document last
+            self.assertEqual([h.id for h in output.hits[0]], ['0', '1'])
+            self.assertEqual(set(output.hits[0][1].scores), {'sparse'})
+
+            reopened = LocalVectorIndex(f'{directory}/hybrid', settings.local)
+            self.assertEqual(reopened.lexical.search(['disk E-4021'], 3, 1.2, 0.75)[0][0][0], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,113 @@
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from domain.processor.chunking import ChunkingOutput
+from infra.milvus import LocalIndexService
+from infra.milvus import MilvusFilter
+from infra.milvus import MilvusInput
+from infra.milvus import MilvusService
+from shared.settings import IngestSettings
+from tests.helpers import FakeEmbedService
+from tests.helpers import local_milvus_settings
+from tests.helpers import milvus_settings
+from tools.ingest import IngestInput
+from tools.ingest import IngestionPipeline
+
+
+class ParagraphChunkingService:
+    async def process(self, inputs):
+        return ChunkingOutput(chunks=inputs.context.split('\n\n'))
+
+
+def pipeline(directory: str, partition_key_field=None) -> IngestionPipeline:
+    embed_service = FakeEmbedService(lambda text: [float(len(text)), 1.0])
+    store = LocalIndexService.model_construct(
+        settings=local_milvus_settings(
+            f'{directory}/index',
+            collection_name='ingest',
+            output_field=['text', 'source'],
+            partition_key_field=partition_key_field,
+        ),
+        embed_service=embed_service,
+    )
+    return IngestionPipeline.model_construct(
+        settings=IngestSettings(parse_workers=1, file_batch_size=1, checkpoint_path=f'{directory}/checkpoint.json'),
+        store=store,
+        chunking_service=ParagraphChunkingService(),
+        embed_service=embed_service,
+    )
+
+
+class TestIngestionPipeline(unittest.TestCase):
+    def test_directory_is_ingested_deduplicated_and_resumed(self):
+        with tempfile.TemporaryDirectory() as directory:
+            docs = Path(directory) / 'docs'
+            (docs / 'guides').mkdir(parents=True)
+            (docs / 'a.md').write_text('# Setup\n\nShared paragraph\n\nAlpha')
+            (docs / 'guides' / 'b.txt').write_text('Shared   paragraph\n\nBeta')
+            (docs / 'image.png').write_bytes(b'\x89PNG')
+            ingest = pipeline(directory)
+
+            report = asyncio.run(ingest.process(IngestInput(directory=str(docs))))
+            self.assertEqual(report.files_found, 2)
+            self.assertEqual(report.files_ingested, 2)
+            self.assertEqual(report.chunks, 5)
+            self.assertEqual(report.duplicate_chunks, 1)
+            self.assertEqual(report.upserted, 4)
+            self.assertEqual(
+                sorted(entity['text'] for entity in ingest.store.index.entities),
+                ['Alpha', 'Beta', 'Setup', 'Shared paragraph'],
+            )
+
+            report = asyncio.run(ingest.process(IngestInput(directory=str(docs))))
+            self.assertEqual(report.files_skipped, 2)
+            self.assertEqual(report.upserted, 0)
+
+            (docs / 'guides' / 'b.txt').write_text('Shared paragraph\n\nBeta\n\nGamma')
+            report = asyncio.run(ingest.process(IngestInput(directory=str(docs))))
+            self.assertEqual(report.files_skipped, 1)
+            self.assertEqual(report.existing_chunks, 2)
+            self.assertEqual(report.upserted, 1)
+
+    def test_same_text_is_stored_in_each_partition(self):
+        with tempfile.TemporaryDirectory() as directory:
+            docs = Path(directory) / 'docs'
+            docs.mkdir()
+            (docs / 'faq.md').write_text('Refunds take five days')
+            ingest = pipeline(directory, partition_key_field='tenant')
+
+            for tenant in ['acme', 'globex']:
+                report = asyncio.run(
+                    ingest.process(IngestInput(directory=str(docs), partition=tenant, resume=False)),
+                )
+                self.assertEqual(report.upserted, 1)
+                self.assertEqual(report.existing_chunks, 0)
+
+            for tenant in ['acme', 'globex']:
+                output = asyncio.run(
+                    ingest.store.process(
+                        MilvusInput(query='refunds', filters=[MilvusFilter(field='tenant', value=tenant)]),
+                    ),
+                )
+                self.assertEqual([hit.content for hit in output.hits[0]], ['Refunds take five days'])
+
+    def test_nothing_is_stored_before_the_collection_exists(self):
+        client = mock.MagicMock()
+        client.has_collection.return_value = False
+        store = MilvusService.model_construct(
+            settings=milvus_settings(collection_name='fresh'),
+            embed_service=FakeEmbedService(),
+        )
+        driver = mock.PropertyMock(return_value=mock.MagicMock(driver=client, pool=None))
+        with mock.patch.object(MilvusService, '_driver', driver):
+            self.assertEqual(asyncio.run(store.existing_ids(['a', 'b'])), set())
+        client.query.assert_not_called()
+
+
+if __name__ == '__main__':
+    unittest.main()
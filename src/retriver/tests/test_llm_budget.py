@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import unittest
+
+from infra.llm import CompletionMessage
+from infra.llm import MessageRole
+from infra.llm import PromptSection
+from infra.llm import SectionedMessage
+from infra.llm.budget import PromptBudgeter
+from infra.llm.budget import TokenCounter
+from shared.settings import LLMSettings
+
+
+class TestPromptBudgeter(unittest.TestCase):
+    def make_budgeter(self, prompt_budget: int) -> PromptBudgeter:
+        settings = LLMSettings(
+            url='http://llm.local/v1/chat/completions',
+            model='test',
+            prompt_budget=prompt_budget,
+        )
+        return PromptBudgeter(settings, TokenCounter(None, chars_per_token=1.0))
+
+    def make_messages(self) -> list[CompletionMessage]:
+        return [
+            CompletionMessage(role=MessageRole.SYSTEM, content='s' * 10),
+            SectionedMessage(
+                role=MessageRole.USER,
+                template='{query}|{low}|{high}',
+                sections={
+                    'query': PromptSection(text='q' * 10, truncatable=False),
+                    'low': PromptSection(text='l' * 100),
+                    'high': PromptSection(text='h' * 100, priority=10),
+                },
+            ),
+        ]
+
+    def test_prompt_within_budget_is_unchanged(self):
+        messages, report = self.make_budgeter(1000).fit(self.make_messages())
+        self.assertEqual(report.tokens_saved, 0)
+        self.assertEqual(messages[1].content, 'q' * 10 + '|' + 'l' * 100 + '|' + 'h' * 100)
+        self.assertNotIsInstance(messages[1], SectionedMessage)
+
+    def test_lowest_priority_section_is_truncated_first(self):
+        messages, report = self.make_budgeter(200).fit(self.make_messages())
+        self.assertLessEqual(report.prompt_tokens, 200)
+        self.assertEqual(report.truncated, ['low'])
+        self.assertIn('h' * 100, messages[1].content)
+        self.assertIn('[truncated]', messages[1].content)
+
+    def test_sections_are_dropped_when_needed(self):
+        messages, report = self.make_budgeter(100).fit(self.make_messages())
+        self.assertLessEqual(report.prompt_tokens, 100)
+        self.assertEqual(report.dropped, ['low'])
+        self.assertEqual(report.truncated, ['high'])
+        self.assertTrue(messages[1].content.startswith('q' * 10 + '||h'))
+        self.assertEqual(report.tokens_saved, report.original_tokens - report.prompt_tokens)
+
+
+if __name__ == '__main__':
+    unittest.main()
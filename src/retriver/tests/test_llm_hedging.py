@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import asyncio
+import unittest
+from typing import Any
+
+from infra.llm import LLMService
+from infra.llm.hedging import HedgePolicy
+from infra.llm.hedging import percentile
+from shared.settings import LLMHedgingSettings
+from shared.settings import LLMSettings
+
+
+class SlowPrimaryLLMService(LLMService):
+    """LLMService whose primary endpoint is slow and secondary endpoint is fast."""
+
+    cancelled: list[str] = []
+
+    async def _send(self, body: dict[str, Any], url: str) -> dict[str, Any]:
+        try:
+            await asyncio.sleep(1.0 if 'primary' in url else 0.01)
+        except asyncio.CancelledError:
+            self.cancelled.append(url)
+            raise
+        return {'url': url}
+
+
+class TestHedgePolicy(unittest.TestCase):
+    def test_percentile(self):
+        samples = [float(i) for i in range(1, 101)]
+        self.assertEqual(percentile(samples, 0.95), 95.0)
+        self.assertEqual(percentile(samples, 0.99), 99.0)
+        self.assertIsNone(percentile([], 0.99))
+
+    def test_budget(self):
+        policy = HedgePolicy(
+            LLMHedgingSettings(max_hedge_ratio=0.5, max_hedge_burst=1, control_ratio=0.0),
+        )
+        policy.start_request()
+        self.assertTrue(policy.try_hedge())
+        self.assertFalse(policy.try_hedge())
+        policy.start_request()
+        policy.start_request()
+        self.assertTrue(policy.try_hedge())
+        self.assertEqual(policy.stats()['budget_denied'], 1)
+
+
+class TestHedgedRequest(unittest.TestCase):
+    def test_hedge_wins_and_primary_is_cancelled(self):
+        service = SlowPrimaryLLMService(
+            settings=LLMSettings(
+                url='http://primary.local/v1/chat/completions',
+                model='test',
+                hedging=LLMHedgingSettings(
+                    enabled=True,
+                    secondary_url='http://secondary.local/v1/chat/completions',
+                    min_samples=1,
+                    min_delay=0.01,
+                    control_ratio=0.0,
+                ),
+            ),
+        )
+        service.hedge_policy.record_call(0.02)
+
+        data = asyncio.run(service._send_hedged({}))
+
+        self.assertIn('secondary', data['url'])
+        self.assertEqual(len(service.cancelled), 1)
+        self.assertIn('primary', service.cancelled[0])
+        stats = service.hedge_policy.stats()
+        self.assertEqual(stats['hedged'], 1)
+        self.assertEqual(stats['hedge_wins'], 1)
+
+    def test_cancelled_caller_cancels_the_primary(self):
+        service = SlowPrimaryLLMService(
+            settings=LLMSettings(
+                url='http://primary.local/v1/chat/completions',
+                model='test',
+                hedging=LLMHedgingSettings(enabled=True, min_samples=1, min_delay=0.5, control_ratio=0.0),
+            ),
+        )
+        service.hedge_policy.record_call(0.5)
+
+        async def run():
+            caller = asyncio.create_task(service._send_hedged({}))
+            await asyncio.sleep(0.05)
+            caller.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await caller
+            await asyncio.sleep(0)
+            return list(service.cancelled)
+
+        self.assertEqual(asyncio.run(run()), ['http://primary.local/v1/chat/completions'])
+
+
+if __name__ == '__main__':
+    unittest.main()
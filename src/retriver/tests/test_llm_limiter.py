@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import asyncio
+import unittest
+from typing import Any
+
+from infra.llm import LLMCircuitOpenError
+from infra.llm import LLMOverloadError
+from infra.llm import LLMRequestError
+from infra.llm import LLMService
+from infra.llm.limiter import AdaptiveConcurrencyLimiter
+from infra.llm.limiter import CircuitBreaker
+from infra.llm.limiter import CircuitState
+from infra.llm.limiter import LimiterOutcome
+from infra.llm.service import parse_retry_after
+from shared.settings import LLMResilienceSettings
+from shared.settings import LLMSettings
+
+
+class TestAdaptiveConcurrencyLimiter(unittest.TestCase):
+    def test_aimd(self):
+        async def run():
+            limiter = AdaptiveConcurrencyLimiter(
+                LLMResilienceSettings(initial_limit=4, min_limit=1, max_limit=8),
+            )
+            for _ in range(8):
+                await limiter.acquire()
+                await limiter.release(LimiterOutcome.SUCCESS)
+            grown = limiter.limit
+
+            await limiter.acquire()
+            await limiter.release(LimiterOutcome.OVERLOAD)
+            return grown, limiter.limit
+
+        grown, shrunk = asyncio.run(run())
+        self.assertGreater(grown, 4)
+        self.assertEqual(shrunk, grown // 2)
+
+    def test_rejects_when_queue_full(self):
+        async def run():
+            limiter = AdaptiveConcurrencyLimiter(
+                LLMResilienceSettings(initial_limit=1, max_queue=0),
+            )
+            await limiter.acquire()
+            with self.assertRaises(LLMOverloadError):
+                await limiter.acquire()
+            return limiter.stats()
+
+        stats = asyncio.run(run())
+        self.assertEqual(stats['rejected'], 1)
+        self.assertEqual(stats['in_flight'], 1)
+
+    def test_queued_call_gets_released_slot(self):
+        async def run():
+            limiter = AdaptiveConcurrencyLimiter(LLMResilienceSettings(initial_limit=1))
+            await limiter.acquire()
+            waiter = asyncio.create_task(limiter.acquire())
+            await asyncio.sleep(0)
+            self.assertFalse(waiter.done())
+            await limiter.release(LimiterOutcome.IGNORE)
+            await asyncio.wait_for(waiter, timeout=1)
+            return limiter.in_flight
+
+        self.assertEqual(asyncio.run(run()), 1)
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    def test_opens_and_recovers(self):
+        breaker = CircuitBreaker(
+            LLMResilienceSettings(failure_threshold=2, reset_timeout=0.0),
+        )
+        breaker.record_failure()
+        breaker.record_failure()
+        self.assertEqual(breaker.state, CircuitState.OPEN)
+
+        breaker.before_call()
+        self.assertEqual(breaker.state, CircuitState.HALF_OPEN)
+        with self.assertRaises(LLMCircuitOpenError):
+            breaker.before_call()
+
+        breaker.record_success()
+        self.assertEqual(breaker.state, CircuitState.CLOSED)
+
+    def test_fails_fast_while_open(self):
+        breaker = CircuitBreaker(
+            LLMResilienceSettings(failure_threshold=1, reset_timeout=60.0),
+        )
+        breaker.record_failure()
+        with self.assertRaises(LLMCircuitOpenError):
+            breaker.before_call()
+        self.assertEqual(breaker.stats()['short_circuited'], 1)
+
+
+class EchoLLMService(LLMService):
+    async def _send(self, body: dict[str, Any], url: str) -> dict[str, Any]:
+        return {'url': url}
+
+
+class TestOpenCircuitFailover(unittest.TestCase):
+    def test_open_circuit_endpoints_are_not_picked(self):
+        urls = ['http://tripped.local/v1/chat/completions', 'http://healthy.local/v1/chat/completions']
+        service = EchoLLMService(
+            settings=LLMSettings(
+                urls=urls,
+                model='test',
+                resilience=LLMResilienceSettings(failure_threshold=1, reset_timeout=60.0),
+            ),
+        )
+        service.guard(urls[0]).breaker.record_failure()
+
+        for _ in range(5):
+            self.assertEqual(asyncio.run(service._send_hedged({}))['url'], urls[1])
+
+    def test_rejections_are_retryable(self):
+        for error in [LLMOverloadError('full'), LLMCircuitOpenError('open')]:
+            self.assertIsInstance(error, LLMRequestError)
+            self.assertTrue(error.retryable)
+
+
+class TestRetryAfter(unittest.TestCase):
+    def test_parse(self):
+        self.assertEqual(parse_retry_after('3'), 3.0)
+        self.assertEqual(parse_retry_after('Wed, 21 Oct 2015 07:28:00 GMT'), 0.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after('soon'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import asyncio
+import unittest
+
+from infra.llm.scheduler import LLMScheduler
+from infra.llm.scheduler import request_scope
+from shared.settings import LLMSchedulerSettings
+
+
+class TestLLMScheduler(unittest.TestCase):
+    def make_scheduler(self, max_concurrency: int) -> LLMScheduler:
+        # Bypass the singleton so every test gets a fresh scheduler
+        scheduler = object.__new__(LLMScheduler)
+        scheduler.__init__(
+            LLMSchedulerSettings(enabled=True, max_concurrency=max_concurrency, aging_rate=0.0),
+        )
+        return scheduler
+
+    def test_higher_priority_stage_is_dispatched_first(self):
+        scheduler = self.make_scheduler(max_concurrency=1)
+        order: list[str] = []
+
+        async def call(stage: str):
+            async with scheduler.slot(stage):
+                order.append(stage)
+                await asyncio.sleep(0)
+
+        async def main():
+            blocker = await scheduler.acquire('default')
+            tasks = [
+                asyncio.create_task(call(stage))
+                for stage in ('get_fact', 'planning', 'answer_generator')
+            ]
+            await asyncio.sleep(0)
+            scheduler.release(blocker)
+            await asyncio.gather(*tasks)
+
+        asyncio.run(main())
+        self.assertEqual(order, ['answer_generator', 'planning', 'get_fact'])
+
+    def test_fair_share_between_requests(self):
+        scheduler = self.make_scheduler(max_concurrency=2)
+        granted: list[str] = []
+
+        async def call(request_id: str):
+            with request_scope(request_id):
+                ticket = await scheduler.acquire('default')
+            granted.append(request_id)
+            return ticket
+
+        async def main():
+            first = [asyncio.create_task(call('a')) for _ in range(2)]
+            await asyncio.sleep(0)
+            waiting = [asyncio.create_task(call('a')), asyncio.create_task(call('b'))]
+            await asyncio.sleep(0)
+            scheduler.release(await first[0])
+            await asyncio.sleep(0)
+            self.assertEqual(granted[-1], 'b')
+            for task in waiting:
+                if task.done():
+                    scheduler.release(task.result())
+                else:
+                    task.cancel()
+
+        asyncio.run(main())
+        stats = scheduler.stats()
+        self.assertEqual(stats['stages']['default']['dispatched'], 3)
+        self.assertEqual(stats['waiting'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+import asyncio
+import unittest
+
+from infra.llm import LLMService
+from infra.llm import LLMStage
+from infra.llm.service import LLMInput
+from infra.llm.service import LLMOutput
+from pydantic import ValidationError
+from shared.settings import LLMSettings
+
+
+class ModelEchoLLMService(LLMService):
+    """LLMService answering with its model name: the small model's answer does not parse."""
+
+    async def process(self, input):
+        response = '{"ok": true}' if self.settings.model == 'large' else 'not json'
+        return LLMOutput(
+            response=response,
+            metadata={'prompt_tokens': '10', 'completion_tokens': '5', 'total_tokens': '15'},
+        )
+
+
+def settings(**stages) -> LLMSettings:
+    return LLMSettings(url='http://default.local/v1/chat/completions', model='large', stages=stages)
+
+
+class TestStageSettings(unittest.TestCase):
+    def test_stage_overrides_apply_to_their_stage_only(self):
+        llm = settings(
+            tool_decision={'model': 'small', 'url': 'http://small.local/v1/chat/completions'},
+        )
+        tool_decision = llm.for_stage(LLMStage.TOOL_DECISION)
+        self.assertEqual(tool_decision.model, 'small')
+        self.assertEqual(tool_decision.endpoints, ['http://small.local/v1/chat/completions'])
+        self.assertEqual(tool_decision.max_completion_tokens, llm.max_completion_tokens)
+        self.assertIs(llm.for_stage('planning'), llm)
+
+    def test_unknown_stage_names_are_rejected(self):
+        with self.assertRaises(ValidationError):
+            settings(tool_decison={'model': 'small'})
+
+    def test_unparsable_response_escalates_to_the_default_model(self):
+        service = ModelEchoLLMService.for_stage(
+            settings(tool_decision={'model': 'small', 'escalate': True}),
+            LLMStage.TOOL_DECISION,
+        )
+        self.assertEqual(service.settings.model, 'small')
+        self.assertEqual(service.escalation.settings.model, 'large')
+
+        output = asyncio.run(
+            service.process_with_escalation(LLMInput(messages=[]), lambda response: response.startswith('{')),
+        )
+        self.assertEqual(output.response, '{"ok": true}')
+        self.assertEqual(output.metadata['escalated'], 'true')
+        self.assertEqual(output.metadata['total_tokens'], '30')
+
+    def test_stages_without_escalate_keep_their_response(self):
+        service = ModelEchoLLMService.for_stage(settings(planning={'model': 'small'}), 'planning')
+        self.assertIsNone(service.escalation)
+        output = asyncio.run(service.process_with_escalation(LLMInput(messages=[]), lambda response: False))
+        self.assertEqual(output.response, 'not json')
+
+
+if __name__ == '__main__':
+    unittest.main()
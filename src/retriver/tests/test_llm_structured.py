@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import asyncio
+import unittest
+from typing import Optional
+
+from domain.processor.planning.service import Plan
+from infra.llm import LLMInput
+from infra.llm import LLMOutput
+from infra.llm import LLMService
+from infra.llm import LLMStructuredOutputError
+from infra.llm import StructuredOutput
+from infra.llm.structured import extract_json
+from infra.llm.structured import response_format
+from infra.llm.structured import structured_output_for
+from shared.settings import LLMSettings
+
+PLAN = '[{"step": "step1", "question": "q", "agent": "answer-generator"}]'
+
+
+class ScriptedLLMService(LLMService):
+    """LLMService returning canned responses and recording the response formats sent."""
+
+    responses: list[str] = []
+    formats: list[Optional[StructuredOutput]] = []
+
+    async def process(
+        self,
+        input: LLMInput,
+        structured_output: Optional[StructuredOutput] = None,
+    ) -> LLMOutput:
+        self.formats.append(structured_output)
+        return LLMOutput(
+            response=self.responses.pop(0),
+            metadata={'prompt_tokens': '10', 'completion_tokens': '5', 'total_tokens': '15'},
+        )
+
+
+def make_service(*responses: str) -> ScriptedLLMService:
+    return ScriptedLLMService(
+        settings=LLMSettings(url='http://llm.local/v1/chat/completions', model='test'),
+        responses=list(responses),
+        formats=[],
+    )
+
+
+class TestStructuredParsing(unittest.TestCase):
+    def test_extract_json(self):
+        self.assertEqual(extract_json('```json\n{"a": 1}\n```'), '{"a": 1}')
+        self.assertEqual(extract_json('Plan:\n[1, 2]\n<end>'), '[1, 2]')
+
+    def test_response_format(self):
+        body = response_format(structured_output_for(Plan))
+        self.assertEqual(body['type'], 'json_schema')
+        self.assertEqual(body['json_schema']['name'], 'Plan')
+        self.assertIn('steps', body['json_schema']['schema']['properties'])
+
+
+class TestProcessStructured(unittest.TestCase):
+    def test_valid_response(self):
+        service = make_service(PLAN)
+        output = asyncio.run(service.process_structured(LLMInput(messages=[]), Plan))
+        self.assertEqual(output.result.steps[0].agent, 'answer-generator')
+        self.assertEqual(service.formats[0].name, 'Plan')
+        self.assertNotIn('repaired', output.metadata)
+
+    def test_repair(self):
+        service = make_service('[{"step": "step1"}]', PLAN)
+        output = asyncio.run(service.process_structured(LLMInput(messages=[]), Plan))
+        self.assertEqual(len(output.result.steps), 1)
+        self.assertEqual(output.metadata['repaired'], 'true')
+        self.assertEqual(output.metadata['total_tokens'], '30')
+
+    def test_repair_failure_raises(self):
+        service = make_service('not json', 'still not json')
+        with self.assertRaises(LLMStructuredOutputError):
+            asyncio.run(service.process_structured(LLMInput(messages=[]), Plan))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import unittest
+
+import numpy as np
+from infra.milvus import LocalIndexService
+from infra.milvus import LocalVectorIndex
+from shared.settings import LocalIndexSettings
+from shared.settings import VectorIndexSettings
+from tests.helpers import local_milvus_settings
+
+
+def brute_force(vectors: np.ndarray, queries: np.ndarray, k: int) -> list[list[int]]:
+    vectors = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+    queries = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+    return np.argsort(-(queries @ vectors.T), axis=1)[:, :k].tolist()
+
+
+class TestLocalVectorIndex(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        self.vectors = rng.standard_normal((500, 16)).astype(np.float32)
+        self.queries = rng.standard_normal((4, 16)).astype(np.float32)
+        self.entities = [{'text': f'doc {i}'} for i in range(len(self.vectors))]
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def test_exact_search_matches_brute_force(self):
+        index = LocalVectorIndex(self.tmp.name, LocalIndexSettings(block_rows=64))
+        index.add(self.vectors[:200], self.entities[:200])
+        index.add(self.vectors[200:], self.entities[200:])
+
+        results = index.search(self.queries, top_k=5)
+        self.assertEqual(
+            [[row for row, _ in hits] for hits in results],
+            brute_force(self.vectors, self.queries, 5),
+        )
+        scores = [score for _, score in results[0]]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_ivf_probing_every_list_is_exact_and_reopens(self):
+        settings = LocalIndexSettings(nlist=8, nprobe=8, kmeans_iterations=5)
+        index = LocalVectorIndex(self.tmp.name, settings)
+        index.add(self.vectors, self.entities)
+        expected = brute_force(self.vectors, self.queries, 3)
+        self.assertEqual([[row for row, _ in hits] for hits in index.search(self.queries, 3)], expected)
+
+        reopened = LocalVectorIndex(self.tmp.name, settings)
+        self.assertEqual(reopened.count, len(self.vectors))
+        self.assertEqual([[row for row, _ in hits] for hits in reopened.search(self.queries, 3)], expected)
+
+    def test_service_returns_milvus_shaped_hits(self):
+        settings = local_milvus_settings(self.tmp.name, top_k=2)
+        service = LocalIndexService.model_construct(settings=settings)
+        entities = [{'id': f'hash-{i}', **entity} for i, entity in enumerate(self.entities)]
+        self.assertEqual(asyncio.run(service.upsert(self.vectors, entities)), len(entities))
+        self.assertEqual(asyncio.run(service.upsert(self.vectors[:3], entities[:3])), 0)
+        self.assertEqual(asyncio.run(service.existing_ids(['hash-1', 'new'])), {'hash-1'})
+
+        hits = asyncio.run(service.execute_query(list(self.queries[:2]), None, ['text']))
+        self.assertEqual(len(hits), 2)
+        self.assertEqual(hits[0][0]['id'], f'hash-{hits[0][0]["entity"]["text"][4:]}')
+        self.assertEqual(service.to_hit(hits[0][0]).content, hits[0][0]['entity']['text'])
+
+    def test_service_builds_ivf_lists_once(self):
+        local = LocalIndexSettings(path=self.tmp.name, nlist=8, kmeans_iterations=2)
+        settings = local_milvus_settings(self.tmp.name, local=local)
+        service = LocalIndexService.model_construct(settings=settings)
+        asyncio.run(service.upsert(self.vectors, self.entities))
+        self.assertTrue(asyncio.run(service.build_index()))
+        self.assertFalse(asyncio.run(service.build_index()))
+        self.assertTrue(asyncio.run(service.build_index(rebuild=True)))
+        info = asyncio.run(service.describe_index())
+        self.assertEqual((info['index_type'], info['rows'], info['dim']), ('IVF_FLAT', 500, 16))
+
+    def test_index_settings_fill_default_build_params(self):
+        index = VectorIndexSettings(index_type='IVF_PQ', params={'m': 32})
+        self.assertEqual(index.build_params, {'nlist': 1024, 'm': 32, 'nbits': 8})
+        self.assertEqual(VectorIndexSettings().build_params, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
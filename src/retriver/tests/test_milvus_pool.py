@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import asyncio
+import unittest
+from unittest import mock
+
+from infra.milvus import MilvusConnectionPool
+from infra.milvus import MilvusPoolUnavailableError
+from shared.settings import MilvusPoolSettings
+
+
+class FakeClient:
+    def __init__(self, name: str):
+        self.name = name
+        self.broken = False
+        self.closed = False
+
+    async def search(self, **kwargs):
+        if self.broken:
+            raise ConnectionError(f'{self.name} is down')
+        await asyncio.sleep(0)
+        return self.name
+
+
+class TestMilvusConnectionPool(unittest.TestCase):
+    def setUp(self):
+        self.created: list[FakeClient] = []
+        self.refuse = False
+
+    def connect(self) -> FakeClient:
+        if self.refuse:
+            raise ConnectionError('refused')
+        client = FakeClient(f'client-{len(self.created)}')
+        self.created.append(client)
+        return client
+
+    async def probe(self, client: FakeClient) -> None:
+        if client.broken:
+            raise ConnectionError(f'{client.name} is down')
+
+    async def disconnect(self, client: FakeClient) -> None:
+        client.closed = True
+
+    def pool(self, size: int = 2) -> MilvusConnectionPool:
+        return MilvusConnectionPool(
+            MilvusPoolSettings(size=size, health_check_interval=3600.0, reconnect_backoff=1.0),
+            connect=self.connect,
+            probe=self.probe,
+            disconnect=self.disconnect,
+            is_connection_error=lambda error: isinstance(error, ConnectionError),
+        )
+
+    def test_least_outstanding_client_is_picked(self):
+        async def run():
+            pool = self.pool(size=3)
+            await pool.open()
+            pool.clients[0].outstanding = 2
+            pool.clients[1].outstanding = 1
+            pool.clients[2].outstanding = 1
+            picked = {pool.pick().slot for _ in range(50)}
+            await pool.close()
+            return picked
+
+        self.assertEqual(asyncio.run(run()), {1, 2})
+
+    def test_concurrent_opens_connect_once(self):
+        async def run():
+            pool = self.pool()
+            await asyncio.gather(pool.open(), pool.open(), pool.open())
+            tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+            await pool.close()
+            return tasks
+
+        self.assertEqual(len(asyncio.run(run())), 1)
+        self.assertEqual(len(self.created), 2)
+
+    def test_connection_error_retries_on_another_client(self):
+        async def run():
+            pool = self.pool()
+            await pool.open()
+            pool.clients[0].client.broken = True
+            pool.clients[1].outstanding = 1  # make the broken client the first pick
+            result = await pool.call('search')
+            stats = pool.stats()
+            await pool.close()
+            return result, stats
+
+        result, stats = asyncio.run(run())
+        self.assertEqual(result, 'client-1')
+        self.assertEqual(stats['healthy'], 1)
+        self.assertFalse(stats['clients'][0]['healthy'])
+        self.assertEqual(stats['clients'][0]['errors'], 1)
+
+    def test_reconnect_after_backoff(self):
+        async def run():
+            pool = self.pool(size=1)
+            await pool.open()
+            broken = pool.clients[0].client
+            broken.broken = True
+            await pool.check()
+            self.assertFalse(pool.clients[0].healthy)
+            with self.assertRaises(MilvusPoolUnavailableError):
+                await pool.call('search')
+
+            # Backoff not elapsed: no reconnect attempt
+            await pool.check()
+            self.assertEqual(len(self.created), 1)
+
+            pool.clients[0].retry_at = 0.0
+            await pool.check()
+            result = await pool.call('search')
+            stats = pool.stats()
+            await pool.close()
+            return broken, result, stats
+
+        broken, result, stats = asyncio.run(run())
+        self.assertTrue(broken.closed)
+        self.assertEqual(result, 'client-1')
+        self.assertEqual(stats['clients'][0]['reconnects'], 1)
+
+    def test_failed_reconnect_backs_off_exponentially(self):
+        async def run():
+            pool = self.pool(size=1)
+            self.refuse = True
+            await pool.open()
+            pooled = pool.clients[0]
+            first = pooled.retry_at
+            pooled.retry_at = 0.0
+            await pool.check()
+            await pool.close()
+            return pooled.failures, first, pooled.retry_at
+
+        with mock.patch('time.monotonic', return_value=100.0):
+            failures, first, second = asyncio.run(run())
+        self.assertEqual(failures, 2)
+        self.assertLessEqual(first, 100.0 + 1.2)
+        self.assertGreaterEqual(second, 100.0 + 1.6)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import unittest
+from unittest import mock
+
+import numpy as np
+from infra.milvus import MilvusService
+from tests.helpers import milvus_settings
+
+
+class FakeSyncClient:
+    """Synchronous client answering each query vector with hits naming it."""
+
+    def __init__(self):
+        self.requests = []
+        self.threads = []
+
+    def search(self, **kwargs):
+        self.requests.append(kwargs)
+        self.threads.append(threading.current_thread())
+        return [
+            [{'id': f'{i}-{rank}', 'distance': 1.0 - rank / 10, 'entity': {}} for rank in range(2)]
+            for i, _ in enumerate(kwargs['data'])
+        ]
+
+
+class FakePool:
+    def __init__(self, client: FakeSyncClient):
+        self.client = client
+        self.opened = False
+
+    async def open(self):
+        self.opened = True
+
+    async def call(self, method, **kwargs):
+        return getattr(self.client, method)(**kwargs)
+
+
+def milvus_service() -> MilvusService:
+    return MilvusService.model_construct(
+        settings=milvus_settings(top_k=2),
+        embed_service=None,
+    )
+
+
+class TestBatchedSearch(unittest.TestCase):
+    def search(self, pool):
+        client = FakeSyncClient()
+        driver = mock.MagicMock(driver=client, pool=pool(client) if pool else None)
+        vectors = [np.array([1.0, 0.0]), np.array([0.0, 1.0]), np.array([0.5, 0.5])]
+        with mock.patch.object(MilvusService, '_driver', mock.PropertyMock(return_value=driver)):
+            hits = asyncio.run(milvus_service().execute_query(vectors, {'params': {}}, ['text']))
+        return client, driver, hits
+
+    def test_one_request_for_all_vectors_through_the_pool(self):
+        client, driver, hits = self.search(FakePool)
+
+        self.assertTrue(driver.pool.opened)
+        self.assertEqual(len(client.requests), 1)
+        self.assertEqual(client.requests[0]['data'], [[1.0, 0.0], [0.0, 1.0], [0.5, 0.5]])
+        self.assertEqual(client.requests[0]['limit'], 2)
+        self.assertEqual(
+            [[hit['id'] for hit in query_hits] for query_hits in hits],
+            [['0-0', '0-1'], ['1-0', '1-1'], ['2-0', '2-1']],
+        )
+
+    def test_sync_client_runs_in_a_worker_thread_without_a_pool(self):
+        client, _, hits = self.search(None)
+
+        self.assertEqual(len(client.requests), 1)
+        self.assertIsNot(client.threads[0], threading.main_thread())
+        self.assertEqual([query_hits[0]['id'] for query_hits in hits], ['0-0', '1-0', '2-0'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+from __future__ import annotations
+
+import asyncio
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+from domain.processor.rerank.batcher import RerankBatcher
+
+
+class RecordingModel:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.batches: list[int] = []
+
+    def predict(self, pairs):
+        self.batches.append(len(pairs))
+        time.sleep(self.delay)  # blocking, like a cross-encoder forward pass
+        if any(not passage for _, passage in pairs):
+            raise ValueError('empty passage')
+        return np.array([float(len(passage)) for _, passage in pairs])
+
+
+class TestRerankBatcher(unittest.TestCase):
+    def setUp(self):
+        self.executor = ThreadPoolExecutor(max_workers=1)
+
+    def tearDown(self):
+        self.executor.shutdown()
+
+    def test_concurrent_requests_share_one_call(self):
+        model = RecordingModel()
+        batcher = RerankBatcher(model.predict, self.executor, max_batch_pairs=64, max_wait=0.01)
+
+        async def run():
+            return await asyncio.gather(
+                batcher.score([['q1', 'a'], ['q1', 'bb']]),
+                batcher.score([['q2', 'ccc']]),
+                batcher.score([]),
+            )
+
+        first, second, empty = asyncio.run(run())
+        self.assertEqual(model.batches, [3])
+        self.assertEqual(first.tolist(), [1.0, 2.0])
+        self.assertEqual(second.tolist(), [3.0])
+        self.assertEqual(len(empty), 0)
+        self.assertEqual(batcher.stats()['mean_requests_per_batch'], 2)
+
+    def test_batches_are_capped_and_the_loop_stays_responsive(self):
+        model = RecordingModel(delay=0.05)
+        batcher = RerankBatcher(model.predict, self.executor, max_batch_pairs=3, max_wait=0.0)
+
+        async def run():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.005)
+                    ticks += 1
+
+            task = asyncio.create_task(ticker())
+            results = await asyncio.gather(*(batcher.score([['q', 'x' * i]] * 2) for i in range(1, 4)))
+            task.cancel()
+            return results, ticks
+
+        results, ticks = asyncio.run(run())
+        self.assertEqual(model.batches, [2, 2, 2])
+        self.assertEqual([result.tolist() for result in results], [[1.0, 1.0], [2.0, 2.0], [3.0, 3.0]])
+        self.assertGreater(ticks, 10)
+
+    def test_failed_batch_is_retried_per_request(self):
+        model = RecordingModel()
+        batcher = RerankBatcher(model.predict, self.executor, max_batch_pairs=64, max_wait=0.01)
+
+        async def run():
+            return await asyncio.gather(
+                batcher.score([['q1', 'a']]),
+                batcher.score([['q2', '']]),
+                batcher.score([['q3', 'ccc']]),
+                return_exceptions=True,
+            )
+
+        first, second, third = asyncio.run(run())
+        self.assertEqual(model.batches, [3, 1, 1, 1])
+        self.assertEqual(first.tolist(), [1.0])
+        self.assertIsInstance(second, ValueError)
+        self.assertEqual(third.tolist(), [3.0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+from infra.milvus import LocalIndexService
+from infra.milvus import MilvusInput
+from infra.milvus import SearchCache
+from infra.milvus.cache import vector_key
+from shared.settings import SearchCacheSettings
+from tests.helpers import FakeEmbedService
+from tests.helpers import local_milvus_settings
+
+
+class TestSearchCache(unittest.TestCase):
+    def test_lru_ttl_and_version(self):
+        cache = SearchCache(SearchCacheSettings(max_entries=2, ttl=10.0))
+        cache.put('a', 1)
+        cache.put('b', 2)
+        self.assertEqual(cache.get('a'), 1)
+        cache.put('c', 3)
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.evictions, 1)
+
+        with mock.patch('time.monotonic', return_value=1e12):
+            self.assertIsNone(cache.get('a'))
+        self.assertEqual(cache.expired, 1)
+
+        cache.observe_version(1)
+        self.assertIsNone(cache.get('c'))
+        self.assertEqual(cache.stats()['invalidations'], 1)
+
+    def test_vector_key_tolerates_small_differences(self):
+        vector = np.array([0.6, 0.8, 0.0])
+        self.assertEqual(vector_key('s', vector, 0.05), vector_key('s', vector * 2 + 1e-4, 0.05))
+        self.assertNotEqual(vector_key('s', vector, 0.05), vector_key('s', vector[::-1], 0.05))
+
+
+class TestCachedSearch(unittest.TestCase):
+    def test_repeated_queries_skip_embedding_until_ingest(self):
+        with tempfile.TemporaryDirectory() as directory:
+            settings = local_milvus_settings(
+                directory,
+                collection_name='cached',
+                top_k=1,
+                cache=SearchCacheSettings(enabled=True, version_refresh_interval=0.0),
+            )
+            embed = FakeEmbedService(lambda query: [len(query), 1.0, 0.0])
+            service = LocalIndexService.model_construct(settings=settings, embed_service=embed)
+            vectors = np.eye(3, dtype=np.float32)
+            asyncio.run(service.upsert(vectors, [{'id': str(i), 'text': f'doc {i}'} for i in range(3)]))
+
+            first = asyncio.run(service.process(MilvusInput(query=['ab', 'abc'])))
+            second = asyncio.run(service.process(MilvusInput(query=['abc', 'xyz', 'ab'])))
+            self.assertEqual(embed.calls, [['ab', 'abc'], ['xyz']])
+            self.assertEqual(second.hits[0], first.hits[1])
+
+            asyncio.run(service.upsert(np.ones((1, 3)), [{'id': 'new', 'text': 'doc new'}]))
+            asyncio.run(service.process(MilvusInput(query=['ab'])))
+            self.assertEqual(embed.calls[-1], ['ab'])
+            self.assertEqual(service.cache.stats()['hits'], 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
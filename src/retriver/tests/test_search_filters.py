@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import unittest
+
+import numpy as np
+from infra.milvus import LocalIndexService
+from infra.milvus import MilvusFilter
+from infra.milvus.filters import compile_filters
+from infra.milvus.filters import match_filters
+from pydantic import ValidationError
+from shared.settings import LocalIndexSettings
+from tests.helpers import local_milvus_settings
+
+
+class TestFilterCompilation(unittest.TestCase):
+    def test_compiles_to_milvus_expression(self):
+        filters = [
+            MilvusFilter(field='tenant', value='acme "eu"'),
+            MilvusFilter(field='ingested_at', op='>=', value=1700000000),
+            MilvusFilter(field='source', op='in', value=['a.md', 'b.md']),
+            MilvusFilter(field='draft', op='!=', value=True),
+        ]
+        self.assertEqual(
+            compile_filters(filters),
+            'tenant == "acme \\"eu\\"" and ingested_at >= 1700000000 '
+            'and source in ["a.md", "b.md"] and draft != true',
+        )
+        self.assertEqual(compile_filters([]), '')
+
+    def test_rejects_unsafe_fields_and_values(self):
+        with self.assertRaises(ValidationError):
+            MilvusFilter(field='source or 1 == 1', value='x')
+        with self.assertRaises(ValidationError):
+            MilvusFilter(field='source', op='in', value='a.md')
+        with self.assertRaises(ValidationError):
+            MilvusFilter(field='source', value={'nested': 1})
+
+    def test_local_matching_follows_milvus_semantics(self):
+        entity = {'source': 'docs/guide.md', 'chunk_index': 3}
+        self.assertTrue(match_filters(entity, [MilvusFilter(field='source', op='like', value='docs/%.md')]))
+        self.assertFalse(match_filters(entity, [MilvusFilter(field='chunk_index', op='<', value=3)]))
+        self.assertFalse(match_filters(entity, [MilvusFilter(field='tenant', op='!=', value='acme')]))
+
+
+class TestLocalFilteredSearch(unittest.TestCase):
+    def test_only_matching_rows_are_searched(self):
+        with tempfile.TemporaryDirectory() as directory:
+            settings = local_milvus_settings(
+                directory,
+                collection_name='filtered',
+                top_k=2,
+                local=LocalIndexSettings(path=directory, nlist=2, kmeans_iterations=2),
+            )
+            service = LocalIndexService.model_construct(settings=settings)
+            rng = np.random.default_rng(0)
+            vectors = rng.standard_normal((40, 8)).astype(np.float32)
+            entities = [{'id': str(i), 'text': f'doc {i}', 'tenant': 'a' if i % 2 else 'b'} for i in range(40)]
+            asyncio.run(service.upsert(vectors, entities))
+
+            filters = [MilvusFilter(field='tenant', value='a')]
+            hits = asyncio.run(service.execute_query([vectors[0]], None, ['text', 'tenant'], filters=filters))
+            self.assertEqual(len(hits[0]), 2)
+            self.assertTrue(all(hit['entity']['tenant'] == 'a' for hit in hits[0]))
+
+            none = [MilvusFilter(field='tenant', value='c')]
+            self.assertEqual(asyncio.run(service.execute_query([vectors[0]], None, ['text'], filters=none)), [[]])
+
+
+if __name__ == '__main__':
+    unittest.main()
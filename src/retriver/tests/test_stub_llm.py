@@ -0,0 +1,84 @@
+from __future__ import annotations
+
+import json
+import unittest
+
+from fastapi.testclient import TestClient
+from tools.stub_llm import create_app
+from tools.stub_llm import LatencySettings
+from tools.stub_llm import StubLLMSettings
+
+
+def make_client(**overrides) -> TestClient:
+    settings = StubLLMSettings(
+        latency=LatencySettings(distribution='fixed', mean=0.0),
+        completion_tokens_per_second=1e6,
+        seed=0,
+        **overrides,
+    )
+    return TestClient(create_app(settings))
+
+
+def chat(client: TestClient, stage: str, content: str, **body) -> dict:
+    response = client.post(
+        '/v1/chat/completions',
+        headers={'X-LLM-Stage': stage},
+        json={'model': 'stub', 'messages': [{'role': 'user', 'content': content}], **body},
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+class TestStubLLM(unittest.TestCase):
+    def test_stage_responses(self):
+        client = make_client(tool='vector_db')
+
+        plan = json.loads(
+            chat(client, 'planning', '<query>\nWhat is "RAG"?\n</query>')['choices'][0]['message'][
+                'content'
+            ],
+        )
+        self.assertEqual(plan[0]['question'], 'What is "RAG"?')
+        self.assertEqual(plan[-1]['agent'], 'answer-generator')
+
+        tool = chat(client, 'tool_decision', 'anything')
+        self.assertEqual(tool['choices'][0]['message']['content'], 'vector_db')
+        self.assertGreater(tool['usage']['total_tokens'], 0)
+
+        validation = chat(client, 'output_validator', '<step_query>q</step_query>')
+        self.assertTrue(json.loads(validation['choices'][0]['message']['content'])['is_sufficient'])
+
+    def test_router_detected_from_schema(self):
+        client = make_client()
+        response = client.post(
+            '/chat/completions',
+            json={
+                'model': 'stub',
+                'messages': [{'role': 'user', 'content': 'What is RAG?'}],
+                'response_format': {'type': 'json_schema', 'json_schema': {'name': 'RouteDecision'}},
+            },
+        ).json()
+        self.assertEqual(
+            json.loads(response['choices'][0]['message']['content'])['service'],
+            'Retriever_service',
+        )
+
+    def test_streaming(self):
+        client = make_client(responses={'answer_generator': 'Hello world'})
+        with client.stream(
+            'POST',
+            '/v1/chat/completions',
+            headers={'X-LLM-Stage': 'answer_generator'},
+            json={'model': 'stub', 'messages': [], 'stream': True},
+        ) as response:
+            events = [line[len('data: '):] for line in response.iter_lines() if line]
+        self.assertEqual(events[-1], '[DONE]')
+        content = ''.join(
+            json.loads(event)['choices'][0]['delta'].get('content', '') for event in events[:-1]
+        )
+        self.assertEqual(content, 'Hello world')
+        self.assertEqual(client.get('/metrics').json()['in_flight'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
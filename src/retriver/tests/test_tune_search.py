@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import unittest
+
+import numpy as np
+from tools.tune_search import ground_truth
+from tools.tune_search import pareto_frontier
+from tools.tune_search import recommend
+from tools.tune_search import SweepPoint
+
+
+def point(nprobe: int, recall: float, p95: float) -> SweepPoint:
+    return SweepPoint(params={'nprobe': nprobe}, recall=recall, p50=p95 / 2, p95=p95)
+
+
+class TestTuneSearch(unittest.TestCase):
+    def test_frontier_drops_dominated_points_and_recommends_cheapest(self):
+        points = [point(1, 0.6, 1.0), point(4, 0.9, 2.0), point(8, 0.85, 3.0), point(16, 0.97, 4.0), point(32, 0.97, 6.0)]
+        frontier = pareto_frontier(points)
+        self.assertEqual([p.params['nprobe'] for p in frontier], [1, 4, 16])
+        self.assertEqual(recommend(frontier, 0.9).params, {'nprobe': 4})
+        self.assertEqual(recommend(frontier, 0.99).params, {'nprobe': 16})
+
+    def test_ground_truth_uses_ids_and_metric(self):
+        vectors = np.array([[1.0, 0.0], [0.0, 1.0], [3.0, 3.0]], dtype=np.float32)
+        queries = np.array([[0.9, 0.1]], dtype=np.float32)
+        self.assertEqual(ground_truth(vectors, ['a', 'b', 'c'], queries, 'COSINE', 2), [['a', 'c']])
+        self.assertEqual(ground_truth(vectors, ['a', 'b', 'c'], queries, 'L2', 2), [['a', 'b']])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import unittest
+
+import numpy as np
+from infra.milvus import LocalIndexService
+from infra.milvus import MilvusInput
+from shared.settings import TwoPhaseSettings
+from tests.helpers import FakeEmbedService
+from tests.helpers import local_milvus_settings
+
+
+class TestTwoPhaseRetrieval(unittest.TestCase):
+    def test_candidates_carry_previews_and_survivors_are_hydrated(self):
+        with tempfile.TemporaryDirectory() as directory:
+            settings = local_milvus_settings(
+                directory,
+                collection_name='two_phase',
+                output_field=['text', 'source'],
+                top_k=1,
+                two_phase=TwoPhaseSettings(enabled=True, fields=['source'], candidate_k=3),
+            )
+            service = LocalIndexService.model_construct(settings=settings, embed_service=FakeEmbedService())
+            texts = ['alpha ' * 100, 'beta ' * 100, 'gamma ' * 100]
+            entities = [
+                {'id': str(i), 'text': text, 'preview': text[:12], 'source': f'{i}.md'}
+                for i, text in enumerate(texts)
+            ]
+            vectors = np.array([[1.0, 0.1], [1.0, 0.5], [0.0, 1.0]], dtype=np.float32)
+            asyncio.run(service.upsert(vectors, entities))
+
+            candidates = asyncio.run(service.phase_one.process(MilvusInput(query='q')))
+            self.assertEqual([hit.id for hit in candidates.hits[0]], ['0', '1', '2'])
+            self.assertEqual(candidates.hits[0][1].content, 'beta beta be')
+            self.assertNotIn('text', candidates.hits[0][1].entity)
+
+            hydrated = asyncio.run(service.hydrate([candidates.hits[0][1:2]]))
+            self.assertEqual(hydrated[0][0].content, texts[1])
+            self.assertEqual(hydrated[0][0].entity['source'], '1.md')
+            self.assertEqual(hydrated[0][0].score, candidates.hits[0][1].score)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import asyncio
+import unittest
+
+from domain.processor.retrive import RetriveOutput
+from domain.processor.sub_agent import ToolOperationHandler
+from domain.processor.web_searching import SearchResult
+from domain.processor.web_searching import WebSearchingOutput
+from infra.milvus import MilvusHit
+from shared.settings import RetrieveSettings
+
+
+class FakeRetriveService:
+    def __init__(self, hits: list[MilvusHit], higher_is_better: bool = True):
+        self.hits = hits
+        self.higher_is_better = higher_is_better
+        self.inputs = []
+
+    async def process(self, inputs):
+        self.inputs.append(inputs)
+        return RetriveOutput(
+            context=[hit.content for hit in self.hits],
+            hits=[self.hits],
+            higher_is_better=self.higher_is_better,
+        )
+
+
+class FakeWebSearchService:
+    def __init__(self):
+        self.calls = 0
+
+    async def lookup_cache(self, query):
+        return None
+
+    async def process(self, inputs):
+        self.calls += 1
+        return WebSearchingOutput(
+            contexts=[SearchResult(title='web', url='https://example.com', chunks=['from the web'])],
+        )
+
+
+def handler(hits: list[MilvusHit], min_score=None, higher_is_better=True) -> ToolOperationHandler:
+    return ToolOperationHandler.model_construct(
+        settings=RetrieveSettings(max_tries=1, top_k=3, min_score=min_score),
+        web_search_service=FakeWebSearchService(),
+        retrive_service=FakeRetriveService(hits, higher_is_better),
+        rerank_service=None,
+    )
+
+
+class TestVectorDbTool(unittest.TestCase):
+    def test_hits_become_rerank_contexts(self):
+        hits = [
+            MilvusHit(id='1', score=0.8, content='chunk one', entity={'source': 'a.md'}),
+            MilvusHit(id='2', score=0.7, content='chunk one', entity={'source': 'a.md'}),
+            MilvusHit(id='3', score=0.02, content='chunk two', scores={'dense': 0.6, 'sparse': 3.1}),
+        ]
+        tool = handler(hits, min_score=0.5)
+        contexts, failed = asyncio.run(tool.process('vector_db', 'what is a?'))
+
+        self.assertFalse(failed)
+        self.assertEqual(tool.web_search_service.calls, 0)
+        self.assertEqual(tool.retrive_service.inputs[0].query, ['what is a?'])
+        self.assertEqual(
+            contexts,
+            [
+                {'title': 'a.md', 'url': '', 'chunks': ['chunk one'], 'score': 0.8},
+                {'title': '', 'url': '', 'chunks': ['chunk two'], 'score': 0.6},
+            ],
+        )
+
+    def test_empty_or_low_score_results_fall_back_to_web_search(self):
+        for hits in [[], [MilvusHit(id='1', score=0.2, content='weak')]]:
+            tool = handler(hits, min_score=0.5)
+            contexts, failed = asyncio.run(tool.process('vector_db', 'what is a?'))
+            self.assertFalse(failed)
+            self.assertEqual(tool.web_search_service.calls, 1)
+            self.assertEqual(contexts[0].chunks, ['from the web'])
+
+    def test_l2_distances_keep_the_closest_hit(self):
+        hits = [MilvusHit(id='1', score=0.3, content='close'), MilvusHit(id='2', score=2.5, content='far')]
+        output = RetriveOutput(context=[], hits=[hits], higher_is_better=False)
+        self.assertEqual(output.best_score, 0.3)
+
+        tool = handler(hits, min_score=0.5, higher_is_better=False)
+        contexts, failed = asyncio.run(tool.process('vector_db', 'what is a?'))
+        self.assertFalse(failed)
+        self.assertEqual(tool.web_search_service.calls, 0)
+        self.assertEqual([context['chunks'] for context in contexts], [['close'], ['far']])
+
+        tool = handler(hits, min_score=0.2, higher_is_better=False)
+        asyncio.run(tool.process('vector_db', 'what is a?'))
+        self.assertEqual(tool.web_search_service.calls, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
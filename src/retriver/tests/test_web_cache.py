@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from domain.processor.web_searching import SearchResult
+from domain.processor.web_searching import WebSearchService
+from domain.processor.web_searching.service import WebCacheRegistry
+from infra.milvus import LocalIndexService
+from shared.settings import WebCacheSettings
+from shared.settings import WebSearchSettings
+from tests.helpers import FakeEmbedService
+from tests.helpers import local_milvus_settings
+
+
+def web_search_service(directory: str) -> WebSearchService:
+    cache_service = LocalIndexService.model_construct(
+        settings=local_milvus_settings(
+            directory,
+            collection_name='web_cache',
+            output_field=['text', 'title', 'url', 'fetched_at'],
+        ),
+        # Texts about rust point one way, everything else the other
+        embed_service=FakeEmbedService(lambda text: [1.0, 0.0] if 'rust' in text.lower() else [0.0, 1.0]),
+    )
+    settings = WebSearchSettings(
+        headless=True,
+        timeout=10,
+        target_tags=[],
+        exclude_tags=[],
+        exclude_classes=[],
+        cache=WebCacheSettings(enabled=True, ttl=60, min_score=0.9),
+    )
+    return WebSearchService.model_construct(settings=settings, cache_service=cache_service)
+
+
+class TestWebCache(unittest.TestCase):
+    def setUp(self):
+        WebCacheRegistry.clear()
+
+    def test_fetched_chunks_are_served_until_they_expire(self):
+        with tempfile.TemporaryDirectory() as directory:
+            service = web_search_service(directory)
+            written = asyncio.run(
+                service.write_back(
+                    [
+                        SearchResult(title='Rust book', url='https://a.test', chunks=['Rust ownership', 'Rust borrowing']),
+                        SearchResult(
+                            title='Blocked',
+                            url='https://b.test',
+                            chunks=['[Google captcha detected - unable to retrieve search results]'],
+                        ),
+                        SearchResult(
+                            title='Cargo',
+                            url='https://c.test',
+                            chunks=['Publishing crates', '[Error fetching pages: timeout]'],
+                        ),
+                    ],
+                ),
+            )
+            self.assertEqual(written, 3)
+
+            cached = asyncio.run(service.lookup_cache('how does rust borrowing work'))
+            self.assertEqual(cached.metadata, {'source': 'web_cache'})
+            self.assertEqual(len(cached.contexts), 1)
+            self.assertEqual(cached.contexts[0].url, 'https://a.test')
+            self.assertEqual(sorted(cached.contexts[0].chunks), ['Rust borrowing', 'Rust ownership'])
+
+            cached = asyncio.run(service.lookup_cache('python packaging'))
+            self.assertEqual([page.url for page in cached.contexts], ['https://c.test'])
+
+            later = int(time.time()) + 120
+            with mock.patch('time.time', return_value=later):
+                self.assertIsNone(asyncio.run(service.lookup_cache('rust borrowing')))
+
+    def test_pages_fetched_after_expiry_are_cached_again(self):
+        with tempfile.TemporaryDirectory() as directory:
+            service = web_search_service(directory)
+            page = [SearchResult(title='Rust book', url='https://a.test', chunks=['Rust lifetimes'])]
+            self.assertEqual(asyncio.run(service.write_back(page)), 1)
+
+            later = int(time.time()) + 120
+            with mock.patch('time.time', return_value=later):
+                self.assertIsNone(asyncio.run(service.lookup_cache('rust lifetimes')))
+                self.assertEqual(asyncio.run(service.write_back(page)), 1)
+                cached = asyncio.run(service.lookup_cache('rust lifetimes'))
+            self.assertEqual(cached.contexts[0].chunks, ['Rust lifetimes'])
+
+    def test_write_backs_run_in_the_background_and_create_the_collection_once(self):
+        with tempfile.TemporaryDirectory() as directory:
+            service = web_search_service(directory)
+
+            async def run():
+                for url in ['https://a.test', 'https://b.test']:
+                    service.schedule_write_back([SearchResult(title='Rust', url=url, chunks=['Rust traits'])])
+                pending = len(WebCacheRegistry().tasks)
+                await asyncio.gather(*WebCacheRegistry().tasks)
+                return pending
+
+            with mock.patch.object(LocalIndexService, 'ensure_collection') as ensure_collection:
+                self.assertEqual(asyncio.run(run()), 2)
+            self.assertEqual(ensure_collection.call_count, 1)
+            self.assertEqual(len(asyncio.run(service.lookup_cache('rust traits')).contexts), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Any
+from typing import Callable
+
+import httpx
+import numpy as np
+import orjson
+from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
+"""
+Serialization Benchmark
+
+This module measures the CPU time spent serializing and parsing the
+payloads exchanged between the services: embedding responses, LLM chat
+completions and retriever answers with large contexts. Each case compares
+the previous stdlib-json path (Python lists, `JSONResponse`, repeated
+`response.json()` calls) with the orjson path now used by the services.
+
+Usage (from src/retriver):
+    python -m tools.bench_serialization --iterations 200 --batch 64 --dim 1024
+"""
+
+
+def cpu_time_per_call(fn: Callable[[], Any], iterations: int) -> float:
+    """Mean process CPU time of a call, in milliseconds."""
+    fn()
+    started = time.process_time()
+    for _ in range(iterations):
+        fn()
+    return (time.process_time() - started) * 1000 / iterations
+
+
+def embedding_payload(batch: int, dim: int) -> dict[str, Any]:
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((batch, dim), dtype=np.float32)
+    return {
+        'message': 'Process successfully !!!',
+        'info': {
+            'data': [
+                {'object': 'embedding', 'embedding': vector, 'index': index}
+                for index, vector in enumerate(vectors)
+            ],
+            'model': 'bench',
+            'object': 'list',
+        },
+    }
+
+
+def completion_payload(chars: int) -> dict[str, Any]:
+    return {
+        'id': 'chatcmpl-bench',
+        'object': 'chat.completion',
+        'model': 'bench',
+        'choices': [
+            {
+                'index': 0,
+                'message': {'role': 'assistant', 'content': 'Tài liệu tham khảo. ' * (chars // 20)},
+                'finish_reason': 'stop',
+            },
+        ],
+        'usage': {
+            'prompt_tokens': chars // 4,
+            'completion_tokens': chars // 4,
+            'total_tokens': chars // 2,
+        },
+    }
+
+
+def context_payload(contexts: int, chars: int) -> dict[str, Any]:
+    return {
+        'message': 'Process successfully !!!',
+        'info': {
+            'answer': 'Câu trả lời tổng hợp. ' * 50,
+            'metadata': {
+                'contexts': ['Đoạn văn bản truy xuất được. ' * (chars // 29) for _ in range(contexts)],
+                'scores': [1.0 / (index + 1) for index in range(contexts)],
+                'usage': {'prompt_tokens': 12000, 'completion_tokens': 800},
+            },
+        },
+    }
+
+
+def run(
+    iterations: int,
+    batch: int,
+    dim: int,
+    contexts: int,
+    chars: int,
+) -> list[tuple[str, float, float]]:
+    """
+    Time every case with the stdlib and orjson paths.
+
+    Returns:
+        list[tuple[str, float, float]]: Case name, stdlib and orjson milliseconds per request.
+    """
+    embeddings = embedding_payload(batch, dim)
+    embed_body = ORJSONResponse(content=embeddings).body
+
+    completion = completion_payload(chars)
+    completion_body = orjson.dumps(completion)
+
+    answer = context_payload(contexts, chars)
+    answer_body = orjson.dumps(answer)
+
+    def parse_completion_stdlib() -> None:
+        response = httpx.Response(200, content=completion_body)
+        _ = (
+            response.json()['choices'][0]['message']['content'],
+            response.json()['usage']['prompt_tokens'],
+            response.json()['usage']['completion_tokens'],
+            response.json()['usage']['total_tokens'],
+        )
+
+    def parse_completion_orjson() -> None:
+        data = orjson.loads(httpx.Response(200, content=completion_body).content)
+        _ = (
+            data['choices'][0]['message']['content'],
+            data['usage']['prompt_tokens'],
+            data['usage']['completion_tokens'],
+            data['usage']['total_tokens'],
+        )
+
+    def encode_embeddings_stdlib() -> None:
+        data = [
+            {**item, 'embedding': item['embedding'].tolist()} for item in embeddings['info']['data']
+        ]
+        JSONResponse(content={**embeddings, 'info': {**embeddings['info'], 'data': data}})
+
+    def decode_embeddings_stdlib() -> None:
+        data = httpx.Response(200, content=embed_body).json()['info']['data']
+        _ = [np.array(item['embedding']) for item in data]
+
+    def decode_embeddings_orjson() -> None:
+        data = orjson.loads(httpx.Response(200, content=embed_body).content)['info']['data']
+        _ = [np.array(item['embedding']) for item in data]
+
+    def parse_answer_stdlib() -> None:
+        response = httpx.Response(200, content=answer_body)
+        _ = (response.json()['info']['answer'], response.json()['info']['metadata'])
+
+    def parse_answer_orjson() -> None:
+        info = orjson.loads(httpx.Response(200, content=answer_body).content)['info']
+        _ = (info['answer'], info['metadata'])
+
+    cases = [
+        (
+            f'embed response encode ({batch}x{dim})',
+            encode_embeddings_stdlib,
+            lambda: ORJSONResponse(content=embeddings),
+        ),
+        (
+            f'embed response decode ({batch}x{dim})',
+            decode_embeddings_stdlib,
+            decode_embeddings_orjson,
+        ),
+        (
+            f'llm completion parse ({chars} chars)',
+            parse_completion_stdlib,
+            parse_completion_orjson,
+        ),
+        (
+            f'answer response encode ({contexts}x{chars} chars)',
+            lambda: JSONResponse(content=answer),
+            lambda: ORJSONResponse(content=answer),
+        ),
+        (
+            f'answer response decode ({contexts}x{chars} chars)',
+            parse_answer_stdlib,
+            parse_answer_orjson,
+        ),
+    ]
+    return [
+        (name, cpu_time_per_call(stdlib, iterations), cpu_time_per_call(fast, iterations))
+        for name, stdlib, fast in cases
+    ]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare stdlib json and orjson CPU time per request')
+    parser.add_argument('--iterations', type=int, default=200)
+    parser.add_argument('--batch', type=int, default=64, help='embeddings per response')
+    parser.add_argument('--dim', type=int, default=1024, help='embedding dimension')
+    parser.add_argument('--contexts', type=int, default=20, help='contexts per retriever answer')
+    parser.add_argument('--chars', type=int, default=4000, help='characters per context/completion')
+    args = parser.parse_args()
+
+    results = run(args.iterations, args.batch, args.dim, args.contexts, args.chars)
+    width = max(len(name) for name, _, _ in results)
+    print(f'{"case":<{width}}  {"stdlib ms":>10}  {"orjson ms":>10}  {"saved ms":>9}  {"speedup":>7}')
+    for name, stdlib, fast in results:
+        print(f'{name:<{width}}  {stdlib:>10.3f}  {fast:>10.3f}  {stdlib - fast:>9.3f}  {stdlib / fast:>6.1f}x')
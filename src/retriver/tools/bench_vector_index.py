@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+import argparse
+import statistics
+import tempfile
+import time
+from typing import Callable
+
+import numpy as np
+from infra.milvus import LocalVectorIndex
+from shared.settings import LocalIndexSettings
+"""
+Vector Index Benchmark
+
+This module compares search latency and recall of the local memory-mapped
+index, exhaustive and IVF, and optionally of a running Milvus, on random
+vectors. Recall@k is measured against the exhaustive local search. With
+--float16 the vectors and queries are also rounded to half precision, the
+way the FLOAT16_VECTOR path stores and sends them, and the recall of that
+exhaustive search is reported with the memory and bytes per query saved.
+
+Usage (from src/retriver):
+    python -m tools.bench_vector_index --rows 200000 --dim 768 --nlist 1024 --nprobe 16
+    python -m tools.bench_vector_index --milvus-uri http://localhost:19530
+    python -m tools.bench_vector_index --float16 --milvus-uri http://localhost:19530
+"""
+
+
+def latencies(search: Callable[[np.ndarray], list[list[int]]], queries: np.ndarray, batch: int):
+    """Run every batch of queries, returning per-batch latencies in ms and the result rows."""
+    timings, rows = [], []
+    for start in range(0, len(queries), batch):
+        started = time.perf_counter()
+        rows.extend(search(queries[start:start + batch]))
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings, rows
+
+
+def recall(expected: list[list[int]], found: list[list[int]]) -> float:
+    hits = sum(len(set(e) & set(f)) for e, f in zip(expected, found))
+    return hits / max(1, sum(len(e) for e in expected))
+
+
+def report(name: str, build_seconds: float, timings: list[float], value: float) -> None:
+    ordered = sorted(timings)
+    p95 = ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))]
+    print(
+        f'{name:<14} build {build_seconds:8.2f}s  p50 {statistics.median(ordered):8.2f}ms  '
+        f'p95 {p95:8.2f}ms  recall {value:.3f}',
+    )
+
+
+def mebibytes(size: int) -> str:
+    return f'{size / 2**20:.1f} MiB'
+
+
+def milvus_search(uri: str, vectors: np.ndarray, metric: str, top_k: int, nlist: int, nprobe: int):
+    """Load the vectors into a temporary Milvus collection and return its search function.
+
+    float16 vectors are stored in a FLOAT16_VECTOR field and sent as raw bytes.
+    """
+    from pymilvus import DataType
+    from pymilvus import MilvusClient
+
+    half = vectors.dtype == np.float16
+    client = MilvusClient(uri=uri)
+    collection = f'bench_{len(vectors)}_{vectors.shape[1]}_{vectors.dtype}'
+    if client.has_collection(collection):
+        client.drop_collection(collection)
+
+    schema = MilvusClient.create_schema(auto_id=False)
+    schema.add_field('id', DataType.INT64, is_primary=True)
+    schema.add_field('vector', DataType.FLOAT16_VECTOR if half else DataType.FLOAT_VECTOR, dim=vectors.shape[1])
+
+    index_params = client.prepare_index_params()
+    index_params.add_index(
+        field_name='vector',
+        index_type='IVF_FLAT',
+        metric_type=metric,
+        params={'nlist': nlist},
+    )
+    client.create_collection(collection, schema=schema, index_params=index_params)
+    for start in range(0, len(vectors), 10000):
+        client.insert(
+            collection,
+            [
+                {'id': start + i, 'vector': row if half else row.tolist()}
+                for i, row in enumerate(vectors[start:start + 10000])
+            ],
+        )
+    client.load_collection(collection)
+
+    def search(queries: np.ndarray) -> list[list[int]]:
+        result = client.search(
+            collection,
+            data=list(queries) if half else queries.tolist(),
+            limit=top_k,
+            search_params={'params': {'nprobe': nprobe}},
+        )
+        return [[hit['id'] for hit in hits] for hits in result]
+
+    return client, collection, search
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Compare local index and Milvus search latency')
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--dim', type=int, default=768)
+    parser.add_argument('--queries', type=int, default=256)
+    parser.add_argument('--batch', type=int, default=8, help='queries per search call')
+    parser.add_argument('--top-k', type=int, default=10)
+    parser.add_argument('--metric', choices=['COSINE', 'IP', 'L2'], default='COSINE')
+    parser.add_argument('--nlist', type=int, default=256)
+    parser.add_argument('--nprobe', type=int, default=16)
+    parser.add_argument('--milvus-uri', default=None, help='also benchmark a running Milvus')
+    parser.add_argument('--float16', action='store_true', help='also measure half-precision vectors')
+    args = parser.parse_args()
+
+    # Clustered data, closer to real embeddings than isotropic noise
+    rng = np.random.default_rng(0)
+    centers = rng.standard_normal((max(1, args.rows // 100), args.dim), dtype=np.float32)
+    vectors = centers[rng.integers(len(centers), size=args.rows)]
+    vectors += 0.3 * rng.standard_normal((args.rows, args.dim), dtype=np.float32)
+    queries = centers[rng.integers(len(centers), size=args.queries)]
+    queries += 0.3 * rng.standard_normal((args.queries, args.dim), dtype=np.float32)
+
+    with tempfile.TemporaryDirectory() as directory:
+        exact_settings = LocalIndexSettings(path=directory, metric=args.metric)
+        started = time.perf_counter()
+        exact = LocalVectorIndex(f'{directory}/exact', exact_settings)
+        exact.add(vectors, [{} for _ in range(args.rows)])
+        exact_build = time.perf_counter() - started
+
+        exact_timings, expected = latencies(
+            lambda batch: [[row for row, _ in hits] for hits in exact.search(batch, args.top_k)],
+            queries,
+            args.batch,
+        )
+        report('local exact', exact_build, exact_timings, 1.0)
+
+        ivf_settings = exact_settings.model_copy(update={'nlist': args.nlist, 'nprobe': args.nprobe})
+        started = time.perf_counter()
+        ivf = LocalVectorIndex(f'{directory}/ivf', ivf_settings)
+        ivf.add(vectors, [{} for _ in range(args.rows)])
+        ivf.build_ivf()
+        ivf_build = time.perf_counter() - started
+
+        ivf_timings, found = latencies(
+            lambda batch: [[row for row, _ in hits] for hits in ivf.search(batch, args.top_k)],
+            queries,
+            args.batch,
+        )
+        report(f'local ivf{args.nlist}', ivf_build, ivf_timings, recall(expected, found))
+
+        if args.float16:
+            # Local rows stay float32 on disk: only the rounding of both sides is measured
+            started = time.perf_counter()
+            half = LocalVectorIndex(f'{directory}/half', exact_settings)
+            half.add(vectors.astype(np.float16), [{} for _ in range(args.rows)])
+            half_build = time.perf_counter() - started
+
+            half_timings, found = latencies(
+                lambda batch: [[row for row, _ in hits] for hits in half.search(batch.astype(np.float16), args.top_k)],
+                queries,
+                args.batch,
+            )
+            report('local exact16', half_build, half_timings, recall(expected, found))
+            print(
+                f'vectors: float32 {mebibytes(vectors.nbytes)}, float16 {mebibytes(vectors.nbytes // 2)}; '
+                f'bytes per query sent: float32 {4 * args.dim}, float16 {2 * args.dim}',
+            )
+
+    if args.milvus_uri:
+        started = time.perf_counter()
+        client, collection, search = milvus_search(
+            args.milvus_uri,
+            vectors,
+            args.metric,
+            args.top_k,
+            args.nlist,
+            args.nprobe,
+        )
+        milvus_build = time.perf_counter() - started
+        try:
+            milvus_timings, found = latencies(search, queries, args.batch)
+            report('milvus ivf', milvus_build, milvus_timings, recall(expected, found))
+        finally:
+            client.drop_collection(collection)
+            client.close()
+
+    if args.milvus_uri and args.float16:
+        started = time.perf_counter()
+        client, collection, search = milvus_search(
+            args.milvus_uri,
+            vectors.astype(np.float16),
+            args.metric,
+            args.top_k,
+            args.nlist,
+            args.nprobe,
+        )
+        milvus_build = time.perf_counter() - started
+        try:
+            milvus_timings, found = latencies(lambda batch: search(batch.astype(np.float16)), queries, args.batch)
+            report('milvus ivf16', milvus_build, milvus_timings, recall(expected, found))
+        finally:
+            client.drop_collection(collection)
+            client.close()
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from .pipeline import Checkpoint
+from .pipeline import content_hash
+from .pipeline import IngestInput
+from .pipeline import IngestionPipeline
+from .pipeline import IngestReport
+
+__all__ = [
+    'Checkpoint',
+    'content_hash',
+    'IngestInput',
+    'IngestionPipeline',
+    'IngestReport',
+]
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+
+from domain.processor.chunking import ChunkingService
+from infra.embed import EmbedService
+from infra.milvus import create_vector_service
+from shared.utils import get_settings
+
+from .pipeline import IngestInput
+from .pipeline import IngestionPipeline
+"""
+Ingest a directory of documents into the configured vector store.
+
+Usage (from src/retriver):
+    python -m tools.ingest ./documents
+    MILVUS__BACKEND=local python -m tools.ingest ./documents --embed-batch-size 512
+
+Settings come from the retriever's environment (MILVUS__*, EMBED__*,
+CHUNKING__*, INGEST__*); the options below override the INGEST__ ones.
+"""
+
+
+async def main(args: argparse.Namespace) -> None:
+    settings = get_settings()
+    overrides = {
+        key: value
+        for key, value in {
+            'parse_workers': args.workers,
+            'file_batch_size': args.file_batch_size,
+            'embed_batch_size': args.embed_batch_size,
+            'upsert_batch_size': args.upsert_batch_size,
+            'checkpoint_path': args.checkpoint,
+        }.items()
+        if value is not None
+    }
+    embed_service = EmbedService(settings=settings.embed)
+    pipeline = IngestionPipeline(
+        settings=settings.ingest.model_copy(update=overrides),
+        store=create_vector_service(settings.milvus, embed_service),
+        chunking_service=ChunkingService(settings=settings.chunking, embed_service=embed_service),
+        embed_service=embed_service,
+    )
+    report = await pipeline.process(
+        IngestInput(directory=args.directory, resume=not args.restart, partition=args.partition),
+    )
+    print(report.summary())
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Ingest documents into the vector store')
+    parser.add_argument('directory', help='directory of HTML, markdown and text documents')
+    parser.add_argument('--workers', type=int, default=None, help='parser processes')
+    parser.add_argument('--file-batch-size', type=int, default=None)
+    parser.add_argument('--embed-batch-size', type=int, default=None)
+    parser.add_argument('--upsert-batch-size', type=int, default=None)
+    parser.add_argument('--checkpoint', default=None, help='checkpoint file path')
+    parser.add_argument('--restart', action='store_true', help='ignore the checkpoint')
+    parser.add_argument(
+        '--partition',
+        default=None,
+        help='partition key value of every chunk, by default the first subdirectory',
+    )
+    asyncio.run(main(parser.parse_args()))
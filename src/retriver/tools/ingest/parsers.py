@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import re
+from pathlib import Path
+from typing import Callable
+
+from bs4 import BeautifulSoup
+"""
+Document Parsers Module
+
+This module turns HTML, markdown and plain-text files into the plain text
+that is chunked and embedded. Parsers are plain functions so they can run
+in worker processes.
+"""
+
+HTML_NOISE_TAGS = ('script', 'style', 'noscript', 'nav', 'header', 'footer', 'aside', 'form')
+
+MARKDOWN_RULES = [
+    (re.compile(r'^\s*(```|~~~).*$', re.MULTILINE), ''),
+    (re.compile(r'!\[([^\]]*)\]\([^)]*\)'), r'\1'),
+    (re.compile(r'\[([^\]]+)\]\([^)]*\)'), r'\1'),
+    (re.compile(r'<[^>]+>'), ''),
+    (re.compile(r'^\s{0,3}#{1,6}\s*', re.MULTILINE), ''),
+    (re.compile(r'^\s{0,3}>\s?', re.MULTILINE), ''),
+    (re.compile(r'^\s*([-*+]|\d+\.)\s+', re.MULTILINE), ''),
+    (re.compile(r'^\s*([-*_]\s*){3,}$', re.MULTILINE), ''),
+    (re.compile(r'(\*\*|\*|`)(\S(?:.*?\S)?)\1'), r'\2'),
+    (re.compile(r'(?<!\w)(__|_)(\S(?:.*?\S)?)\1(?!\w)'), r'\2'),
+]
+
+
+def normalize_whitespace(text: str) -> str:
+    """Collapse runs of spaces and blank lines."""
+    lines = (re.sub(r'[ \t\f\v]+', ' ', line).strip() for line in text.splitlines())
+    return re.sub(r'\n{3,}', '\n\n', '\n'.join(lines)).strip()
+
+
+def parse_html(text: str) -> str:
+    """Visible text of an HTML page, without scripts, navigation and forms."""
+    soup = BeautifulSoup(text, 'html.parser')
+    for tag in soup(HTML_NOISE_TAGS):
+        tag.decompose()
+    return normalize_whitespace(soup.get_text('\n'))
+
+
+def parse_markdown(text: str) -> str:
+    """Markdown with its markup stripped, keeping link and image texts."""
+    for pattern, replacement in MARKDOWN_RULES:
+        text = pattern.sub(replacement, text)
+    return normalize_whitespace(text)
+
+
+def parse_text(text: str) -> str:
+    return normalize_whitespace(text)
+
+
+PARSERS: dict[str, Callable[[str], str]] = {
+    '.html': parse_html,
+    '.htm': parse_html,
+    '.md': parse_markdown,
+    '.markdown': parse_markdown,
+    '.txt': parse_text,
+}
+
+
+def parse_document(path: str) -> str:
+    """
+    Read and parse one document according to its extension.
+
+    Args:
+        path (str): Path of the document.
+
+    Returns:
+        str: The document's plain text.
+    """
+    file = Path(path)
+    parser = PARSERS.get(file.suffix.lower(), parse_text)
+    return parser(file.read_text(encoding='utf-8', errors='replace'))
@@ -0,0 +1,327 @@
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any
+from typing import Optional
+
+from domain.processor.chunking import ChunkingInput
+from domain.processor.chunking import ChunkingService
+from infra.embed import EmbedInput
+from infra.embed import EmbedService
+from infra.milvus import MilvusService
+from shared.base import AsyncBaseService
+from shared.base import BaseModel
+from shared.logging import get_logger
+from shared.settings import IngestSettings
+
+from .parsers import parse_document
+"""
+Ingestion Pipeline Module
+
+This module fills the vector store from a directory of documents. Files
+are parsed in worker processes, chunked with the ChunkingService, and each
+chunk is keyed by the SHA-256 of its normalized text, and of its partition
+when the collection has a partition key field. Chunks already in the
+collection are skipped, the rest are embedded in large batches and upserted
+in bulk. Files are processed in batches and a checkpoint records every file
+committed, so an interrupted run resumes where it stopped. Chunks carry
+their source file, ingestion time and, when the collection has a partition
+key field, the partition value, all usable as search filters, and a short
+preview fetched instead of the full text by two-phase retrieval.
+"""
+
+logger = get_logger(__name__)
+
+
+def content_hash(text: str, partition: Optional[str] = None) -> str:
+    """
+    Identifier of a chunk: SHA-256 of its whitespace-normalized text.
+
+    With a partition, the same text stored in two partitions gets two ids,
+    so each partition keeps its own copy.
+    """
+    text = ' '.join(text.split())
+    if partition is not None:
+        text = f'{partition}\n{text}'
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def file_signature(path: Path) -> str:
+    """Cheap change detector for a file: its size and modification time."""
+    stat = path.stat()
+    return f'{stat.st_size}:{stat.st_mtime_ns}'
+
+
+class Checkpoint:
+    """
+    Files already ingested, with the signature they had at the time.
+
+    Attributes:
+        path (Path): Location of the JSON checkpoint file.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.files: dict[str, str] = {}
+        if self.path.exists():
+            self.files = json.loads(self.path.read_text()).get('files', {})
+
+    def done(self, name: str, signature: str) -> bool:
+        return self.files.get(name) == signature
+
+    def mark(self, files: dict[str, str]) -> None:
+        """Record committed files and write the checkpoint atomically."""
+        self.files.update(files)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        temporary = self.path.with_suffix('.tmp')
+        temporary.write_text(json.dumps({'files': self.files}, ensure_ascii=False))
+        os.replace(temporary, self.path)
+
+
+class IngestInput(BaseModel):
+    """
+    Attributes:
+        directory (str): Root directory of the documents.
+        resume (bool): Skip files recorded in the checkpoint with the same signature.
+        partition (Optional[str]): Partition key value of every chunk; by default
+            the first directory under the root, "default" for files at the root.
+    """
+
+    directory: str
+    resume: bool = True
+    partition: Optional[str] = None
+
+
+class IngestReport(BaseModel):
+    """Counts and per-stage timings of an ingestion run."""
+
+    files_found: int = 0
+    files_skipped: int = 0
+    files_ingested: int = 0
+    files_failed: int = 0
+    chunks: int = 0
+    duplicate_chunks: int = 0
+    existing_chunks: int = 0
+    upserted: int = 0
+
+    parse_seconds: float = 0.0
+    chunk_seconds: float = 0.0
+    embed_seconds: float = 0.0
+    upsert_seconds: float = 0.0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def files_per_second(self) -> float:
+        return self.files_ingested / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    @property
+    def chunks_per_second(self) -> float:
+        return self.chunks / self.elapsed_seconds if self.elapsed_seconds else 0.0
+
+    def summary(self) -> str:
+        """Human-readable throughput report."""
+        return '\n'.join(
+            [
+                f'files: {self.files_found} found, {self.files_ingested} ingested, '
+                f'{self.files_skipped} unchanged, {self.files_failed} failed',
+                f'chunks: {self.chunks} produced, {self.upserted} upserted, '
+                f'{self.existing_chunks} already stored, {self.duplicate_chunks} duplicates',
+                f'time: {self.elapsed_seconds:.1f}s total, parse {self.parse_seconds:.1f}s, '
+                f'chunk {self.chunk_seconds:.1f}s, embed {self.embed_seconds:.1f}s, '
+                f'upsert {self.upsert_seconds:.1f}s',
+                f'throughput: {self.files_per_second:.2f} files/s, '
+                f'{self.chunks_per_second:.1f} chunks/s',
+            ],
+        )
+
+
+class IngestionPipeline(AsyncBaseService):
+    """
+    Parses, chunks, embeds and upserts a directory of documents.
+
+    Attributes:
+        settings (IngestSettings): Batch sizes, concurrency and checkpoint location.
+        store (MilvusService): Vector store written to, Milvus or the local index.
+        chunking_service (ChunkingService): Splits documents into chunks.
+        embed_service (EmbedService): Embeds the chunks.
+    """
+
+    settings: IngestSettings
+    store: MilvusService
+    chunking_service: ChunkingService
+    embed_service: EmbedService
+
+    def discover(self, directory: Path) -> list[Path]:
+        """Documents under a directory with a supported extension, in a stable order."""
+        extensions = {extension.lower() for extension in self.settings.extensions}
+        return sorted(
+            path for path in directory.rglob('*') if path.is_file() and path.suffix.lower() in extensions
+        )
+
+    async def parse(
+        self,
+        pool: ProcessPoolExecutor,
+        paths: list[Path],
+        report: IngestReport,
+    ) -> list[Optional[str]]:
+        """Parse files in worker processes; failed files yield None."""
+        started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(
+            *(loop.run_in_executor(pool, parse_document, str(path)) for path in paths),
+            return_exceptions=True,
+        )
+        report.parse_seconds += time.perf_counter() - started
+
+        texts = []
+        for path, result in zip(paths, results):
+            if isinstance(result, BaseException):
+                logger.error(f'Failed to parse {path}: {result}')
+                texts.append(None)
+            else:
+                texts.append(result)
+        return texts
+
+    async def chunk(self, texts: list[Optional[str]], report: IngestReport) -> list[Optional[list[str]]]:
+        """Chunk parsed documents concurrently; failed documents yield None."""
+        started = time.perf_counter()
+        semaphore = asyncio.Semaphore(self.settings.chunk_concurrency)
+
+        async def chunk_one(text: Optional[str]) -> Optional[list[str]]:
+            if text is None:
+                return None
+            if not text.strip():
+                return []
+            async with semaphore:
+                try:
+                    output = await self.chunking_service.process(ChunkingInput(context=text))
+                except Exception as e:
+                    logger.error(f'Failed to chunk document: {e}')
+                    return None
+            return [chunk for chunk in output.chunks if chunk.strip()]
+
+        chunks = await asyncio.gather(*(chunk_one(text) for text in texts))
+        report.chunk_seconds += time.perf_counter() - started
+        return chunks
+
+    async def write(self, entities: list[dict[str, Any]], report: IngestReport) -> None:
+        """Embed new chunks in large batches and upsert them in bulk."""
+        id_field = self.store.settings.id_field
+        content_field = self.store.settings.content_field
+
+        existing: set[str] = set()
+        for start in range(0, len(entities), self.settings.upsert_batch_size):
+            batch = entities[start:start + self.settings.upsert_batch_size]
+            existing |= await self.store.existing_ids([entity[id_field] for entity in batch])
+        report.existing_chunks += len(existing)
+        entities = [entity for entity in entities if entity[id_field] not in existing]
+
+        vectors = []
+        collection_ready = False
+        for start in range(0, len(entities), self.settings.embed_batch_size):
+            batch = entities[start:start + self.settings.embed_batch_size]
+            started = time.perf_counter()
+            output = await self.embed_service.process(
+                EmbedInput(query=[entity[content_field] for entity in batch]),
+            )
+            report.embed_seconds += time.perf_counter() - started
+            if not collection_ready and output.embeddings:
+                await self.store.ensure_collection(len(output.embeddings[0]))
+                collection_ready = True
+            vectors.extend(output.embeddings)
+
+        for start in range(0, len(entities), self.settings.upsert_batch_size):
+            started = time.perf_counter()
+            report.upserted += await self.store.upsert(
+                vectors[start:start + self.settings.upsert_batch_size],
+                entities[start:start + self.settings.upsert_batch_size],
+            )
+            report.upsert_seconds += time.perf_counter() - started
+
+    def partition_of(self, name: str, inputs: IngestInput) -> str:
+        """Partition key value of a file, given its path relative to the root."""
+        if inputs.partition is not None:
+            return inputs.partition
+        parts = Path(name).parts
+        return parts[0] if len(parts) > 1 else 'default'
+
+    async def process(self, inputs: IngestInput) -> IngestReport:
+        """
+        Ingest every supported document under a directory.
+
+        Args:
+            inputs (IngestInput): The directory and whether to resume from the checkpoint.
+
+        Returns:
+            IngestReport: Counts and timings of the run.
+        """
+        started = time.perf_counter()
+        root = Path(inputs.directory)
+        checkpoint = Checkpoint(self.settings.checkpoint_path)
+        report = IngestReport()
+
+        pending = []
+        for path in self.discover(root):
+            report.files_found += 1
+            name, signature = str(path.relative_to(root)), file_signature(path)
+            if inputs.resume and checkpoint.done(name, signature):
+                report.files_skipped += 1
+            else:
+                pending.append((path, name, signature))
+
+        id_field = self.store.settings.id_field
+        content_field = self.store.settings.content_field
+        partition_field = self.store.settings.partition_key_field
+        two_phase = self.store.settings.two_phase
+        seen: set[str] = set()
+
+        with ProcessPoolExecutor(max_workers=self.settings.parse_workers) as pool:
+            for start in range(0, len(pending), self.settings.file_batch_size):
+                batch = pending[start:start + self.settings.file_batch_size]
+                texts = await self.parse(pool, [path for path, _, _ in batch], report)
+                documents = await self.chunk(texts, report)
+
+                entities, committed = [], {}
+                ingested_at = int(time.time())
+                for (_, name, signature), chunks in zip(batch, documents):
+                    if chunks is None:
+                        report.files_failed += 1
+                        continue
+                    committed[name] = signature
+                    partition = self.partition_of(name, inputs) if partition_field else None
+                    for index, chunk in enumerate(chunks):
+                        report.chunks += 1
+                        key = content_hash(chunk, partition)
+                        if key in seen:
+                            report.duplicate_chunks += 1
+                            continue
+                        seen.add(key)
+                        entity = {
+                            id_field: key,
+                            content_field: chunk,
+                            'source': name,
+                            'chunk_index': index,
+                            'ingested_at': ingested_at,
+                            two_phase.preview_field: chunk[: two_phase.preview_chars],
+                        }
+                        if partition_field:
+                            entity[partition_field] = partition
+                        entities.append(entity)
+
+                await self.write(entities, report)
+                checkpoint.mark(committed)
+                report.files_ingested += len(committed)
+                report.elapsed_seconds = time.perf_counter() - started
+                logger.info(
+                    f'Ingested {report.files_ingested}/{len(pending)} files, '
+                    f'{report.upserted} chunks upserted, {report.chunks_per_second:.1f} chunks/s',
+                )
+
+        report.elapsed_seconds = time.perf_counter() - started
+        return report
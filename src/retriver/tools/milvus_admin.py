@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Any
+from typing import Optional
+
+from infra.embed import EmbedInput
+from infra.embed import EmbedService
+from infra.milvus import create_vector_service
+from infra.milvus import MilvusService
+from shared.settings.milvus import DEFAULT_INDEX_PARAMS
+from shared.utils import get_settings
+"""
+Milvus Administration
+
+This module creates the configured collection and builds, rebuilds or
+describes its vector index from `MILVUS__INDEX__*`. Builds report their
+duration and the estimated memory of the index next to that of the raw
+vectors, to weigh the quantized IVF_SQ8 and IVF_PQ types and float16
+storage (`MILVUS__VECTOR_DTYPE`) against HNSW and IVF_FLAT on large corpora.
+
+Usage (from src/retriver):
+    python -m tools.milvus_admin create
+    MILVUS__INDEX__INDEX_TYPE=HNSW python -m tools.milvus_admin build --rebuild
+    python -m tools.milvus_admin build --index-type IVF_PQ --param nlist=4096 --param m=32
+    python -m tools.milvus_admin describe
+"""
+
+
+def estimate_index_bytes(index_type: str, params: dict[str, Any], dim: int, rows: int, itemsize: int = 4) -> int:
+    """
+    Rough memory held by an index once loaded.
+
+    Args:
+        index_type (str): Milvus index type.
+        params (dict[str, Any]): Build parameters.
+        dim (int): Vector dimension.
+        rows (int): Number of indexed vectors.
+        itemsize (int): Bytes per stored dimension, 2 for float16 vectors.
+
+    Returns:
+        int: Estimated bytes: encoded vectors plus graph links or IVF centroids and ids.
+    """
+    if index_type == 'IVF_SQ8':
+        per_vector = dim
+    elif index_type == 'IVF_PQ':
+        per_vector = params['m'] * params['nbits'] // 8
+    elif index_type == 'HNSW':
+        # Vectors plus 2M neighbours on the base layer, 4-byte ids
+        per_vector = itemsize * dim + 8 * params['M']
+    else:
+        per_vector = itemsize * dim
+
+    total = per_vector * rows
+    if index_type.startswith('IVF_'):
+        total += 4 * dim * params['nlist'] + 8 * rows
+    if index_type == 'IVF_PQ':
+        total += 4 * dim * 2 ** params['nbits']
+    return total
+
+
+def parse_params(pairs: list[str]) -> dict[str, Any]:
+    """Parse key=value build parameters, values as JSON when possible."""
+    params = {}
+    for pair in pairs:
+        key, _, value = pair.partition('=')
+        try:
+            params[key] = json.loads(value)
+        except json.JSONDecodeError:
+            params[key] = value
+    return params
+
+
+def described_params(info: dict[str, Any], index_type: str) -> dict[str, Any]:
+    """Build parameters of a described index, defaults filling the ones not reported."""
+    params = dict(DEFAULT_INDEX_PARAMS.get(index_type, {}))
+    for key in params:
+        if info.get(key) is not None:
+            params[key] = int(info[key])
+    return params
+
+
+def mebibytes(size: int) -> str:
+    return f'{size / 2**20:.1f} MiB'
+
+
+async def embedding_dim(settings) -> int:
+    """Dimension of the configured embedding model, from one probe embedding."""
+    output = await EmbedService(settings=settings.embed).process(EmbedInput(query=['dimension probe']))
+    return len(output.embeddings[0])
+
+
+async def describe(service: MilvusService) -> dict[str, Any]:
+    info = await service.describe_index()
+    print(json.dumps(info, indent=2, default=str))
+    return info
+
+
+async def build(service: MilvusService, rebuild: bool) -> None:
+    index = service.settings.index
+    if index.index_type == 'IVF_PQ' and service.settings.backend == 'milvus':
+        dim = (await service.describe_index())['dim']
+        if dim and dim % index.build_params['m']:
+            raise SystemExit(f'IVF_PQ needs m dividing the dimension {dim}, got m={index.build_params["m"]}')
+
+    started = time.perf_counter()
+    built = await service.build_index(rebuild=rebuild)
+    elapsed = time.perf_counter() - started
+    if not built:
+        print('Index already built; pass --rebuild to rebuild it')
+
+    info = await describe(service)
+    rows, dim = info.get('rows') or 0, info.get('dim') or 0
+    dtype = info.get('dtype', 'float32')
+    itemsize = 2 if dtype == 'float16' else 4
+    index_type = info.get('index_type', index.index_type)
+    params = described_params(info, index_type)
+    if built:
+        print(f'build time: {elapsed:.1f}s for {rows} vectors')
+    if rows and dim and index_type != 'AUTOINDEX':
+        print(
+            f'memory: ~{mebibytes(estimate_index_bytes(index_type, params, dim, rows, itemsize))} '
+            f'for {index_type}, raw {dtype} vectors {mebibytes(itemsize * dim * rows)}',
+        )
+
+
+async def main(args: argparse.Namespace) -> None:
+    settings = get_settings()
+    milvus_settings = settings.milvus
+    if args.command == 'build' and (args.index_type or args.param):
+        index = milvus_settings.index.model_copy(
+            update={
+                'index_type': args.index_type or milvus_settings.index.index_type,
+                'params': {**milvus_settings.index.params, **parse_params(args.param)},
+            },
+        )
+        milvus_settings = milvus_settings.model_copy(update={'index': index})
+
+    service = create_vector_service(milvus_settings, EmbedService(settings=settings.embed))
+    if args.command == 'create':
+        dim: Optional[int] = args.dim or await embedding_dim(settings)
+        await service.ensure_collection(dim)
+        print(f'Collection {service.collection_id} ready with dimension {dim}')
+        await describe(service)
+    elif args.command == 'build':
+        await build(service, args.rebuild)
+    else:
+        await describe(service)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Manage the vector collection and its index')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    create_parser = commands.add_parser('create', help='create the collection and its indexes')
+    create_parser.add_argument('--dim', type=int, default=None, help='vector dimension, probed if unset')
+
+    build_parser = commands.add_parser('build', help='build the vector index from the settings')
+    build_parser.add_argument('--rebuild', action='store_true', help='drop and rebuild an existing index')
+    build_parser.add_argument(
+        '--index-type',
+        choices=['AUTOINDEX', 'FLAT', 'IVF_FLAT', 'IVF_SQ8', 'IVF_PQ', 'HNSW'],
+        default=None,
+    )
+    build_parser.add_argument('--param', action='append', default=[], help='build parameter key=value')
+
+    commands.add_parser('describe', help='show the vector index and row count')
+    asyncio.run(main(parser.parse_args()))
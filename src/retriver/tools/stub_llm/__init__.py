@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+from .server import create_app
+from .settings import LatencySettings
+from .settings import StubLLMSettings
+
+__all__ = [
+    'create_app',
+    'LatencySettings',
+    'StubLLMSettings',
+]
@@ -0,0 +1,18 @@
+from __future__ import annotations
+
+import uvicorn
+
+from .server import create_app
+from .settings import StubLLMSettings
+"""
+Run the stub LLM server.
+
+Usage (from src/retriver):
+    STUB_LLM_LATENCY__MEAN=0.8 python -m tools.stub_llm
+
+Then point the retriever at it with LLM__URL=http://localhost:8100/v1/chat/completions.
+"""
+
+if __name__ == '__main__':
+    settings = StubLLMSettings()
+    uvicorn.run(create_app(settings), host=settings.host, port=settings.port)
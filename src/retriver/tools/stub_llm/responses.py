@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+import json
+import re
+from string import Template
+from typing import Any
+from typing import Optional
+
+from .settings import StubLLMSettings
+"""
+Stub LLM Responses Module
+
+This module decides which pipeline stage a chat completion request comes
+from and renders the canned response for that stage. The stage is read from
+the `X-LLM-Stage` header sent by the retriever's LLMService, or inferred from
+the requested response-format schema for clients that do not send it.
+Templates may use `$query`, the question found in the prompt, and `$prompt`,
+the last user message.
+"""
+
+SCHEMA_STAGES = {
+    'Plan': 'planning',
+    'ValidationResult': 'output_validator',
+    'RouteDecision': 'router',
+}
+
+QUERY_TAGS = ('query', 'step_query', 'user_query')
+
+DEFAULT_RESPONSES = {
+    'get_fact': '- Key facts needed to answer: $query',
+    'planning': json.dumps(
+        [
+            {'step': 'step1', 'question': '$query', 'agent': 'sub-agent'},
+            {'step': 'step2', 'question': 'Summarize the findings', 'agent': 'answer-generator'},
+        ],
+        ensure_ascii=False,
+    ),
+    'output_validator': json.dumps(
+        {
+            'is_sufficient': True,
+            'reasoning': 'The retrieved information answers the question.',
+            'missing_aspects': [],
+            'reformulated_query': '$query',
+        },
+        ensure_ascii=False,
+    ),
+    'router': json.dumps({'service': 'Retriever_service'}),
+    'context_cleaner': '$prompt',
+    'memory': '$prompt',
+    'web_search': '$query',
+    'answer_generator': 'Stub answer to: $query',
+    'default': 'OK',
+}
+
+
+def detect_stage(headers: dict[str, str], body: dict[str, Any]) -> str:
+    """
+    Find the pipeline stage a request comes from.
+
+    Args:
+        headers (dict[str, str]): Lower-cased request headers.
+        body (dict[str, Any]): The chat completion request body.
+
+    Returns:
+        str: The stage name, "default" when unknown.
+    """
+    stage = headers.get('x-llm-stage')
+    if stage and stage != 'default':
+        return stage
+    schema_name = (body.get('response_format') or {}).get('json_schema', {}).get('name')
+    return SCHEMA_STAGES.get(schema_name, stage or 'default')
+
+
+def last_user_message(body: dict[str, Any]) -> str:
+    """Content of the last user message of a request."""
+    for message in reversed(body.get('messages', [])):
+        if message.get('role') == 'user':
+            return message.get('content', '')
+    return ''
+
+
+def extract_query(prompt: str) -> str:
+    """The question inside a `<query>`-like tag, or the prompt itself."""
+    for tag in QUERY_TAGS:
+        match = re.search(rf'<{tag}>(.*?)</{tag}>', prompt, re.DOTALL)
+        if match:
+            return match.group(1).strip()
+    return prompt.strip()
+
+
+def render_response(
+    settings: StubLLMSettings,
+    stage: str,
+    body: dict[str, Any],
+) -> str:
+    """
+    Render the canned response of a stage.
+
+    Args:
+        settings (StubLLMSettings): Server settings with response overrides.
+        stage (str): The detected stage.
+        body (dict[str, Any]): The chat completion request body.
+
+    Returns:
+        str: The response content.
+    """
+    if stage == 'tool_decision':
+        return settings.tool
+
+    template: Optional[str] = settings.responses.get(stage)
+    if template is None:
+        template = DEFAULT_RESPONSES.get(stage, DEFAULT_RESPONSES['default'])
+
+    prompt = last_user_message(body)
+    query = extract_query(prompt)
+    if template.lstrip().startswith(('{', '[')):
+        # Keep rendered JSON valid whatever the query contains
+        query = json.dumps(query, ensure_ascii=False)[1:-1]
+        prompt = json.dumps(prompt, ensure_ascii=False)[1:-1]
+    return Template(template).safe_substitute(query=query, prompt=prompt)
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import math
+import random
+import time
+import uuid
+from typing import Any
+from typing import AsyncIterator
+
+from fastapi import FastAPI
+from fastapi import Request
+from fastapi.responses import JSONResponse
+from fastapi.responses import StreamingResponse
+
+from .responses import detect_stage
+from .responses import render_response
+from .settings import LatencySettings
+from .settings import StubLLMSettings
+"""
+Stub LLM Server Module
+
+This module serves an OpenAI-compatible `/chat/completions` endpoint that
+answers every pipeline stage with canned responses after a simulated delay.
+The delay is a sampled time to first token plus prompt processing and
+generation time derived from the configured token rates, so load tests
+exercise the retriever's orchestration and concurrency limits without a real
+model behind it.
+"""
+
+
+class StubState:
+    """Counters shared by all requests of one server."""
+
+    def __init__(self):
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.rejected = 0
+        self.failed = 0
+        self.stages: dict[str, int] = {}
+
+
+def sample_latency(settings: LatencySettings, rng: random.Random) -> float:
+    """
+    Draw a time to first token from the configured distribution.
+
+    Args:
+        settings (LatencySettings): Distribution and its parameters.
+        rng (random.Random): Random source.
+
+    Returns:
+        float: Seconds, clamped to [0, cap].
+    """
+    if settings.distribution == 'fixed':
+        value = settings.mean
+    elif settings.distribution == 'uniform':
+        value = rng.uniform(settings.low, settings.high)
+    elif settings.distribution == 'normal':
+        value = rng.gauss(settings.mean, settings.stddev)
+    elif settings.distribution == 'exponential':
+        value = rng.expovariate(1.0 / settings.mean) if settings.mean > 0 else 0.0
+    else:
+        value = settings.mean * math.exp(rng.gauss(0.0, settings.stddev))
+    return min(max(value, 0.0), settings.cap)
+
+
+def count_tokens(text: str, chars_per_token: float) -> int:
+    """Rough token count of a text."""
+    return max(1, math.ceil(len(text) / chars_per_token)) if text else 0
+
+
+def create_app(settings: StubLLMSettings) -> FastAPI:
+    """
+    Build the stub server.
+
+    Args:
+        settings (StubLLMSettings): Latency, token rates and responses.
+
+    Returns:
+        FastAPI: The application.
+    """
+    app = FastAPI(title='Stub LLM', description='OpenAI-compatible stub for load tests')
+    state = StubState()
+    rng = random.Random(settings.seed)
+
+    def completion_chunks(content: str) -> list[str]:
+        """Split a response into roughly token-sized pieces."""
+        size = max(1, int(settings.chars_per_token))
+        return [content[i:i + size] for i in range(0, len(content), size)]
+
+    async def stream(
+        completion_id: str,
+        model: str,
+        content: str,
+        usage: dict[str, int],
+    ) -> AsyncIterator[str]:
+        delay = 1.0 / settings.completion_tokens_per_second
+        try:
+            for index, piece in enumerate(completion_chunks(content)):
+                if index:
+                    await asyncio.sleep(delay)
+                chunk = {
+                    'id': completion_id,
+                    'object': 'chat.completion.chunk',
+                    'created': int(time.time()),
+                    'model': model,
+                    'choices': [
+                        {
+                            'index': 0,
+                            'delta': {'role': 'assistant', 'content': piece}
+                            if index == 0
+                            else {'content': piece},
+                            'finish_reason': None,
+                        },
+                    ],
+                }
+                yield f'data: {json.dumps(chunk, ensure_ascii=False)}\n\n'
+            final = {
+                'id': completion_id,
+                'object': 'chat.completion.chunk',
+                'created': int(time.time()),
+                'model': model,
+                'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}],
+                'usage': usage,
+            }
+            yield f'data: {json.dumps(final)}\n\n'
+            yield 'data: [DONE]\n\n'
+        finally:
+            state.in_flight -= 1
+
+    async def chat_completions(request: Request):
+        body: dict[str, Any] = await request.json()
+        headers = {key.lower(): value for key, value in request.headers.items()}
+        stage = detect_stage(headers, body)
+        state.requests += 1
+        state.stages[stage] = state.stages.get(stage, 0) + 1
+
+        if settings.max_concurrency is not None and state.in_flight >= settings.max_concurrency:
+            state.rejected += 1
+            return JSONResponse(
+                status_code=429,
+                content={'error': {'message': 'Stub LLM is at capacity', 'type': 'rate_limit'}},
+                headers={'Retry-After': '1'},
+            )
+
+        state.in_flight += 1
+        state.max_in_flight = max(state.max_in_flight, state.in_flight)
+        streaming = False
+        try:
+            if rng.random() < settings.error_rate:
+                state.failed += 1
+                await asyncio.sleep(sample_latency(settings.latency, rng))
+                return JSONResponse(
+                    status_code=503,
+                    content={'error': {'message': 'Injected stub failure', 'type': 'server_error'}},
+                )
+
+            content = render_response(settings, stage, body)
+            prompt_text = ''.join(
+                str(message.get('content', '')) for message in body.get('messages', [])
+            )
+            usage = {
+                'prompt_tokens': count_tokens(prompt_text, settings.chars_per_token),
+                'completion_tokens': count_tokens(content, settings.chars_per_token),
+            }
+            usage['total_tokens'] = usage['prompt_tokens'] + usage['completion_tokens']
+
+            await asyncio.sleep(
+                sample_latency(settings.latency, rng)
+                + usage['prompt_tokens'] / settings.prompt_tokens_per_second,
+            )
+
+            completion_id = f'chatcmpl-{uuid.uuid4().hex}'
+            model = body.get('model', 'stub')
+            if body.get('stream'):
+                streaming = True
+                return StreamingResponse(
+                    stream(completion_id, model, content, usage),
+                    media_type='text/event-stream',
+                )
+
+            await asyncio.sleep(usage['completion_tokens'] / settings.completion_tokens_per_second)
+            return {
+                'id': completion_id,
+                'object': 'chat.completion',
+                'created': int(time.time()),
+                'model': model,
+                'choices': [
+                    {
+                        'index': 0,
+                        'message': {'role': 'assistant', 'content': content},
+                        'finish_reason': 'stop',
+                    },
+                ],
+                'usage': usage,
+            }
+        finally:
+            if not streaming:
+                state.in_flight -= 1
+
+    app.add_api_route('/chat/completions', chat_completions, methods=['POST'])
+    app.add_api_route('/v1/chat/completions', chat_completions, methods=['POST'])
+
+    @app.get('/metrics')
+    async def metrics():
+        """Request counts and concurrency seen by the stub"""
+        return {
+            'requests': state.requests,
+            'in_flight': state.in_flight,
+            'max_in_flight': state.max_in_flight,
+            'rejected': state.rejected,
+            'failed': state.failed,
+            'stages': dict(state.stages),
+        }
+
+    return app
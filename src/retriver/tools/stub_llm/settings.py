@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from typing import Dict
+from typing import Literal
+from typing import Optional
+
+from pydantic_settings import BaseSettings
+from shared.base import BaseModel
+
+
+class LatencySettings(BaseModel):
+    """Distribution of the time before the first token, in seconds"""
+
+    distribution: Literal['fixed', 'uniform', 'normal', 'lognormal', 'exponential'] = 'lognormal'
+    mean: float = 0.4
+    stddev: float = 0.5
+    low: float = 0.1
+    high: float = 1.0
+    cap: float = 30.0
+
+
+class StubLLMSettings(BaseSettings):
+    """Settings for the stub OpenAI-compatible LLM server"""
+
+    host: str = '0.0.0.0'
+    port: int = 8100
+
+    latency: LatencySettings = LatencySettings()
+    prompt_tokens_per_second: float = 5000.0
+    completion_tokens_per_second: float = 50.0
+    chars_per_token: float = 4.0
+
+    max_concurrency: Optional[int] = None
+    error_rate: float = 0.0
+    seed: Optional[int] = None
+
+    tool: Literal['web_search', 'vector_db'] = 'web_search'
+    responses: Dict[str, str] = {}
+
+    class Config:
+        env_prefix = 'STUB_LLM_'
+        env_nested_delimiter = '__'
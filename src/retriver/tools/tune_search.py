@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+from typing import Awaitable
+from typing import Callable
+
+import numpy as np
+from infra.embed import EmbedService
+from infra.milvus import create_vector_service
+from infra.milvus import LocalIndexService
+from infra.milvus import LocalVectorIndex
+from infra.milvus import MilvusDriver
+from infra.milvus import MilvusService
+from shared.base import BaseModel
+from shared.settings import LocalIndexSettings
+from shared.utils import get_settings
+
+from .bench_vector_index import recall
+"""
+Search Parameter Autotuner
+
+This module measures recall@k and latency of the configured collection
+for a sweep of search parameters (`nprobe` for IVF indexes and the local
+index, `ef` for HNSW). Ground truth is the exact top-k of a brute-force
+numpy search over every stored vector. It prints the sweep, its recall /
+p95 latency Pareto frontier and the cheapest setting reaching the target
+recall.
+
+Usage (from src/retriver):
+    python -m tools.tune_search --sample 500 --top-k 10 --target-recall 0.95
+    python -m tools.tune_search --queries queries.txt --param ef --values 16,32,64,128,256
+    MILVUS__BACKEND=local python -m tools.tune_search
+
+Without --queries, stored vectors are sampled as queries. Ground truth
+holds every vector in memory, so large collections need as much RAM as
+their raw float32 vectors.
+"""
+
+DEFAULT_VALUES = {
+    'nprobe': [1, 2, 4, 8, 16, 32, 64, 128],
+    'ef': [16, 32, 64, 128, 256, 512],
+}
+
+
+class SweepPoint(BaseModel):
+    """Recall and latency of one search parameter setting."""
+
+    params: dict[str, Any]
+    recall: float
+    p50: float
+    p95: float
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+def pareto_frontier(points: list[SweepPoint]) -> list[SweepPoint]:
+    """Points no other point beats on both recall and p95 latency, fastest first."""
+    frontier: list[SweepPoint] = []
+    for point in sorted(points, key=lambda point: (point.p95, -point.recall)):
+        if not frontier or point.recall > frontier[-1].recall:
+            frontier.append(point)
+    return frontier
+
+
+def recommend(frontier: list[SweepPoint], target: float) -> SweepPoint:
+    """The fastest frontier point reaching the target recall, else the most accurate one."""
+    for point in frontier:
+        if point.recall >= target:
+            return point
+    return frontier[-1]
+
+
+def decode_vector(value: Any) -> np.ndarray:
+    """A vector read back from Milvus: float16 vectors come as a list holding their raw bytes."""
+    if isinstance(value, list) and value and isinstance(value[0], bytes):
+        return np.frombuffer(value[0], dtype=np.float16)
+    return np.asarray(value, dtype=np.float32)
+
+
+def fetch_milvus_vectors(service: MilvusService) -> tuple[np.ndarray, list[Any]]:
+    """Every vector of the collection and its id, read with a query iterator."""
+    settings = service.settings
+    iterator = MilvusDriver(settings).driver.query_iterator(
+        settings.collection_name,
+        batch_size=1000,
+        output_fields=[settings.id_field, settings.anns_field],
+    )
+    ids, vectors = [], []
+    try:
+        while batch := iterator.next():
+            for row in batch:
+                ids.append(row[settings.id_field])
+                vectors.append(decode_vector(row[settings.anns_field]))
+    finally:
+        iterator.close()
+    return np.asarray(vectors, dtype=np.float32), ids
+
+
+async def load_vectors(service: MilvusService) -> tuple[np.ndarray, list[Any]]:
+    if isinstance(service, LocalIndexService):
+        index = service.index
+        return np.asarray(index.vectors), [entity['id'] for entity in index.entities]
+    return await asyncio.to_thread(fetch_milvus_vectors, service)
+
+
+def ground_truth(vectors: np.ndarray, ids: list[Any], queries: np.ndarray, metric: str, top_k: int):
+    """Exact top-k ids of each query, by an exhaustive local index search."""
+    with tempfile.TemporaryDirectory() as directory:
+        exact = LocalVectorIndex(Path(directory), LocalIndexSettings(metric=metric))
+        exact.add(vectors, [{} for _ in range(len(vectors))])
+        return [[ids[row] for row, _ in hits] for hits in exact.search(queries, top_k)]
+
+
+def searcher(service: MilvusService, name: str, value: Any, top_k: int) -> Callable[[np.ndarray], Awaitable[list[list[Any]]]]:
+    """Search function returning hit ids with one parameter value."""
+    if isinstance(service, LocalIndexService):
+        index = LocalVectorIndex(service.index.directory, service.settings.local.model_copy(update={name: value}))
+
+        async def search_local(queries: np.ndarray) -> list[list[Any]]:
+            hits = await asyncio.to_thread(index.search, queries, top_k)
+            return [[index.entities[row]['id'] for row, _ in query_hits] for query_hits in hits]
+
+        return search_local
+
+    params = {**service.settings.search_params, name: value}
+
+    async def search_milvus(queries: np.ndarray) -> list[list[Any]]:
+        hits = await service.execute_query(list(queries), params, [service.settings.id_field], top_k)
+        return [[hit['id'] for hit in query_hits] for query_hits in hits]
+
+    return search_milvus
+
+
+async def measure(
+    search: Callable[[np.ndarray], Awaitable[list[list[Any]]]],
+    queries: np.ndarray,
+    batch: int,
+) -> tuple[list[float], list[list[Any]]]:
+    """Run every batch of queries after one warm-up batch, returning latencies in ms and hit ids."""
+    await search(queries[:batch])
+    timings, found = [], []
+    for start in range(0, len(queries), batch):
+        started = time.perf_counter()
+        found.extend(await search(queries[start:start + batch]))
+        timings.append((time.perf_counter() - started) * 1000)
+    return timings, found
+
+
+async def main(args: argparse.Namespace) -> None:
+    settings = get_settings()
+    service = create_vector_service(settings.milvus, EmbedService(settings=settings.embed))
+    local = isinstance(service, LocalIndexService)
+    name = args.param or ('ef' if settings.milvus.index.index_type == 'HNSW' and not local else 'nprobe')
+    values = [int(value) for value in args.values.split(',')] if args.values else DEFAULT_VALUES[name]
+    if name == 'ef':
+        values = [value for value in values if value >= args.top_k]
+    if local and settings.milvus.local.nlist <= 0:
+        print('The local index is exhaustive (MILVUS__LOCAL__NLIST=0), every setting is exact')
+
+    vectors, ids = await load_vectors(service)
+    if not len(vectors):
+        raise SystemExit(f'No vectors stored in {service.collection_id}')
+    if args.queries:
+        texts = [line.strip() for line in Path(args.queries).read_text(encoding='utf-8').splitlines() if line.strip()]
+        queries = np.asarray(await service.embed(texts[: args.sample]), dtype=np.float32)
+    else:
+        rng = np.random.default_rng(0)
+        queries = vectors[rng.choice(len(vectors), min(args.sample, len(vectors)), replace=False)]
+
+    metric = settings.milvus.local.metric if local else settings.milvus.metric_type
+    started = time.perf_counter()
+    expected = ground_truth(vectors, ids, queries, metric, args.top_k)
+    print(
+        f'Ground truth for {len(queries)} queries over {len(vectors)} vectors '
+        f'in {time.perf_counter() - started:.1f}s',
+    )
+
+    points = []
+    for value in values:
+        timings, found = await measure(searcher(service, name, value, args.top_k), queries, args.batch)
+        point = SweepPoint(
+            params={name: value},
+            recall=recall(expected, found),
+            p50=statistics.median(timings),
+            p95=percentile(timings, 0.95),
+        )
+        points.append(point)
+        print(f'{name}={value:<6} recall@{args.top_k} {point.recall:.3f}  p50 {point.p50:7.2f}ms  p95 {point.p95:7.2f}ms')
+
+    frontier = pareto_frontier(points)
+    print('Pareto frontier: ' + ', '.join(f'{name}={point.params[name]}' for point in frontier))
+    best = recommend(frontier, args.target_recall)
+    if best.recall < args.target_recall:
+        print(f'No setting reaches recall {args.target_recall}; the most accurate one is:')
+    if local:
+        print(f'MILVUS__LOCAL__{name.upper()}={best.params[name]}')
+    else:
+        print(f"MILVUS__SEARCH_PARAMS='{json.dumps({**settings.milvus.search_params, **best.params})}'")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Sweep search parameters for recall and latency')
+    parser.add_argument('--queries', default=None, help='file of query texts, one per line')
+    parser.add_argument('--sample', type=int, default=200, help='number of queries')
+    parser.add_argument('--top-k', type=int, default=10)
+    parser.add_argument('--batch', type=int, default=1, help='queries per search call')
+    parser.add_argument('--param', choices=['nprobe', 'ef'], default=None, help='parameter to sweep')
+    parser.add_argument('--values', default=None, help='comma-separated values to try')
+    parser.add_argument('--target-recall', type=float, default=0.95)
+    asyncio.run(main(parser.parse_args()))